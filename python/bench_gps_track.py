@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+# MirrorWitness PHASE2 2025-11-04
+
+import random
+import sys
+import time
+import tracemalloc
+from gps_track import GpsTrack
+from nautilus_proof import NautilusProofAltitude
+
+
+def make_points(n):
+    random.seed(42)
+    return [
+        {
+            "lat": 37.7749 + random.uniform(-0.01, 0.01),
+            "lon": -122.4194 + random.uniform(-0.01, 0.01),
+            "alt": 100 + random.uniform(-15, 15),
+            "timestamp": 1730700000 + i,
+            "accuracy": 5.0,
+        }
+        for i in range(n)
+    ]
+
+
+def measure(fn, *args):
+    """(result, bytes still allocated, peak bytes, seconds) for one call"""
+    # Timed on a separate untraced run: tracemalloc slows every allocation
+    started = time.perf_counter()
+    fn(*args)
+    elapsed = time.perf_counter() - started
+    tracemalloc.start()
+    result = fn(*args)
+    size, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, size, peak, elapsed
+
+
+def main(n=1_000_000):
+    prover = NautilusProofAltitude()
+    print(f"=== GpsTrack vs dict-list ({n:,} points) ===\n")
+
+    points, dict_bytes, _, _ = measure(make_points, n)
+    track, track_bytes, _, track_build = measure(GpsTrack.from_points, points)
+
+    # Peak is what proving allocates on top of the data it is given
+    dict_proof, _, dict_peak, dict_time = measure(prover.generate_proof, points)
+    track_proof, _, track_peak, track_time = measure(prover.generate_proof, track)
+    assert dict_proof == track_proof
+
+    print(f"{'':<12} {'data MB':>10} {'proof peak MB':>14} {'proof s':>10}")
+    print(f"{'dict-list':<12} {dict_bytes / 1e6:>10.1f} {dict_peak / 1e6:>14.1f} {dict_time:>10.3f}")
+    print(f"{'GpsTrack':<12} {track_bytes / 1e6:>10.1f} {track_peak / 1e6:>14.1f} {track_time:>10.3f}")
+    print(f"\nGpsTrack holds the points in {dict_bytes / track_bytes:.1f}x less memory and proves "
+          f"{dict_time / track_time:.1f}x faster (conversion took {track_build:.2f}s)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
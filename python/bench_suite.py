@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+# MirrorWitness PHASE2 2025-11-04
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+WITNESS_BASE_PORT = 8866
+SEAL_DURATION = 300  # as in miner.py
+
+
+def configure(args):
+    """Miner settings are read at import time, so set them before importing it"""
+    os.environ["WITNESS_URLS"] = ",".join(
+        f"ws://127.0.0.1:{args.base_port + n}" for n in range(1, args.witnesses + 1)
+    )
+    os.environ["QUORUM_SIZE"] = str(args.quorum or args.witnesses)
+    os.environ["TASK_BATCH_SIZE"] = str(args.batch)
+    os.environ["GPS_SOURCE"] = "simulator"
+    os.environ["PIPELINE_REPORT_INTERVAL"] = "0"
+    os.environ.setdefault("LOG_LEVEL", "warning")
+
+
+def bench(fn, min_time=0.2):
+    """Call `fn` in a loop for at least `min_time` seconds"""
+    runs = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(runs):
+            fn()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time:
+            return {"ops_per_s": round(runs / elapsed, 1), "us_per_op": round(elapsed / runs * 1e6, 3), "runs": runs}
+        runs = max(runs * 2, int(runs * min_time / max(elapsed, 1e-9) * 1.2))
+
+
+def percentile(values, q):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))]
+
+
+def gps_points(n):
+    rng = random.Random(42)
+    return [
+        {"lat": 37.7749 + rng.uniform(-0.01, 0.01), "lon": -122.4194 + rng.uniform(-0.01, 0.01),
+         "alt": 100 + rng.uniform(-15, 15), "timestamp": 1730700000 + i, "accuracy": 5.0}
+        for i in range(n)
+    ]
+
+
+def run_micro(sizes, min_time):
+    from nacl.signing import SigningKey
+    from gps_track import GpsTrack
+    from miner import HMAC_SECRET, TaskMiner
+    from nautilus_proof import NautilusProofAltitude
+    from witness_node import WitnessNode
+    import wire
+
+    secret = HMAC_SECRET.encode()
+    now = time.time()
+    sealed = {"timestamp": now, "lat": 37.7749, "lon": -122.4194, "alt": 100.5, "accuracy": 10.0,
+              "type": "gps_data", "sealed_until": now + SEAL_DURATION, "nonce": 4242424}
+    binary = wire.pack_gps(sealed)
+    text = json.dumps(sealed).encode()
+    cid = "0" * 32
+    message = {"type": "new_task", "payload": binary.hex(), "cid": cid, "timestamp": now}
+    node = WitnessNode(0, verbose=False, signing_key=SigningKey(bytes(32)))
+    mac_frame = wire.seal_text(secret, json.dumps(message))
+    mac_body = mac_frame[wire.MAC_HEX_SIZE:].encode()
+    task_frame = wire.encode_task(secret, binary, cid, now)
+    signature = node.signing_key.sign(binary).signature
+
+    cases = {
+        "create_hmac": lambda: TaskMiner.create_hmac(None, message),
+        "verify_hmac": lambda: node.verify_hmac(mac_body, mac_frame[:wire.MAC_HEX_SIZE]),
+        "seal_text_frame": lambda: wire.seal_text(secret, json.dumps(message)),
+        "encode_binary_task": lambda: wire.encode_task(secret, binary, cid, now),
+        "open_binary_task": lambda: wire.decode_tasks(*wire.open_frame(secret, task_frame)),
+        "ed25519_sign": lambda: node.signing_key.sign(binary),
+        "ed25519_verify": lambda: node.verify_key.verify(binary, signature),
+        "payload_encode_binary": lambda: wire.pack_gps(sealed),
+        "payload_decode_binary": lambda: wire.decode_payload(binary),
+        "payload_encode_json": lambda: json.dumps(sealed).encode(),
+        "payload_decode_json": lambda: wire.decode_payload(text),
+    }
+    prover = NautilusProofAltitude()
+    for n in sizes:
+        points = gps_points(n)
+        track = GpsTrack.from_points(points)
+        cases[f"generate_proof_dicts_{n}"] = lambda points=points: prover.generate_proof(points)
+        cases[f"generate_proof_track_{n}"] = lambda track=track: prover.generate_proof(track)
+
+    results = {}
+    for name, fn in cases.items():
+        results[name] = bench(fn, min_time)
+        print(f"  {name:<32} {results[name]['us_per_op']:>14,.2f} us/op {results[name]['ops_per_s']:>14,.0f} ops/s")
+    return results
+
+
+class Witnesses:
+    """N witnesses on consecutive ports, in this process or as subprocesses"""
+
+    def __init__(self, count, base_port, mode):
+        self.count = count
+        self.base_port = base_port
+        self.mode = mode
+        self.procs = []
+        self.servers = []
+
+    async def start(self):
+        if self.mode == "subprocess":
+            env = dict(os.environ, LOG_LEVEL="warning")
+            for n in range(1, self.count + 1):
+                self.procs.append(subprocess.Popen([
+                    sys.executable, "-c",
+                    "import asyncio; from witness_node import WitnessNode; "
+                    f"asyncio.run(WitnessNode({n}, {self.base_port + n}, verbose=False).start_server())",
+                ], cwd=HERE, env=env, stdout=subprocess.DEVNULL))
+        else:
+            import websockets
+            from witness_node import WitnessNode
+            for n in range(1, self.count + 1):
+                node = WitnessNode(n, self.base_port + n, verbose=False)
+                self.servers.append(await websockets.serve(node.handle_connection, "127.0.0.1", self.base_port + n))
+
+    async def stop(self):
+        for proc in self.procs:
+            proc.terminate()
+        for proc in self.procs:
+            proc.wait()
+        for server in self.servers:
+            server.close()
+            await server.wait_closed()
+
+
+async def run_e2e(args):
+    from gps_sources import SimulatorSource
+    from miner import QUORUM_SIZE, TaskMiner
+
+    class BenchMiner(TaskMiner):
+        """Records seal-to-quorum latency for every task"""
+
+        def __init__(self):
+            super().__init__()
+            self.sealed_at = {}   # cid -> wall time the sample was sealed
+            self.finished = []    # (sealed at, completed at, complete)
+
+        async def broadcast_stage(self, task):
+            self.sealed_at[task[2]] = task[1]["sealed_until"] - SEAL_DURATION
+            await super().broadcast_stage(task)
+
+        async def await_quorum(self, session, cid, quorum, committed):
+            sealed_at = self.sealed_at.pop(cid, None)
+
+            def record(future):
+                if not future.cancelled():
+                    self.finished.append((sealed_at, time.time(), future.result()["complete"]))
+
+            quorum.add_done_callback(record)
+            return await super().await_quorum(session, cid, quorum, committed)
+
+    witnesses = Witnesses(args.witnesses, args.base_port, args.mode)
+    await witnesses.start()
+    await asyncio.sleep(1.0 if args.mode == "subprocess" else 0.1)
+
+    miner = BenchMiner()
+    sessions = max(1, math.ceil(args.rate / 50))  # up to 50 samples/s per simulated drone
+    interval = sessions / args.rate
+    for n in range(sessions):
+        miner.register_session(f"bench-{n}", SimulatorSource(), interval=interval, rate=2 / interval, burst=5)
+    runner = asyncio.create_task(miner.mine_loop())
+
+    await asyncio.sleep(args.warmup)
+    window_start = time.time()
+    await asyncio.sleep(args.duration)
+    window_end = time.time()
+    sampled = sum(s.sampled for s in miner.sessions.values())
+    missed = sum(s.ticker.missed for s in miner.sessions.values())
+    for session_id in list(miner.sessions):
+        await miner.unregister_session(session_id)
+    await asyncio.sleep(args.grace)  # let tasks sealed in the window reach quorum
+
+    runner.cancel()
+    await asyncio.gather(runner, return_exceptions=True)
+    await miner.pipeline.stop()
+    await miner.pool.close()
+    await miner.sui.close()
+    await miner.collector.wheel.stop()
+    await witnesses.stop()
+
+    in_window = [f for f in miner.finished if f[0] is not None and window_start <= f[0] < window_end]
+    latencies = [(done - sealed) * 1000 for sealed, done, complete in in_window if complete]
+    completed_in_window = sum(1 for _, done, complete in miner.finished if complete and window_start <= done < window_end)
+    result = {
+        "witnesses": args.witnesses,
+        "mode": args.mode,
+        "quorum": QUORUM_SIZE,
+        "batch": args.batch,
+        "target_rate": args.rate,
+        "duration_s": args.duration,
+        "throughput_tps": round(completed_in_window / (window_end - window_start), 1),
+        "tasks_sealed": len(in_window),
+        "tasks_quorum": len(latencies),
+        "missed_ticks": missed,
+        "gps_samples": sampled,
+        "latency_ms": {
+            "p50": _round(percentile(latencies, 0.50)),
+            "p99": _round(percentile(latencies, 0.99)),
+            "max": _round(max(latencies) if latencies else None),
+        },
+    }
+    print(f"  {result['throughput_tps']} tasks/s at quorum (target {args.rate}/s), "
+          f"p50 {result['latency_ms']['p50']}ms, p99 {result['latency_ms']['p99']}ms, "
+          f"{result['tasks_quorum']}/{result['tasks_sealed']} tasks sealed in the window reached quorum")
+    return result
+
+
+def _round(value):
+    return None if value is None else round(value, 2)
+
+
+def compare(current, baseline):
+    """Print the change against a previous results file; slower is positive"""
+    print(f"\n=== Against {baseline['meta'].get('commit') or 'baseline'} ===")
+    for name, now in current.get("micro", {}).items():
+        before = baseline.get("micro", {}).get(name)
+        if before:
+            change = (now["us_per_op"] / before["us_per_op"] - 1) * 100
+            print(f"  {name:<32} {change:+7.1f}% time/op")
+    now, before = current.get("e2e"), baseline.get("e2e")
+    if now and before:
+        if before["throughput_tps"]:
+            print(f"  {'e2e throughput':<32} {(now['throughput_tps'] / before['throughput_tps'] - 1) * 100:+7.1f}%")
+        for q in ("p50", "p99"):
+            if now["latency_ms"][q] and before["latency_ms"][q]:
+                print(f"  {'e2e latency ' + q:<32} {(now['latency_ms'][q] / before['latency_ms'][q] - 1) * 100:+7.1f}%")
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "-C", HERE, "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro and end-to-end benchmarks for the miner -> witness path")
+    parser.add_argument("--skip-micro", action="store_true")
+    parser.add_argument("--skip-e2e", action="store_true")
+    parser.add_argument("--quick", action="store_true", help="no 1M-point proofs, shorter runs")
+    parser.add_argument("--witnesses", type=int, default=3)
+    parser.add_argument("--quorum", type=int, default=0, help="default: all witnesses")
+    parser.add_argument("--mode", choices=("inprocess", "subprocess"), default="subprocess")
+    parser.add_argument("--rate", type=float, default=50.0, help="target tasks/s across all drone sessions")
+    parser.add_argument("--batch", type=int, default=1, help="TASK_BATCH_SIZE for the miner")
+    parser.add_argument("--duration", type=float, default=10.0, help="measured window, seconds")
+    parser.add_argument("--warmup", type=float, default=2.0)
+    parser.add_argument("--grace", type=float, default=2.0, help="seconds to wait for in-flight tasks")
+    parser.add_argument("--base-port", type=int, default=WITNESS_BASE_PORT)
+    parser.add_argument("--json", default="bench_results.json", help='output file, "-" for stdout')
+    parser.add_argument("--baseline", help="previous results file to compare against")
+    args = parser.parse_args()
+    configure(args)
+
+    results = {"meta": {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "args": vars(args),
+    }}
+    if not args.skip_micro:
+        print("=== Micro benchmarks ===")
+        sizes = (10, 1000) if args.quick else (10, 1000, 1_000_000)
+        results["micro"] = run_micro(sizes, 0.1 if args.quick else 0.3)
+    if not args.skip_e2e:
+        print(f"\n=== End to end: miner -> {args.witnesses} witnesses ({args.mode}), {args.rate} tasks/s ===")
+        results["e2e"] = asyncio.run(run_e2e(args))
+
+    output = json.dumps(results, indent=2)
+    if args.json == "-":
+        print(output)
+    else:
+        with open(args.json, "w") as f:
+            f.write(output + "\n")
+        print(f"\nResults written to {args.json}")
+    if args.baseline:
+        with open(args.baseline) as f:
+            compare(results, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+# MirrorWitness PHASE2 2025-11-04
+
+import sys
+import time
+import numpy as np
+from sybil import WitnessRegistry, haversine_m
+
+
+def make_registry(n, seed=7):
+    """n witnesses spread uniformly over a ~110 km square around San Francisco"""
+    rng = np.random.default_rng(seed)
+    lat = 37.2 + rng.random(n)
+    lon = -122.9 + rng.random(n)
+    registry = WitnessRegistry()
+    for i in range(n):
+        registry.register(f"witness-{i}", float(lat[i]), float(lon[i]))
+    return registry, lat, lon
+
+
+def all_pairs(lat, lon, limit):
+    i, j = np.triu_indices(len(lat), k=1)
+    close = haversine_m(lat[i], lon[i], lat[j], lon[j]) < limit
+    return {(int(a), int(b)) for a, b in zip(i[close], j[close])}
+
+
+def main(n=100_000):
+    print(f"=== Sybil distance scan ({n:,} witnesses) ===\n")
+
+    # Correctness against the all-pairs loop on a sample small enough for it
+    registry, lat, lon = make_registry(3000)
+    found = {tuple(sorted(int(p[k].split("-")[1]) for k in ("a", "b"))) for p in registry.scan()}
+    expected = all_pairs(lat, lon, registry.min_distance_m)
+    assert found == expected, "grid scan disagrees with all-pairs"
+    print(f"3,000-witness sample matches all-pairs ({len(expected)} pairs)")
+
+    registry, _, _ = make_registry(n)
+    started = time.perf_counter()
+    pairs = registry.scan()
+    elapsed = time.perf_counter() - started
+    print(f"{n:,} witnesses: {len(pairs):,} pairs under {registry.min_distance_m}m in {elapsed:.2f}s "
+          f"(all-pairs would test {n * (n - 1) // 2:,})")
+
+    signers = registry.ids[:5]
+    started = time.perf_counter()
+    for _ in range(10_000):
+        registry.check_signers(signers)
+    print(f"check_signers (5 signers): {(time.perf_counter() - started) * 100:.1f}µs per task")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+# MirrorWitness PHASE2 2025-11-04
+
+import asyncio
+import sys
+import time
+from fleet_sim import FleetSimulator
+from walrus_client import WalrusBatcher, WalrusClient, batch_entry
+from walrus_mock import WalrusMock
+
+PORT = 31416
+
+
+async def run(n):
+    mock = WalrusMock(fail_rate=0.05, latency=0.002)
+    runner = await mock.start(port=PORT)
+    payloads = [payload for payload, _, _ in FleetSimulator(200, seed=1).tasks(n)]
+    print(f"=== Walrus client against local mock ({n:,} sealed payloads, 5% injected 503s, 2ms latency) ===\n")
+
+    client = WalrusClient(f"http://127.0.0.1:{PORT}")
+    started = time.perf_counter()
+    await asyncio.gather(*(client.upload(payload) for payload in payloads))
+    single = time.perf_counter() - started
+    print(f"one blob per payload: {single:.2f}s ({n / single:.0f}/s), {client.stats()}")
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client.upload(payload) for payload in payloads))
+    print(f"same payloads again:  {time.perf_counter() - started:.3f}s (served from the SHA-256 cache)")
+    await client.close()
+
+    client = WalrusClient(f"http://127.0.0.1:{PORT}", cache_size=0)
+    batcher = WalrusBatcher(client, max_size=32)
+    started = time.perf_counter()
+    refs = await asyncio.gather(*(batcher.add(payload) for payload in payloads))
+    batched = time.perf_counter() - started
+    print(f"32 payloads per blob: {batched:.2f}s ({n / batched:.0f}/s), {client.stats()}")
+
+    blob = await client.read(refs[-1]["blob_id"])
+    assert batch_entry(blob, refs[-1]["index"]) == payloads[-1]
+    await client.close()
+    await runner.cleanup()
+    print(f"\nBatching is {single / batched:.1f}x faster; entries read back through the offset index")
+
+
+if __name__ == "__main__":
+    asyncio.run(run(int(sys.argv[1]) if len(sys.argv) > 1 else 2000))
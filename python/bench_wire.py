@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# MirrorWitness PHASE2 2025-11-04
+
+import hashlib
+import hmac
+import json
+import random
+import sys
+import time
+import wire
+
+SECRET = b"proof-of-task-secret-2025"
+
+
+def sample_task():
+    """One sealed GPS record as produced by TaskMiner.mine_loop"""
+    now = time.time()
+    return {
+        "timestamp": now,
+        "lat": round(37.7749 + random.uniform(-0.001, 0.001), 6),
+        "lon": round(-122.4194 + random.uniform(-0.001, 0.001), 6),
+        "alt": round(100 + random.uniform(-2, 2), 2),
+        "accuracy": 10.0,
+        "type": "gps_data",
+        "source": "SIMULATED 🎮",
+        "sealed_until": now + 300,
+        "nonce": random.randint(1000000, 9999999),
+    }
+
+
+def json_encode(data):
+    payload = json.dumps(data).encode()
+    cid = hashlib.sha256(payload).hexdigest()[:32]
+    message = {"type": "new_task", "payload": payload.hex(), "cid": cid, "timestamp": time.time()}
+    message["hmac"] = hmac.new(SECRET, json.dumps(message).encode(), hashlib.sha256).hexdigest()
+    return json.dumps(message)
+
+
+def json_decode(frame):
+    message = json.loads(frame)
+    copy = dict(message)
+    received = copy.pop("hmac")
+    expected = hmac.new(SECRET, json.dumps(copy).encode(), hashlib.sha256).hexdigest()
+    assert hmac.compare_digest(expected, received)
+    return json.loads(bytes.fromhex(message["payload"]))
+
+
+def json_mac_encode(data):
+    payload = json.dumps(data).encode()
+    cid = hashlib.sha256(payload).hexdigest()[:32]
+    message = {"type": "new_task", "payload": payload.hex(), "cid": cid, "timestamp": time.time()}
+    return wire.seal_text(SECRET, json.dumps(message))
+
+
+def json_mac_decode(frame):
+    message = json.loads(wire.open_text(SECRET, frame))
+    return json.loads(bytes.fromhex(message["payload"]))
+
+
+def legacy_reject(frame):
+    """Cost of turning away a forged frame when the MAC lives inside the JSON"""
+    try:
+        json_decode(frame)
+    except AssertionError:
+        return True
+
+
+def mac_first_reject(frame):
+    """Cost of turning away a forged frame authenticated on raw bytes"""
+    try:
+        wire.open_text(SECRET, frame)
+    except wire.WireError:
+        return True
+
+
+def binary_encode(data):
+    payload = wire.pack_gps(data)
+    cid = hashlib.sha256(payload).hexdigest()[:32]
+    return wire.encode_task(SECRET, payload, cid, time.time())
+
+
+def binary_decode(frame):
+    msg_type, body = wire.open_frame(SECRET, frame)
+    (payload, _), = wire.decode_tasks(msg_type, body)
+    return wire.decode_payload(payload)
+
+
+def bench(fn, items):
+    started = time.perf_counter()
+    out = [fn(item) for item in items]
+    return (time.perf_counter() - started) / len(items) * 1e6, out
+
+
+def main(n=20000):
+    random.seed(7)
+    tasks = [sample_task() for _ in range(n)]
+    rows = []
+    for name, encode, decode in (("json+hex", json_encode, json_decode),
+                                 ("json+mac", json_mac_encode, json_mac_decode),
+                                 ("binary", binary_encode, binary_decode)):
+        encode_us, frames = bench(encode, tasks)
+        decode_us, decoded = bench(decode, frames)
+        assert all(abs(d["lat"] - t["lat"]) < 1e-9 for d, t in zip(decoded, tasks))
+        size = sum(len(f.encode() if isinstance(f, str) else f) for f in frames) / n
+        rows.append((name, size, encode_us, decode_us))
+
+    print(f"=== Wire format benchmark ({n} tasks) ===\n")
+    print(f"{'format':<10} {'bytes/task':>10} {'encode µs':>10} {'decode µs':>10}")
+    for name, size, encode_us, decode_us in rows:
+        print(f"{name:<10} {size:>10.1f} {encode_us:>10.2f} {decode_us:>10.2f}")
+    base, new = rows[0], rows[-1]
+    print(f"\nbinary is {base[1] / new[1]:.1f}x smaller, "
+          f"{base[2] / new[2]:.1f}x faster to encode, {base[3] / new[3]:.1f}x faster to decode")
+
+    forged = [json_encode(t).replace('"hmac": "', '"hmac": "0') for t in tasks]
+    legacy_us, _ = bench(legacy_reject, forged)
+    forged = ["0" * wire.MAC_HEX_SIZE + f[wire.MAC_HEX_SIZE:] for f in (json_mac_encode(t) for t in tasks)]
+    mac_first_us, _ = bench(mac_first_reject, forged)
+    print(f"\nforged frame rejection: {legacy_us:.2f} µs (hmac in JSON) -> {mac_first_us:.2f} µs (MAC on raw bytes)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
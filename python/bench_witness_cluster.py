@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# MirrorWitness PHASE2 2025-11-04
+
+import asyncio
+import json
+import multiprocessing
+import os
+import signal
+import subprocess
+import sys
+import time
+import websockets
+import wire
+from fleet_sim import FleetSimulator
+from witness_node import HMAC_SECRET
+
+PORT = 8799
+CONNECTIONS = 16   # miner connections, spread over the client processes
+WINDOW = 32        # unanswered frames per connection
+
+
+async def drive(connections, tasks_per_connection, seed):
+    """Open `connections` miners and push binary tasks through each; returns tasks/s"""
+    secret = HMAC_SECRET.encode()
+    # Distinct tasks per connection: witnesses answer a repeated cid from
+    # their replay cache, which would measure lookups instead of signing
+    tasks = FleetSimulator(100, seed=seed).tasks(connections * tasks_per_connection)
+    frames = [wire.encode_task(secret, payload, cid, time.time()) for payload, cid, _ in tasks]
+    hello = wire.seal_text(secret, json.dumps({"type": "hello", "formats": [wire.FORMAT_BINARY]}))
+
+    async def one(ws, frames):
+        window = asyncio.Semaphore(WINDOW)
+
+        async def receive():
+            for _ in frames:
+                await ws.recv()
+                window.release()
+
+        reader = asyncio.create_task(receive())
+        for frame in frames:
+            await window.acquire()
+            await ws.send(frame)
+        await reader
+
+    sockets = []
+    for _ in range(connections):
+        ws = await websockets.connect(f"ws://127.0.0.1:{PORT}", max_queue=None)
+        await ws.send(hello)
+        await ws.recv()
+        sockets.append(ws)
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        one(ws, frames[n * tasks_per_connection:(n + 1) * tasks_per_connection])
+        for n, ws in enumerate(sockets)
+    ))
+    elapsed = time.perf_counter() - started
+    for ws in sockets:
+        await ws.close()
+    return len(frames) / elapsed
+
+
+def client(connections, tasks_per_connection, seed, results):
+    results.put(asyncio.run(drive(connections, tasks_per_connection, seed)))
+
+
+def measure(workers, clients, tasks_per_connection):
+    cluster = subprocess.Popen(
+        [sys.executable, "witness_cluster.py", "--id", "1", "--port", str(PORT), "--workers", str(workers)],
+        stdout=subprocess.DEVNULL,
+    )
+    time.sleep(1.0 + 0.3 * workers)  # spawn start-up
+    ctx = multiprocessing.get_context("spawn")
+    results = ctx.Queue()
+    procs = [
+        ctx.Process(target=client, args=(CONNECTIONS // clients, tasks_per_connection, seed, results))
+        for seed in range(clients)
+    ]
+    for proc in procs:
+        proc.start()
+    rate = sum(results.get() for _ in procs)
+    for proc in procs:
+        proc.join()
+    cluster.send_signal(signal.SIGTERM)
+    cluster.wait()
+    return rate
+
+
+def main():
+    max_workers = int(sys.argv[1]) if len(sys.argv) > 1 else (os.cpu_count() or 1)
+    tasks_per_connection = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    clients = max(1, min(max_workers, CONNECTIONS))
+    cores = os.cpu_count() or 1
+    print(f"=== Witness cluster: {CONNECTIONS} binary connections x {tasks_per_connection} tasks, "
+          f"{clients} client processes, {cores} cores ===\n")
+
+    counts = sorted({1, 2, max_workers} & set(range(1, max_workers + 1)))
+    baseline = None
+    for workers in counts:
+        rate = measure(workers, clients, tasks_per_connection)
+        baseline = baseline or rate
+        print(f"{workers:>2} worker(s): {rate:8.0f} tasks/s  ({rate / baseline:.2f}x)")
+    if cores < 2:
+        print("\nOnly one core available: workers share it, so no scaling is expected here")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+# MirrorWitness PHASE2 2025-11-04
+
+import hashlib
+import json
+from typing import Dict, List, Optional, Tuple, Union
+import numpy as np
+from gps_track import GpsTrack
+from merkle import MerkleRoot
+from nautilus_proof import NautilusProofAltitude, private_inputs_hash
+
+EARTH_RADIUS_M = 6371000.0
+
+CONSTRAINTS = {}  # constraint name -> Constraint subclass
+
+
+def register_constraint(cls):
+    """Class decorator adding a constraint to the registry under `cls.name`"""
+    CONSTRAINTS[cls.name] = cls
+    return cls
+
+
+class TrackContext:
+    """
+    NumPy columns of a track plus derived series, each computed at most once
+
+    All constraints evaluated against one context share the same
+    segment distances, time deltas and altitude statistics.
+    """
+
+    def __init__(self, track: GpsTrack):
+        self.track = track
+        self.columns = track.numpy()
+        self._cache = {}
+
+    def _cached(self, key, compute):
+        if key not in self._cache:
+            self._cache[key] = compute()
+        return self._cache[key]
+
+    @property
+    def alt(self) -> np.ndarray:
+        return self.columns["alt"]
+
+    @property
+    def accuracy(self) -> np.ndarray:
+        return self.columns["accuracy"]
+
+    @property
+    def dt(self) -> np.ndarray:
+        """Seconds between consecutive points"""
+        return self._cached("dt", lambda: np.diff(self.columns["timestamp"]))
+
+    @property
+    def distance(self) -> np.ndarray:
+        """Haversine ground distance (m) between consecutive points"""
+        def compute():
+            lat = np.radians(self.columns["lat"])
+            lon = np.radians(self.columns["lon"])
+            dlat = np.diff(lat)
+            dlon = np.diff(lon)
+            a = np.sin(dlat / 2) ** 2 + np.cos(lat[:-1]) * np.cos(lat[1:]) * np.sin(dlon / 2) ** 2
+            return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+        return self._cached("distance", compute)
+
+    def _rate(self, numerator: np.ndarray) -> np.ndarray:
+        dt = self.dt
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rate = np.abs(numerator) / dt
+        # Identical timestamps: any movement is an infinite rate, none is zero
+        return np.where(dt > 0, rate, np.where(numerator != 0, np.inf, 0.0))
+
+    @property
+    def ground_speed(self) -> np.ndarray:
+        """m/s between consecutive points"""
+        return self._cached("ground_speed", lambda: self._rate(self.distance))
+
+    @property
+    def climb_rate(self) -> np.ndarray:
+        """|vertical m/s| between consecutive points"""
+        return self._cached("climb_rate", lambda: self._rate(np.diff(self.alt)))
+
+    @property
+    def altitude_stats(self) -> Tuple[float, float, float]:
+        return self._cached(
+            "altitude_stats",
+            lambda: (float(self.alt.max()), float(self.alt.min()), float(self.alt.mean()))
+        )
+
+
+class Constraint:
+    """One provable rule over a GPS track"""
+
+    name = ""
+    circuit = ""
+
+    def __init__(self, **params):
+        self.params = params
+
+    def public_inputs(self) -> Dict:
+        return dict(self.params)
+
+    def describe(self) -> str:
+        raise NotImplementedError
+
+    def evaluate(self, ctx: TrackContext) -> Tuple[bool, Dict]:
+        """Returns (constraint satisfied, observed values)"""
+        raise NotImplementedError
+
+
+def _max_or_zero(values: np.ndarray) -> float:
+    return float(values.max()) if values.size else 0.0
+
+
+@register_constraint
+class MaxAltitude(Constraint):
+    name = "max_altitude"
+    circuit = "altitude_check_v1"  # same circuit as NautilusProofAltitude
+
+    def __init__(self, limit: float = NautilusProofAltitude.MAX_ALTITUDE):
+        super().__init__(limit=limit)
+
+    def public_inputs(self) -> Dict:
+        return {"max_altitude_limit": self.params["limit"]}
+
+    def describe(self) -> str:
+        return f"altitude ≤ {self.params['limit']}m"
+
+    def evaluate(self, ctx):
+        # max_altitude is already part of every proof
+        return ctx.altitude_stats[0] <= self.params["limit"], {}
+
+
+@register_constraint
+class MaxGroundSpeed(Constraint):
+    name = "max_ground_speed"
+    circuit = "ground_speed_check_v1"
+
+    def __init__(self, limit: float = 25.0):
+        super().__init__(limit=limit)
+
+    def describe(self) -> str:
+        return f"ground speed ≤ {self.params['limit']}m/s"
+
+    def evaluate(self, ctx):
+        fastest = _max_or_zero(ctx.ground_speed)
+        return fastest <= self.params["limit"], {"max_ground_speed": round(fastest, 2)}
+
+
+@register_constraint
+class MaxClimbRate(Constraint):
+    name = "max_climb_rate"
+    circuit = "climb_rate_check_v1"
+
+    def __init__(self, limit: float = 5.0):
+        super().__init__(limit=limit)
+
+    def describe(self) -> str:
+        return f"climb rate ≤ {self.params['limit']}m/s"
+
+    def evaluate(self, ctx):
+        steepest = _max_or_zero(ctx.climb_rate)
+        return steepest <= self.params["limit"], {"max_climb_rate": round(steepest, 2)}
+
+
+@register_constraint
+class MinGpsAccuracy(Constraint):
+    """Every reported fix must be at least this accurate (error radius in m)"""
+
+    name = "min_gps_accuracy"
+    circuit = "gps_accuracy_check_v1"
+
+    def __init__(self, max_error: float = 20.0, allow_missing: bool = True):
+        super().__init__(max_error=max_error, allow_missing=allow_missing)
+
+    def describe(self) -> str:
+        return f"gps accuracy ≤ {self.params['max_error']}m"
+
+    def evaluate(self, ctx):
+        accuracy = ctx.accuracy
+        missing = np.isnan(accuracy)
+        reported = accuracy[~missing]
+        worst = _max_or_zero(reported)
+        satisfied = worst <= self.params["max_error"]
+        if missing.any() and not self.params["allow_missing"]:
+            satisfied = False
+        return satisfied, {"worst_accuracy": round(worst, 2), "missing_accuracy": int(missing.sum())}
+
+
+@register_constraint
+class MaxTimeGap(Constraint):
+    name = "max_time_gap"
+    circuit = "time_gap_check_v1"
+
+    def __init__(self, limit: float = 5.0):
+        super().__init__(limit=limit)
+
+    def describe(self) -> str:
+        return f"time gap ≤ {self.params['limit']}s"
+
+    def evaluate(self, ctx):
+        dt = ctx.dt
+        widest = _max_or_zero(dt)
+        satisfied = widest <= self.params["limit"] and not (dt < 0).any()
+        return satisfied, {"max_time_gap": round(widest, 2)}
+
+
+DEFAULT_CONSTRAINTS = [
+    ("max_altitude", {}),
+    ("max_ground_speed", {}),
+    ("max_climb_rate", {}),
+    ("min_gps_accuracy", {}),
+    ("max_time_gap", {}),
+]
+
+
+class ConstraintEngine:
+    """
+    Evaluates many constraints over a track in one pass
+
+    Constraints are declared as (name, params) pairs from the registry,
+    at most one per circuit since proofs are keyed by circuit name.
+    `generate_proofs` returns one proof per circuit plus a combined proof,
+    all in the `NautilusProofAltitude.generate_proof` shape so
+    `format_proof_for_chain` works on any of them.
+    """
+
+    COMBINED_CIRCUIT = "combined_v1"
+
+    def __init__(self, constraints: List[Tuple[str, Dict]] = None):
+        self.constraints = []
+        for name, params in constraints or DEFAULT_CONSTRAINTS:
+            if name not in CONSTRAINTS:
+                raise KeyError(f"unknown constraint: {name}")
+            constraint = CONSTRAINTS[name](**params)
+            if any(c.circuit == constraint.circuit for c in self.constraints):
+                raise ValueError(f"duplicate constraint for circuit {constraint.circuit}: {name}")
+            self.constraints.append(constraint)
+
+    def generate_proofs(self, gps_points: Union[List[Dict], GpsTrack], root: Optional[str] = None) -> Dict:
+        """
+        `root` is a Merkle root (hex) already computed for these points;
+        the result's "merkle_root" can in turn be handed to
+        `NautilusProofAltitude.generate_proof` so the track is hashed once.
+
+        Returns:
+            {"proofs": {circuit: proof}, "combined": proof, "merkle_root": hex}
+        """
+        if not len(gps_points):
+            error = {"valid": False, "error": "No GPS data"}
+            return {"proofs": {c.circuit: dict(error) for c in self.constraints}, "combined": error}
+
+        track = gps_points if isinstance(gps_points, GpsTrack) else GpsTrack.from_points(gps_points)
+        ctx = TrackContext(track)
+        inputs_hash = private_inputs_hash(track)  # same hash as for the raw points
+        merkle_root = root or MerkleRoot(track).root().hex()
+        num_points = len(track)
+
+        proofs = {}
+        for constraint in self.constraints:
+            satisfied, observed = constraint.evaluate(ctx)
+            proofs[constraint.circuit] = self._build_proof(
+                ctx, constraint.circuit, constraint.describe(),
+                {**constraint.public_inputs(), "num_points": num_points},
+                satisfied, inputs_hash, merkle_root, observed
+            )
+
+        combined = self._build_proof(
+            ctx, self.COMBINED_CIRCUIT,
+            " ∧ ".join(c.describe() for c in self.constraints),
+            {
+                "circuits": {c.circuit: c.public_inputs() for c in self.constraints},
+                "circuit_proofs": {circuit: p["proof_hash"] for circuit, p in proofs.items()},
+                "num_points": num_points
+            },
+            all(p["valid"] for p in proofs.values()),
+            inputs_hash, merkle_root, {}
+        )
+        combined["failed_circuits"] = [circuit for circuit, p in proofs.items() if not p["valid"]]
+        return {"proofs": proofs, "combined": combined, "merkle_root": merkle_root}
+
+    def _build_proof(self, ctx: TrackContext, circuit: str, description: str, public_inputs: Dict,
+                     satisfied: bool, private_inputs_hash: str, merkle_root: str,
+                     observed: Dict) -> Dict:
+        proof_data = {
+            "circuit": circuit,
+            "public_inputs": public_inputs,
+            "private_inputs_hash": private_inputs_hash,
+            "merkle_root": merkle_root,
+            "constraint_satisfied": satisfied
+        }
+        proof_hash = hashlib.sha256(json.dumps(proof_data, sort_keys=True).encode()).hexdigest()
+        max_alt, min_alt, avg_alt = ctx.altitude_stats
+        proof = {
+            "valid": satisfied,
+            "proof_hash": f"0x{proof_hash[:16]}...",
+            "max_altitude": round(max_alt, 2),
+            "min_altitude": round(min_alt, 2),
+            "avg_altitude": round(avg_alt, 2),
+            "num_points": public_inputs["num_points"],
+            "constraint": description,
+            "verification": "✓ VERIFIED" if satisfied else "✗ FAILED",
+            "circuit": circuit,
+            "merkle_root": merkle_root
+        }
+        proof.update(observed)
+        return proof
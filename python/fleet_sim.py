@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+# MirrorWitness PHASE2 2025-11-04
+
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import os
+import time
+from typing import Awaitable, Callable, List, Optional, Tuple
+import numpy as np
+import wire
+
+SEAL_DURATION = 300  # seconds, as in miner.py
+METERS_PER_DEG_LAT = 111320.0
+
+# (min m, max m, share of the fleet); the last band breaks the 120 m limit
+# of NautilusProofAltitude on purpose so failed proofs show up under load
+ALTITUDE_BANDS = ((30.0, 80.0, 0.60), (80.0, 118.0, 0.35), (121.0, 150.0, 0.05))
+
+# Same layout as wire.GPS_RECORD ("<BdddffdI", unaligned) for bulk packing
+GPS_RECORD_DTYPE = np.dtype([
+    ("tag", "u1"), ("timestamp", "<f8"), ("lat", "<f8"), ("lon", "<f8"),
+    ("alt", "<f4"), ("accuracy", "<f4"), ("sealed_until", "<f8"), ("nonce", "<u4"),
+])
+assert GPS_RECORD_DTYPE.itemsize == wire.GPS_RECORD.size
+
+Task = Tuple[bytes, str, float]  # (sealed payload, cid, sealed_until)
+
+
+class FleetSimulator:
+    """
+    N drones advanced together with array math
+
+    Each drone has a position, heading, ground speed and an altitude band.
+    `step` turns every heading by a random walk, moves all drones at once
+    and eases each altitude toward its cruise level. Reported fixes add
+    Gaussian GPS noise on top of the true state. The same `seed` replays
+    the same fleet, movements and nonces.
+    """
+
+    def __init__(self, drones: int = 100, seed: Optional[int] = None,
+                 center: Tuple[float, float] = (37.7749, -122.4194), spread_m: float = 2000.0,
+                 speed: Tuple[float, float] = (5.0, 15.0), bands=ALTITUDE_BANDS,
+                 gps_noise_m: float = 3.0, alt_noise_m: float = 0.5, turn_rate: float = 0.3):
+        self.rng = np.random.default_rng(seed)
+        self.size = drones
+        self.gps_noise_m = gps_noise_m
+        self.alt_noise_m = alt_noise_m
+        self.turn_rate = turn_rate  # rad/s standard deviation of heading changes
+        rng = self.rng
+
+        radius = spread_m * np.sqrt(rng.random(drones))
+        bearing = rng.uniform(0, 2 * math.pi, drones)
+        self.lat = center[0] + radius * np.cos(bearing) / METERS_PER_DEG_LAT
+        self.lon = center[1] + radius * np.sin(bearing) / (METERS_PER_DEG_LAT * math.cos(math.radians(center[0])))
+        self.heading = rng.uniform(0, 2 * math.pi, drones)
+        self.speed = rng.uniform(speed[0], speed[1], drones)
+
+        lows, highs, shares = (np.array(column, dtype=np.float64) for column in zip(*bands))
+        band = rng.choice(len(bands), size=drones, p=shares / shares.sum())
+        self.cruise = rng.uniform(lows[band], highs[band])
+        self.alt = self.cruise + rng.normal(0, 2.0, drones)
+        self.band = band
+        self.cursor = 0  # next drone to report in round-robin emission
+
+    def __len__(self) -> int:
+        return self.size
+
+    @property
+    def violators(self) -> np.ndarray:
+        """Indices of drones cruising above the altitude limit"""
+        from nautilus_proof import NautilusProofAltitude
+        return np.flatnonzero(self.cruise > NautilusProofAltitude.MAX_ALTITUDE)
+
+    def step(self, dt: float):
+        """Advance every drone by `dt` seconds"""
+        rng = self.rng
+        self.heading += rng.normal(0, self.turn_rate * math.sqrt(dt), self.size)
+        distance = self.speed * dt
+        self.lat += distance * np.cos(self.heading) / METERS_PER_DEG_LAT
+        self.lon += distance * np.sin(self.heading) / (METERS_PER_DEG_LAT * np.cos(np.radians(self.lat)))
+        # Ease toward cruise altitude, ~2 m/s at most, with a little turbulence
+        self.alt += np.clip(self.cruise - self.alt, -2 * dt, 2 * dt) + rng.normal(0, 0.2 * math.sqrt(dt), self.size)
+
+    def records(self, drones: np.ndarray, now: float) -> np.ndarray:
+        """Noisy sealed GPS records for the given drones (wire.GPS_RECORD layout)"""
+        rng = self.rng
+        count = len(drones)
+        lat = self.lat[drones]
+        noise = rng.normal(0, self.gps_noise_m, (2, count))
+        out = np.empty(count, dtype=GPS_RECORD_DTYPE)
+        out["tag"] = wire.GPS_RECORD_TAG
+        out["timestamp"] = now
+        out["lat"] = np.round(lat + noise[0] / METERS_PER_DEG_LAT, 6)
+        out["lon"] = np.round(self.lon[drones] + noise[1] / (METERS_PER_DEG_LAT * np.cos(np.radians(lat))), 6)
+        out["alt"] = np.round(self.alt[drones] + rng.normal(0, self.alt_noise_m, count), 2)
+        out["accuracy"] = self.gps_noise_m
+        out["sealed_until"] = now + SEAL_DURATION
+        out["nonce"] = rng.integers(1000000, 9999999, count, endpoint=True)
+        return out
+
+    def tasks(self, count: int, now: Optional[float] = None, fmt: str = wire.FORMAT_BINARY) -> List[Task]:
+        """
+        Sealed payloads for the next `count` drones in round-robin order
+
+        Binary payloads are the 45-byte record the witnesses decode with
+        `wire.decode_payload`; any other format yields the JSON dict the
+        miner sends to legacy witnesses. cids are derived as in
+        `TaskMiner.upload_to_walrus`.
+        """
+        now = time.time() if now is None else now
+        drones = (self.cursor + np.arange(count)) % self.size
+        self.cursor = (self.cursor + count) % self.size
+        records = self.records(drones, now)
+        if fmt == wire.FORMAT_BINARY:
+            blob = records.tobytes()
+            size = GPS_RECORD_DTYPE.itemsize
+            payloads = [blob[i:i + size] for i in range(0, len(blob), size)]
+        else:
+            payloads = [
+                json.dumps({
+                    "timestamp": now, "lat": float(r["lat"]), "lon": float(r["lon"]),
+                    "alt": float(r["alt"]), "accuracy": float(r["accuracy"]),
+                    "type": "gps_data", "source": "FLEET SIM 🛸",
+                    "sealed_until": float(r["sealed_until"]), "nonce": int(r["nonce"]),
+                }).encode()
+                for r in records
+            ]
+        sealed_until = now + SEAL_DURATION
+        return [(payload, hashlib.sha256(payload).hexdigest()[:32], sealed_until) for payload in payloads]
+
+    async def run(self, rate: float, on_tasks: Callable[[List[Task]], Awaitable], duration: Optional[float] = None,
+                  tick: float = 0.05, fmt: str = wire.FORMAT_BINARY) -> int:
+        """
+        Emit tasks at `rate` per second (whole fleet) until `duration` elapses
+
+        The schedule is absolute: a slow `on_tasks` makes the next tick
+        emit more, so the average rate holds as long as the consumer keeps
+        up. Returns the number of tasks emitted.
+        """
+        loop = asyncio.get_running_loop()
+        started = last = loop.time()
+        emitted = 0
+        while duration is None or last - started < duration:
+            await asyncio.sleep(max(0.0, last + tick - loop.time()))
+            now = loop.time()
+            self.step(now - last)
+            last = now
+            due = int(rate * (now - started)) - emitted
+            if due > 0:
+                await on_tasks(self.tasks(due, fmt=fmt))
+                emitted += due
+        return emitted
+
+
+async def load_test(args):
+    """Push fleet tasks to the witnesses as binary batches and count quorums"""
+    from quorum import QuorumCollector
+    from witness_pool import WitnessPool
+
+    secret = os.getenv("HMAC_SECRET", "proof-of-task-secret-2025").encode()
+    urls = [url.strip() for url in os.getenv(
+        "WITNESS_URLS", "ws://localhost:8766,ws://localhost:8767,ws://localhost:8768").split(",") if url.strip()]
+    collector = QuorumCollector(required=args.quorum)
+    formats = [wire.FORMAT_BINARY]
+    pool = WitnessPool(urls, on_message=collector.on_message, formats=formats,
+                       hello=wire.seal_text(secret, json.dumps({"type": "hello", "formats": formats})))
+    await pool.start()
+    if not await pool.wait_ready():
+        print("[FLEET] No witness reachable")
+        return
+    if pool.formats_in_use() != {wire.FORMAT_BINARY}:
+        print(f"[FLEET] Witnesses must speak {wire.FORMAT_BINARY}; got {pool.formats_in_use()}")
+        await pool.close()
+        return
+
+    latencies = []
+    futures = []
+
+    def record(future):
+        # cancel_all() at shutdown may leave cancelled futures behind
+        if future.cancelled():
+            return
+        result = future.result()
+        if result["complete"]:
+            latencies.append(result["latency_ms"])
+
+    async def send(tasks):
+        for payload, cid, sealed_until in tasks:
+            future = collector.track(cid, payload, sealed_until)
+            future.add_done_callback(record)
+            futures.append(future)
+        for i in range(0, len(tasks), args.batch):
+            chunk = [(payload, cid) for payload, cid, _ in tasks[i:i + args.batch]]
+            await pool.broadcast(wire.encode_task_batch(secret, chunk, time.time()))
+
+    fleet = FleetSimulator(args.drones, seed=args.seed)
+    started = time.perf_counter()
+    emitted = await fleet.run(args.rate, send, duration=args.seconds)
+    await asyncio.wait(futures, timeout=5.0)
+    elapsed = time.perf_counter() - started
+    await pool.close()
+    collector.cancel_all()
+
+    latencies.sort()
+    print(f"[FLEET] {emitted} tasks sent, {collector.completed} reached quorum in {elapsed:.1f}s "
+          f"({collector.completed / elapsed:.0f} tasks/s)")
+    if latencies:
+        print(f"[FLEET] quorum latency p50={latencies[len(latencies) // 2]:.1f}ms "
+              f"p99={latencies[int(len(latencies) * 0.99)]:.1f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Vectorized drone fleet load generator")
+    parser.add_argument("--drones", type=int, default=1000)
+    parser.add_argument("--rate", type=float, default=2000, help="tasks per second across the fleet")
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--send", action="store_true", help="broadcast to WITNESS_URLS and count quorums")
+    parser.add_argument("--batch", type=int, default=64, help="tasks per new_task_batch frame with --send")
+    parser.add_argument("--quorum", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.send:
+        asyncio.run(load_test(args))
+        return
+
+    fleet = FleetSimulator(args.drones, seed=args.seed)
+    print(f"[FLEET] {len(fleet)} drones, {len(fleet.violators)} cruising above 120 m")
+    count = 0
+
+    async def consume(tasks):
+        nonlocal count
+        count += len(tasks)
+
+    started = time.perf_counter()
+    emitted = asyncio.run(fleet.run(args.rate, consume, duration=args.seconds))
+    elapsed = time.perf_counter() - started
+    print(f"[FLEET] emitted {emitted} sealed tasks in {elapsed:.1f}s ({emitted / elapsed:.0f}/s, target {args.rate:.0f}/s)")
+
+
+if __name__ == "__main__":
+    main()
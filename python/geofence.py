@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+# MirrorWitness PHASE2 2025-11-04
+
+import hashlib
+import json
+import math
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple, Union
+import numpy as np
+from constraints import Constraint, ConstraintEngine, register_constraint
+from gps_track import GpsTrack
+
+CELL_DEG = 0.01  # grid cell edge in degrees (~1.1 km of latitude)
+
+Ring = Sequence[Tuple[float, float]]  # [(lon, lat), ...]
+
+
+class Zone:
+    """One no-fly polygon: outer ring plus optional holes, (lon, lat) vertices"""
+
+    __slots__ = ("zone_id", "rings", "bbox")
+
+    def __init__(self, zone_id, outer: Ring, holes: Sequence[Ring] = ()):
+        self.zone_id = zone_id
+        self.rings = [np.asarray(ring, dtype=np.float64) for ring in (outer, *holes)]
+        xs, ys = self.rings[0][:, 0], self.rings[0][:, 1]
+        self.bbox = (float(xs.min()), float(ys.min()), float(xs.max()), float(ys.max()))
+
+    def contains(self, lon: np.ndarray, lat: np.ndarray) -> np.ndarray:
+        """Vectorized even-odd test; points inside a hole are outside"""
+        inside = _ring_contains(self.rings[0], lon, lat)
+        for hole in self.rings[1:]:
+            inside &= ~_ring_contains(hole, lon, lat)
+        return inside
+
+    def crosses(self, ax, ay, bx, by) -> np.ndarray:
+        """Vectorized test of segments a->b against every polygon edge"""
+        hit = np.zeros(len(ax), dtype=bool)
+        for ring in self.rings:
+            cx, cy = ring[:, 0], ring[:, 1]
+            dx, dy = np.roll(cx, -1), np.roll(cy, -1)
+            for x1, y1, x2, y2 in zip(cx, cy, dx, dy):
+                o1 = (bx - ax) * (y1 - ay) - (by - ay) * (x1 - ax)
+                o2 = (bx - ax) * (y2 - ay) - (by - ay) * (x2 - ax)
+                o3 = (x2 - x1) * (ay - y1) - (y2 - y1) * (ax - x1)
+                o4 = (x2 - x1) * (by - y1) - (y2 - y1) * (bx - x1)
+                # On one line the orientations are all zero: only a hit
+                # if the segments' extents actually overlap
+                collinear = (o1 == 0) & (o2 == 0) & (o3 == 0) & (o4 == 0)
+                overlap = ((np.minimum(ax, bx) <= max(x1, x2)) & (np.maximum(ax, bx) >= min(x1, x2)) &
+                           (np.minimum(ay, by) <= max(y1, y2)) & (np.maximum(ay, by) >= min(y1, y2)))
+                hit |= (o1 * o2 <= 0) & (o3 * o4 <= 0) & (~collinear | overlap)
+        return hit
+
+
+def _ring_contains(ring: np.ndarray, px: np.ndarray, py: np.ndarray) -> np.ndarray:
+    inside = np.zeros(len(px), dtype=bool)
+    xj, yj = ring[-1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for xi, yi in ring:
+            straddles = (yi > py) != (yj > py)
+            inside ^= straddles & (px < (xj - xi) * (py - yi) / (yj - yi) + xi)
+            xj, yj = xi, yi
+    return inside
+
+
+class GeofenceIndex:
+    """
+    Uniform lat/lon grid over no-fly polygons
+
+    Each zone is listed in every cell its bounding box touches. A track
+    query buckets points (and segments) by cell, keeps only the zones of
+    occupied cells, bounding-box filters them, and runs the exact polygon
+    tests vectorized over the points of that cell, roughly
+    O(points x candidates) instead of O(points x zones).
+    """
+
+    def __init__(self, zones: Sequence[Zone] = (), cell_deg: float = CELL_DEG):
+        self.cell_deg = cell_deg
+        self.zones: List[Zone] = []
+        self.cells: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+        self._fingerprint = None
+        for zone in zones:
+            self.add(zone)
+
+    def __len__(self) -> int:
+        return len(self.zones)
+
+    def _cell(self, lon: float, lat: float) -> Tuple[int, int]:
+        return math.floor(lon / self.cell_deg), math.floor(lat / self.cell_deg)
+
+    def add(self, zone: Zone):
+        idx = len(self.zones)
+        self.zones.append(zone)
+        self._fingerprint = None
+        x0, y0 = self._cell(zone.bbox[0], zone.bbox[1])
+        x1, y1 = self._cell(zone.bbox[2], zone.bbox[3])
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                self.cells[(cx, cy)].append(idx)
+
+    @classmethod
+    def from_geojson(cls, source: Union[str, Path, Dict], cell_deg: float = CELL_DEG) -> "GeofenceIndex":
+        """Load Polygon/MultiPolygon features; zone id from properties id/name"""
+        if not isinstance(source, dict):
+            source = json.loads(Path(source).read_text())
+        features = source.get("features", [source])
+        index = cls(cell_deg=cell_deg)
+        for n, feature in enumerate(features):
+            geometry = feature.get("geometry", feature)
+            props = feature.get("properties") or {}
+            zone_id = props.get("id", props.get("name", n))
+            if geometry["type"] == "Polygon":
+                polygons = [geometry["coordinates"]]
+            elif geometry["type"] == "MultiPolygon":
+                polygons = geometry["coordinates"]
+            else:
+                continue
+            for rings in polygons:
+                index.add(Zone(zone_id, rings[0], rings[1:]))
+        return index
+
+    def fingerprint(self) -> str:
+        """SHA-256 over every zone's vertices, the public commitment to the zone set"""
+        if self._fingerprint is None:
+            digest = hashlib.sha256()
+            for zone in self.zones:
+                digest.update(str(zone.zone_id).encode())
+                for ring in zone.rings:
+                    digest.update(ring.tobytes())
+            self._fingerprint = digest.hexdigest()
+        return self._fingerprint
+
+    def _grid(self, values: np.ndarray) -> np.ndarray:
+        return np.floor(values / self.cell_deg).astype(np.int64)
+
+    @staticmethod
+    def _by_cell(cx: np.ndarray, cy: np.ndarray):
+        """Group positions by grid cell: yields (cell, positions)"""
+        if not len(cx):
+            return
+        keys = np.stack([cx, cy], axis=1)
+        cells, inverse = np.unique(keys, axis=0, return_inverse=True)
+        order = np.argsort(inverse.ravel(), kind="stable")
+        bounds = np.searchsorted(inverse.ravel()[order], np.arange(len(cells) + 1))
+        for i, (x, y) in enumerate(cells):
+            yield (int(x), int(y)), order[bounds[i]:bounds[i + 1]]
+
+    def check_track(self, lon: np.ndarray, lat: np.ndarray) -> List[Dict]:
+        """
+        Every point inside a zone and every segment crossing one
+
+        Returns:
+            [{"zone_id", "kind": "point"|"segment", "index", "lat", "lon"}] sorted by index
+        """
+        lon = np.asarray(lon, dtype=np.float64)
+        lat = np.asarray(lat, dtype=np.float64)
+        hits = []
+        inside_any = np.zeros(len(lon), dtype=bool)
+
+        for cell, idx in self._by_cell(self._grid(lon), self._grid(lat)):
+            candidates = self.cells.get(cell)
+            if not candidates:
+                continue
+            px, py = lon[idx], lat[idx]
+            for zone_idx in candidates:
+                zone = self.zones[zone_idx]
+                x0, y0, x1, y1 = zone.bbox
+                box = (px >= x0) & (px <= x1) & (py >= y0) & (py <= y1)
+                if not box.any():
+                    continue
+                inside = np.zeros(len(idx), dtype=bool)
+                inside[box] = zone.contains(px[box], py[box])
+                for i in idx[inside]:
+                    inside_any[i] = True
+                    hits.append({"zone_id": zone.zone_id, "kind": "point", "index": int(i),
+                                 "lat": float(lat[i]), "lon": float(lon[i])})
+
+        hits.extend(self._check_segments(lon, lat, inside_any))
+        hits.sort(key=lambda hit: (hit["index"], hit["kind"]))
+        return hits
+
+    def _check_segments(self, lon, lat, inside_any) -> List[Dict]:
+        """Segments whose endpoints are both outside but which clip a zone"""
+        if len(lon) < 2:
+            return []
+        seg = np.flatnonzero(~inside_any[:-1] & ~inside_any[1:])
+        ax, ay, bx, by = lon[seg], lat[seg], lon[seg + 1], lat[seg + 1]
+
+        # Cells touched by each segment's bounding box; nearly always one
+        x0, x1 = self._grid(np.minimum(ax, bx)), self._grid(np.maximum(ax, bx))
+        y0, y1 = self._grid(np.minimum(ay, by)), self._grid(np.maximum(ay, by))
+        single = (x0 == x1) & (y0 == y1)
+        candidates = defaultdict(list)  # zone idx -> arrays of segment positions
+        one_cell = np.flatnonzero(single)
+        for cell, pos in self._by_cell(x0[one_cell], y0[one_cell]):
+            for zone_idx in self.cells.get(cell, ()):
+                candidates[zone_idx].append(one_cell[pos])
+        for k in np.flatnonzero(~single):
+            for cx in range(x0[k], x1[k] + 1):
+                for cy in range(y0[k], y1[k] + 1):
+                    for zone_idx in self.cells.get((cx, cy), ()):
+                        candidates[zone_idx].append(np.array([k]))
+
+        hits = []
+        for zone_idx, positions in candidates.items():
+            zone = self.zones[zone_idx]
+            k = np.unique(np.concatenate(positions))
+            zx0, zy0, zx1, zy1 = zone.bbox
+            box = ((np.maximum(ax[k], bx[k]) >= zx0) & (np.minimum(ax[k], bx[k]) <= zx1) &
+                   (np.maximum(ay[k], by[k]) >= zy0) & (np.minimum(ay[k], by[k]) <= zy1))
+            k = k[box]
+            if not len(k):
+                continue
+            for j in k[zone.crosses(ax[k], ay[k], bx[k], by[k])]:
+                i = int(seg[j])
+                hits.append({"zone_id": zone.zone_id, "kind": "segment", "index": i,
+                             "lat": float(lat[i]), "lon": float(lon[i])})
+        return hits
+
+
+@register_constraint
+class NoFlyZones(Constraint):
+    """No point of the track inside, and no segment across, any indexed zone"""
+
+    name = "no_fly_zones"
+    circuit = "geofence_check_v1"
+
+    def __init__(self, index: GeofenceIndex):
+        super().__init__(index=index)
+
+    def public_inputs(self) -> Dict:
+        index = self.params["index"]
+        return {"zones_root": index.fingerprint(), "num_zones": len(index)}
+
+    def describe(self) -> str:
+        return f"outside {len(self.params['index'])} no-fly zones"
+
+    def evaluate(self, ctx):
+        hits = self.params["index"].check_track(ctx.columns["lon"], ctx.columns["lat"])
+        return not hits, {
+            "zone_violations": len(hits),
+            "violated_zones": sorted({str(hit["zone_id"]) for hit in hits}),
+            "first_violation": hits[0] if hits else None,
+        }
+
+
+class GeofenceProver:
+    """Geofence circuit with `NautilusProofAltitude.generate_proof`-shaped output"""
+
+    def __init__(self, index: GeofenceIndex):
+        self.engine = ConstraintEngine([("no_fly_zones", {"index": index})])
+
+    def generate_proof(self, gps_points: Union[List[Dict], GpsTrack]) -> Dict:
+        return self.engine.generate_proofs(gps_points)["proofs"][NoFlyZones.circuit]
+
+
+def test_geofence():
+    """Test segment crossings against an L-shaped zone"""
+    print("=== Geofence Test ===\n")
+
+    # L shape: long arm along the bottom, short arm up the left side
+    index = GeofenceIndex([Zone("L", [(0, 0), (0.06, 0), (0.06, 0.02),
+                                      (0.02, 0.02), (0.02, 0.04), (0, 0.04)])])
+    cases = [
+        # (description, lons, lats, expected hits)
+        ("Through the notch, on the line of the top edge", [0.025, 0.035], [0.04, 0.04], 0),
+        ("Along the top edge, overlapping it", [-0.01, 0.01], [0.04, 0.04], 1),
+        ("Across the short arm", [-0.01, 0.03], [0.03, 0.03], 1),
+        ("Clear of the zone", [0.07, 0.08], [0.05, 0.05], 0),
+    ]
+    failed = 0
+    for description, lons, lats, expected in cases:
+        hits = index.check_track(np.array(lons, dtype=np.float64), np.array(lats, dtype=np.float64))
+        ok = len(hits) == expected
+        failed += not ok
+        print(f"  {description}: {len(hits)} hit(s) {'✓' if ok else '✗'}")
+    assert not failed, f"{failed} geofence case(s) failed"
+
+
+if __name__ == "__main__":
+    test_geofence()
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+# MirrorWitness PHASE2 2025-11-04
+
+import asyncio
+import bisect
+import json
+import random
+import shutil
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+from metrics import Logger
+
+TERMUX_UPDATE_MS = 1000  # termux-location -d: delay between streamed updates
+TERMUX_STALE_AFTER = 10.0  # seconds without an update before falling back to mock
+TERMUX_RESTART_MIN = 1.0
+TERMUX_RESTART_MAX = 30.0
+
+log = Logger("[GPS]")
+
+
+def mock_fix() -> Dict:
+    """Fallback mock GPS"""
+    return {
+        "timestamp": time.time(),
+        "lat": round(37.7749 + random.uniform(-0.001, 0.001), 6),
+        "lon": round(-122.4194 + random.uniform(-0.001, 0.001), 6),
+        "alt": round(100 + random.uniform(-2, 2), 2),
+        "accuracy": 10.0,
+        "type": "gps_data",
+        "source": "MOCK GPS 🎭"
+    }
+
+
+class GpsSource:
+    """
+    Async GPS source: `read()` returns the current fix without blocking
+
+    Sources that produce fixes on their own schedule (a device stream, a
+    replay clock) hand back the most recent one; `read()` never waits on
+    hardware, so the miner's event loop keeps serving witness I/O.
+    """
+
+    name = "GPS"
+
+    async def start(self):
+        pass
+
+    async def read(self) -> Dict:
+        raise NotImplementedError
+
+    async def close(self):
+        pass
+
+
+class TermuxStreamSource(GpsSource):
+    """
+    Real GPS from Android Termux API, as one long-lived update stream
+
+    Runs `termux-location -r updates` once and parses the concatenated
+    (pretty-printed) JSON objects incrementally off its stdout. The process
+    is restarted with backoff if it exits; until the first fix arrives, or
+    when the stream goes stale, `read()` falls back to mock GPS.
+    """
+
+    name = "LIVE GPS 📍"
+
+    def __init__(self, provider: str = "gps", update_ms: int = TERMUX_UPDATE_MS):
+        self.provider = provider
+        self.update_ms = update_ms
+        self.latest: Optional[Dict] = None
+        self.received_at = 0.0
+        self.updates = 0
+        self.process: Optional[asyncio.subprocess.Process] = None
+        self.reader: Optional[asyncio.Task] = None
+        self.available = shutil.which("termux-location") is not None
+        if self.available:
+            log.info("✓ Termux API available")
+        else:
+            log.warning("⚠ Termux API not available, will use mock GPS")
+
+    async def start(self):
+        if self.available and self.reader is None:
+            self.reader = asyncio.create_task(self._run())
+
+    async def _run(self):
+        backoff = TERMUX_RESTART_MIN
+        while True:
+            try:
+                self.process = await asyncio.create_subprocess_exec(
+                    "termux-location", "-p", self.provider, "-r", "updates", "-d", str(self.update_ms),
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.DEVNULL,
+                )
+                before = self.updates
+                await self._consume(self.process.stdout)
+                await self.process.wait()
+                if self.updates > before:
+                    backoff = TERMUX_RESTART_MIN
+                log.warning("termux-location exited (%s), restarting in %.0fs", self.process.returncode, backoff)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                log.warning("termux-location stream failed: %s, restarting in %.0fs", e, backoff)
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, TERMUX_RESTART_MAX)
+
+    async def _consume(self, stream: asyncio.StreamReader):
+        decoder = json.JSONDecoder()
+        buffer = ""
+        while True:
+            chunk = await stream.read(4096)
+            if not chunk:
+                return
+            buffer += chunk.decode(errors="replace")
+            while True:
+                buffer = buffer.lstrip()
+                if not buffer:
+                    break
+                try:
+                    data, end = decoder.raw_decode(buffer)
+                except json.JSONDecodeError:
+                    break  # object still incomplete; wait for more bytes
+                buffer = buffer[end:]
+                if isinstance(data, dict) and "latitude" in data:
+                    self._update(data)
+
+    def _update(self, data: Dict):
+        self.latest = {
+            "timestamp": time.time(),
+            "lat": round(data.get('latitude', 0), 6),
+            "lon": round(data.get('longitude', 0), 6),
+            "alt": round(data.get('altitude', 100), 2),
+            "accuracy": round(data.get('accuracy', 0), 2),
+            "type": "gps_data",
+            "source": self.name
+        }
+        self.received_at = time.monotonic()
+        self.updates += 1
+
+    async def read(self) -> Dict:
+        if self.latest is None or time.monotonic() - self.received_at > TERMUX_STALE_AFTER:
+            return mock_fix()
+        return dict(self.latest, timestamp=time.time())
+
+    async def close(self):
+        if self.reader is not None:
+            self.reader.cancel()
+            await asyncio.gather(self.reader, return_exceptions=True)
+            self.reader = None
+        if self.process is not None and self.process.returncode is None:
+            self.process.kill()
+            await self.process.wait()
+
+
+class DroneSimulator:
+    def __init__(self):
+        self.lat = 37.7749  # San Francisco
+        self.lon = -122.4194
+        self.alt = 100.0
+        self.speed = 0.0001  # degrees per second
+
+    def update(self):
+        """Simulate drone movement"""
+        angle = random.uniform(0, 2 * 3.14159)
+        self.lat += self.speed * random.uniform(0.5, 1.5) * (1 if random.random() > 0.5 else -1)
+        self.lon += self.speed * random.uniform(0.5, 1.5) * (1 if random.random() > 0.5 else -1)
+        self.alt += random.uniform(-1, 1)
+
+        return {
+            "timestamp": time.time(),
+            "lat": round(self.lat, 6),
+            "lon": round(self.lon, 6),
+            "alt": round(self.alt, 2),
+            "type": "gps_data",
+            "source": "SIMULATED 🎮"
+        }
+
+
+class SimulatorSource(GpsSource):
+    """`DroneSimulator` behind the async source interface"""
+
+    name = "SIMULATED 🎮"
+
+    def __init__(self, drone: DroneSimulator = None):
+        self.drone = drone or DroneSimulator()
+
+    async def read(self) -> Dict:
+        return self.drone.update()
+
+
+class ReplaySource(GpsSource):
+    """
+    Plays a recorded track back against the wall clock
+
+    The file holds points with a `timestamp` field, either as a JSON array
+    or one JSON object per line (e.g. a Walrus blob dump or a logged
+    session). Recorded time advances `speed` times faster than real time
+    from `start()`; `read()` returns the last point already due, so a
+    replay at 10x sampled once a second skips the points in between. With
+    `loop` the track restarts after its last point.
+    """
+
+    name = "REPLAY ⏯"
+
+    def __init__(self, path, speed: float = 1.0, loop: bool = True):
+        self.path = Path(path)
+        self.speed = speed
+        self.loop = loop
+        self.points = self._load(self.path)
+        if not self.points:
+            raise ValueError(f"no GPS points in {self.path}")
+        self.times = [p["timestamp"] for p in self.points]
+        self.duration = self.times[-1] - self.times[0]
+        self.started: Optional[float] = None
+        log.info("Replaying %d points (%.0fs) from %s at %sx", len(self.points), self.duration, self.path, speed)
+
+    @staticmethod
+    def _load(path: Path) -> List[Dict]:
+        text = path.read_text()
+        if text.lstrip().startswith("["):
+            points = json.loads(text)
+        else:
+            points = [json.loads(line) for line in text.splitlines() if line.strip()]
+        points = [p for p in points if "lat" in p and "lon" in p]
+        for n, point in enumerate(points):
+            point.setdefault("timestamp", float(n))
+            point.setdefault("alt", 0.0)
+        points.sort(key=lambda p: p["timestamp"])
+        return points
+
+    async def start(self):
+        if self.started is None:
+            self.started = time.monotonic()
+
+    async def read(self) -> Dict:
+        await self.start()
+        elapsed = (time.monotonic() - self.started) * self.speed
+        if self.loop and self.duration > 0:
+            elapsed %= self.duration
+        due = bisect.bisect_right(self.times, self.times[0] + elapsed) - 1
+        point = self.points[max(due, 0)]
+        return {"type": "gps_data", **point, "source": self.name}
+
+
+def make_source(kind: str, replay_file: str = "", replay_speed: float = 1.0) -> GpsSource:
+    """Build the source named by GPS_SOURCE: termux, simulator or replay"""
+    if kind == "termux":
+        return TermuxStreamSource()
+    if kind == "simulator":
+        return SimulatorSource()
+    if kind == "replay":
+        if not replay_file:
+            raise ValueError("GPS_SOURCE=replay needs GPS_REPLAY_FILE")
+        return ReplaySource(replay_file, speed=replay_speed)
+    raise ValueError(f"unknown GPS_SOURCE: {kind}")
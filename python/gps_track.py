@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# MirrorWitness PHASE2 2025-11-04
+
+import hashlib
+import math
+import struct
+from array import array
+from typing import Dict, Iterable, List
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; columns stay plain typed arrays
+    np = None
+
+FIELDS = ("timestamp", "lat", "lon", "alt", "accuracy")
+TYPECODES = {"timestamp": "d", "lat": "d", "lon": "d", "alt": "d", "accuracy": "d"}
+
+
+class GpsTrack:
+    """
+    Columnar GPS track: one typed array per field
+
+    Uses 40 bytes per point instead of a dict per point. Values come back
+    exactly as stored, so `to_points` round-trips and proofs match across
+    containers. Missing accuracy is stored as NaN and dropped again by
+    `to_points`. `numpy()` returns
+    zero-copy views; drop them before appending, since a typed array cannot
+    grow while its buffer is exported.
+    """
+
+    __slots__ = FIELDS
+
+    def __init__(self, timestamp: Iterable[float] = (), lat: Iterable[float] = (),
+                 lon: Iterable[float] = (), alt: Iterable[float] = (),
+                 accuracy: Iterable[float] = None):
+        self.timestamp = array("d", timestamp)
+        self.lat = array("d", lat)
+        self.lon = array("d", lon)
+        self.alt = array("d", alt)
+        if accuracy is None:
+            self.accuracy = array("d", [math.nan]) * len(self.timestamp)
+        else:
+            self.accuracy = array("d", accuracy)
+        sizes = {len(getattr(self, name)) for name in FIELDS}
+        if len(sizes) > 1:
+            raise ValueError(f"column lengths differ: {sizes}")
+
+    @classmethod
+    def from_points(cls, points: List[Dict]) -> "GpsTrack":
+        """Build from the dict-list format used by `generate_proof`"""
+        return cls(
+            timestamp=(p.get("timestamp", 0.0) for p in points),
+            lat=(p.get("lat", 0.0) for p in points),
+            lon=(p.get("lon", 0.0) for p in points),
+            alt=(p.get("alt", 0) for p in points),
+            accuracy=(p.get("accuracy", math.nan) for p in points),
+        )
+
+    def to_points(self) -> List[Dict]:
+        """Convert back to the dict-list format"""
+        return [self[i] for i in range(len(self))]
+
+    def __len__(self) -> int:
+        return len(self.timestamp)
+
+    def __getitem__(self, i: int) -> Dict:
+        point = {
+            "lat": self.lat[i],
+            "lon": self.lon[i],
+            "alt": self.alt[i],
+            "timestamp": self.timestamp[i],
+        }
+        accuracy = self.accuracy[i]
+        if not math.isnan(accuracy):
+            point["accuracy"] = accuracy
+        return point
+
+    def append(self, point: Dict):
+        self.timestamp.append(point.get("timestamp", 0.0))
+        self.lat.append(point.get("lat", 0.0))
+        self.lon.append(point.get("lon", 0.0))
+        self.alt.append(point.get("alt", 0))
+        self.accuracy.append(point.get("accuracy", math.nan))
+
+    def extend(self, points: Iterable[Dict]):
+        for point in points:
+            self.append(point)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(len(col) * col.itemsize for col in (getattr(self, name) for name in FIELDS))
+
+    def tobytes(self) -> bytes:
+        """Canonical byte image of the track (columns concatenated in FIELDS order)"""
+        return b"".join(getattr(self, name).tobytes() for name in FIELDS)
+
+    def digest(self) -> bytes:
+        """Canonical SHA-256 of the points; equals `TrackHasher` fed the same points"""
+        hasher = TrackHasher()
+        hasher.columns = [hashlib.sha256(getattr(self, name).tobytes()) for name in FIELDS]
+        return hasher.digest()
+
+    def numpy(self) -> Dict:
+        """Zero-copy NumPy views of every column (requires NumPy)"""
+        if np is None:
+            raise RuntimeError("NumPy is not installed")
+        return {
+            name: np.frombuffer(getattr(self, name), dtype=np.float32 if TYPECODES[name] == "f" else np.float64)
+            for name in FIELDS
+        }
+
+
+class TrackHasher:
+    """
+    Incremental form of `GpsTrack.digest` for points arriving one by one
+
+    One SHA-256 per column over the packed values, combined by hashing
+    the column digests in FIELDS order, so dict lists, columnar tracks and
+    streams of points all commit to the same bytes.
+    """
+
+    PACK = {name: struct.Struct("=" + TYPECODES[name]).pack for name in FIELDS}
+
+    def __init__(self):
+        self.columns = [hashlib.sha256() for _ in FIELDS]
+
+    def update(self, point: Dict):
+        # Same defaults as GpsTrack.append
+        self.columns[0].update(self.PACK["timestamp"](point.get("timestamp", 0.0)))
+        self.columns[1].update(self.PACK["lat"](point.get("lat", 0.0)))
+        self.columns[2].update(self.PACK["lon"](point.get("lon", 0.0)))
+        self.columns[3].update(self.PACK["alt"](point.get("alt", 0)))
+        self.columns[4].update(self.PACK["accuracy"](point.get("accuracy", math.nan)))
+
+    def digest(self) -> bytes:
+        return hashlib.sha256(b"".join(column.digest() for column in self.columns)).digest()
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+# MirrorWitness PHASE2 2025-11-04
+
+import argparse
+import heapq
+import json
+import math
+import time
+from typing import Dict, Optional, Tuple
+import numpy as np
+from lora_sim import SENSITIVITY_DBM, path_loss_db
+
+CAPTURE_DB = 6.0     # a packet survives interference this much weaker than itself
+DUTY_CYCLE = 0.01    # EU868 sub-band limit; 0 disables
+PREAMBLE_SYMBOLS = 8
+BEACON_PERIOD = 10.0  # seconds, as in lora_beacon_loop
+# Size of the JSON beacon sent by lora_beacon_loop
+BEACON_BYTES = len(json.dumps({"type": "witness_beacon", "witness_id": "virtual_001",
+                               "timestamp": 1730700000.123456, "status": "ready"}))
+
+_TX_END, _TX_START = 0, 1  # at equal times a packet ends before the next one starts
+
+
+def airtime(payload_bytes: int, sf: int = 7, bw_khz: float = 125.0, cr: int = 1,
+            preamble: int = PREAMBLE_SYMBOLS, explicit_header: bool = True, crc: bool = True,
+            low_data_rate: Optional[bool] = None) -> float:
+    """Time on air in seconds (Semtech AN1200.13); `cr` 1..4 means coding rate 4/5..4/8"""
+    t_sym = (2 ** sf) / (bw_khz * 1000)
+    if low_data_rate is None:
+        low_data_rate = t_sym > 0.016  # mandated above 16 ms symbols (SF11/12 at 125 kHz)
+    de = 1 if low_data_rate else 0
+    ih = 0 if explicit_header else 1
+    bits = 8 * payload_bytes - 4 * sf + 28 + 16 * int(crc) - 20 * ih
+    payload_symbols = 8 + max(math.ceil(bits / (4 * (sf - 2 * de))) * (cr + 4), 0)
+    return (preamble + 4.25) * t_sym + payload_symbols * t_sym
+
+
+def range_km(power_dbm: float, freq_mhz: float, floor_dbm: float) -> float:
+    """Largest distance at which `path_loss_db` keeps the signal at or above `floor_dbm`"""
+    lo, hi = 0.0, 1.0
+    while power_dbm - path_loss_db(hi, freq_mhz) >= floor_dbm:
+        hi *= 2
+    for _ in range(60):
+        mid = (lo + hi) / 2
+        if power_dbm - path_loss_db(mid, freq_mhz) >= floor_dbm:
+            lo = mid
+        else:
+            hi = mid
+    return lo
+
+
+def neighbor_pairs(x: np.ndarray, y: np.ndarray, radius: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Every ordered pair (i, j), i != j, closer than `radius`, with its distance
+
+    Points are bucketed on a grid of `radius` cells and each cell is joined
+    with its 3x3 neighbourhood through one argsort and two searchsorted
+    calls per offset, so the cost is linear in the number of candidates.
+    """
+    n = len(x)
+    cx = np.floor(x / radius).astype(np.int64)
+    cy = np.floor(y / radius).astype(np.int64)
+    span = int(cy.max() - cy.min()) + 3
+    cy = cy - cy.min() + 1
+    key = cx * span + cy
+    order = np.argsort(key, kind="stable")
+    sorted_keys = key[order]
+    sources, targets, distances = [], [], []
+    for dx in (-1, 0, 1):
+        for dy in (-1, 0, 1):
+            wanted = key + dx * span + dy
+            lo = np.searchsorted(sorted_keys, wanted, "left")
+            counts = np.searchsorted(sorted_keys, wanted, "right") - lo
+            total = int(counts.sum())
+            if not total:
+                continue
+            src = np.repeat(np.arange(n), counts)
+            starts = np.repeat(lo - (np.cumsum(counts) - counts), counts)
+            dst = order[starts + np.arange(total)]
+            d = np.hypot(x[src] - x[dst], y[src] - y[dst])
+            keep = (src != dst) & (d <= radius)
+            sources.append(src[keep])
+            targets.append(dst[keep])
+            distances.append(d[keep])
+    if not sources:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty, np.empty(0)
+    return np.concatenate(sources), np.concatenate(targets), np.concatenate(distances)
+
+
+class LoRaNetwork:
+    """
+    Discrete-event simulation of many `VirtualLoRa` radios on a shared medium
+
+    Radios sit on a plane (km). Received power uses the same path loss as
+    `VirtualLoRa.calculate_signal_strength`; a packet is decodable at
+    `SENSITIVITY_DBM` and above. Each radio's neighbours (same channel,
+    strong enough to receive or to interfere) are found once through a grid
+    join and stored as arrays, so each transmission touches its neighbours
+    with a few vectorized operations.
+
+    Collisions use running power sums per receiver: the interference a
+    packet sees at a neighbour is the power of every packet that started
+    before it ended minus every packet that had already ended when it
+    started. The packet is received when it is at least `capture_db` above
+    that sum and the receiver was not itself transmitting (half duplex).
+    A radio that has used its duty cycle defers its next transmission by a
+    random backoff past its off time.
+    """
+
+    def __init__(self, x_km, y_km, power_dbm: float = 20, freq_mhz: float = 915.0,
+                 sf: int = 7, bw_khz: float = 125.0, cr: int = 1,
+                 sensitivity_dbm: float = SENSITIVITY_DBM, capture_db: float = CAPTURE_DB,
+                 duty_cycle: float = DUTY_CYCLE, channels: int = 1, seed: Optional[int] = None):
+        self.x = np.asarray(x_km, dtype=np.float64)
+        self.y = np.asarray(y_km, dtype=np.float64)
+        self.n = len(self.x)
+        self.power = power_dbm
+        self.freq = freq_mhz
+        self.sf, self.bw, self.cr = sf, bw_khz, cr
+        self.sensitivity = sensitivity_dbm
+        self.capture_ratio = 10 ** (capture_db / 10)
+        self.duty_cycle = duty_cycle
+        self.rng = np.random.default_rng(seed)
+        self.channel = np.arange(self.n) % max(1, channels)
+        # Interferers down to capture_db below sensitivity can still break a weak packet
+        self.radius = range_km(power_dbm, freq_mhz, sensitivity_dbm - capture_db)
+        self._build_neighbors()
+
+    @classmethod
+    def random(cls, radios: int, area_km: float, seed: Optional[int] = None, **kwargs) -> "LoRaNetwork":
+        """`radios` placed uniformly over an `area_km` x `area_km` square"""
+        rng = np.random.default_rng(seed)
+        return cls(rng.uniform(0, area_km, radios), rng.uniform(0, area_km, radios), seed=seed, **kwargs)
+
+    def _build_neighbors(self):
+        src, dst, dist = neighbor_pairs(self.x, self.y, self.radius)
+        same = self.channel[src] == self.channel[dst]
+        src, dst, dist = src[same], dst[same], dist[same]
+        rssi = self.power - path_loss_db(dist, self.freq)
+        order = np.argsort(src, kind="stable")
+        src, dst, rssi = src[order], dst[order], rssi[order]
+        bounds = np.concatenate(([0], np.cumsum(np.bincount(src, minlength=self.n))))
+        self.neighbors = [dst[bounds[i]:bounds[i + 1]] for i in range(self.n)]
+        self.rssi = [rssi[bounds[i]:bounds[i + 1]] for i in range(self.n)]
+        self.power_mw = [10 ** (r / 10) for r in self.rssi]
+        self.audible = [r >= self.sensitivity for r in self.rssi]
+        self.degree = np.array([int(a.sum()) for a in self.audible])
+
+    def neighbors_of(self, i: int) -> Dict:
+        """Radios that can decode `i` (ignoring collisions), with their RSSI"""
+        audible = self.audible[i]
+        return {"radios": self.neighbors[i][audible], "rssi_dbm": self.rssi[i][audible]}
+
+    def run(self, duration: float, period: float = BEACON_PERIOD, payload_bytes: int = BEACON_BYTES,
+            jitter: float = 0.05, progress: float = 0.0) -> Dict:
+        """
+        Every radio beacons `payload_bytes` each `period` (+/- `jitter`) for
+        `duration` virtual seconds; returns delivery statistics
+        """
+        toa = airtime(payload_bytes, self.sf, self.bw, self.cr)
+        off_time = toa / self.duty_cycle if self.duty_cycle > 0 else toa
+        started_mw = np.zeros(self.n)   # power of packets that started, per receiver
+        ended_mw = np.zeros(self.n)     # power of packets that ended, per receiver
+        tx_started = np.zeros(self.n, dtype=np.int64)
+        tx_ended = np.zeros(self.n, dtype=np.int64)
+        next_allowed = np.zeros(self.n)
+        received = np.zeros(self.n, dtype=np.int64)
+        stats = {"transmissions": 0, "deferred": 0, "audible": 0, "delivered": 0,
+                 "lost_collision": 0, "lost_half_duplex": 0}
+
+        events = [(t, _TX_START, i, i, None) for i, t in enumerate(self.rng.uniform(0, period, self.n))]
+        heapq.heapify(events)
+        seq = self.n
+        jitters = iter(())
+        wall = time.perf_counter()
+        next_report = progress
+        neighbors, power_mw, audible = self.neighbors, self.power_mw, self.audible
+        push, pop = heapq.heappush, heapq.heappop
+
+        while events and events[0][0] < duration:
+            t, kind, _, i, snapshot = pop(events)
+            nbrs = neighbors[i]
+            if kind == _TX_START:
+                if t < next_allowed[i]:
+                    # Random backoff past the off time: deferring to the exact
+                    # instant phase-locks radios that collided once
+                    stats["deferred"] += 1
+                    seq += 1
+                    push(events, (next_allowed[i] + period * jitter * self.rng.random(), _TX_START, seq, i, None))
+                    continue
+                stats["transmissions"] += 1
+                next_allowed[i] = t + off_time
+                tx_started[i] += 1
+                started_mw[nbrs] += power_mw[i]
+                seq += 1
+                push(events, (t + toa, _TX_END, seq, i, (ended_mw[nbrs], tx_ended[nbrs])))
+                jitter_factor = next(jitters, None)
+                if jitter_factor is None:
+                    jitters = iter(self.rng.uniform(1 - jitter, 1 + jitter, 65536).tolist())
+                    jitter_factor = next(jitters)
+                seq += 1
+                push(events, (t + period * jitter_factor, _TX_START, seq, i, None))
+                if progress and t >= next_report:
+                    rate = t / (time.perf_counter() - wall)
+                    print(f"[LORA-NET] t={t / 60:.0f} min, {stats['transmissions']:,} packets, "
+                          f"{rate:.0f}x real time")
+                    next_report += progress
+            else:
+                ended_before, busy_before = snapshot
+                own = power_mw[i]
+                interference = started_mw[nbrs] - ended_before - own
+                busy = (tx_started[nbrs] - busy_before) > 0
+                hear = audible[i]
+                captured = own >= self.capture_ratio * np.maximum(interference, 0.0)
+                ok = hear & captured & ~busy
+                stats["audible"] += int(hear.sum())
+                stats["delivered"] += int(ok.sum())
+                stats["lost_half_duplex"] += int((hear & busy).sum())
+                stats["lost_collision"] += int((hear & ~busy & ~captured).sum())
+                received[nbrs[ok]] += 1
+                ended_mw[nbrs] += own
+                tx_ended[i] += 1
+
+        elapsed = time.perf_counter() - wall
+        stats.update({
+            "radios": self.n,
+            "virtual_seconds": duration,
+            "wall_seconds": round(elapsed, 2),
+            "speedup": round(duration / elapsed, 1) if elapsed else None,
+            "airtime_ms": round(toa * 1000, 2),
+            "range_km": round(range_km(self.power, self.freq, self.sensitivity), 3),
+            "neighbors_mean": round(float(self.degree.mean()), 1) if self.n else 0,
+            "neighbors_max": int(self.degree.max()) if self.n else 0,
+            "isolated": int((self.degree == 0).sum()),
+            "delivery_ratio": round(stats["delivered"] / stats["audible"], 4) if stats["audible"] else None,
+            "received_per_radio_p50": float(np.median(received)) if self.n else 0,
+            "never_heard": int((received == 0).sum()),
+        })
+        return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Discrete-event LoRa mesh simulation of beaconing witnesses")
+    parser.add_argument("--radios", type=int, default=10_000)
+    parser.add_argument("--area-km", type=float, default=100.0, help="side of the square the radios are spread over")
+    parser.add_argument("--hours", type=float, default=1.0, help="virtual time to simulate")
+    parser.add_argument("--period", type=float, default=BEACON_PERIOD, help="seconds between beacons")
+    parser.add_argument("--payload", type=int, default=BEACON_BYTES, help="beacon bytes")
+    parser.add_argument("--sf", type=int, default=7)
+    parser.add_argument("--bw", type=float, default=125.0, help="kHz")
+    parser.add_argument("--cr", type=int, default=1, help="1..4 for coding rate 4/5..4/8")
+    parser.add_argument("--power", type=float, default=20.0, help="dBm")
+    parser.add_argument("--duty-cycle", type=float, default=DUTY_CYCLE, help="0 disables")
+    parser.add_argument("--channels", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", action="store_true", help="print the result as JSON")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    net = LoRaNetwork.random(args.radios, args.area_km, seed=args.seed, power_dbm=args.power,
+                             sf=args.sf, bw_khz=args.bw, cr=args.cr,
+                             duty_cycle=args.duty_cycle, channels=args.channels)
+    print(f"[LORA-NET] {args.radios:,} radios over {args.area_km:g} km x {args.area_km:g} km, "
+          f"{len(net.degree) and net.degree.mean():.1f} neighbours each on average "
+          f"(index built in {time.perf_counter() - started:.1f}s)")
+    result = net.run(args.hours * 3600, args.period, args.payload, progress=600)
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+    print(f"[LORA-NET] {result['transmissions']:,} beacons of {result['airtime_ms']}ms in "
+          f"{args.hours:g}h virtual time, simulated in {result['wall_seconds']}s ({result['speedup']}x)")
+    print(f"[LORA-NET] delivery {result['delivered']:,}/{result['audible']:,} "
+          f"({result['delivery_ratio']}), lost to collisions {result['lost_collision']:,}, "
+          f"half duplex {result['lost_half_duplex']:,}, duty-cycle deferrals {result['deferred']:,}")
+    print(f"[LORA-NET] {result['isolated']} radios without neighbours, {result['never_heard']} never heard anyone")
+
+
+if __name__ == "__main__":
+    main()
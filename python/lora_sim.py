@@ -4,6 +4,20 @@
 import asyncio
 import json
 import time
+from metrics import Logger, counter
+
+log = Logger("[LoRa]")
+trace = log.sampled()
+TX_PACKETS = counter("pot_lora_packets_total", "Virtual LoRa packets", direction="tx")
+RX_PACKETS = counter("pot_lora_packets_total", "Virtual LoRa packets", direction="rx")
+RX_WEAK = counter("pot_lora_packets_total", "Virtual LoRa packets", direction="rx_too_weak")
+SENSITIVITY_DBM = -120  # weakest decodable signal
+
+
+def path_loss_db(distance_km, freq_mhz):
+    """Simplified free-space path loss; works on scalars and NumPy arrays"""
+    return 32.45 + 20 * distance_km + 20 * (freq_mhz / 1000)
+
 
 class VirtualLoRa:
     """
@@ -18,20 +32,18 @@ class VirtualLoRa:
         self.range_km = 4.8  # Simulated range
         self.channel = f"lora_{int(freq_mhz)}"
         
-        print(f"[LoRa] Virtual SX1262 initialized")
-        print(f"[LoRa] Frequency: {freq_mhz} MHz")
-        print(f"[LoRa] Power: {power_dbm} dBm")
-        print(f"[LoRa] Range: {self.range_km} km (simulated)")
-        print(f"[LoRa] Bandwidth: {bandwidth_khz} kHz")
+        log.info("Virtual SX1262 initialized")
+        log.info("Frequency: %s MHz", freq_mhz)
+        log.info("Power: %s dBm", power_dbm)
+        log.info("Range: %s km (simulated)", self.range_km)
+        log.info("Bandwidth: %s kHz", bandwidth_khz)
     
     def calculate_signal_strength(self, distance_km):
         """Calculate dBm based on distance (free space path loss)"""
         if distance_km == 0:
             return self.power
         
-        # Simplified FSPL formula
-        fspl = 32.45 + 20 * (distance_km) + 20 * (self.frequency / 1000)
-        received_power = self.power - fspl
+        received_power = self.power - path_loss_db(distance_km, self.frequency)
         return round(received_power, 1)
     
     def broadcast(self, payload, distance_km=0.5):
@@ -52,7 +64,8 @@ class VirtualLoRa:
             "coding_rate": "4/5"
         }
         
-        print(f"[LoRa] TX → {self.frequency} MHz | RSSI: {signal_dbm} dBm | Range: {distance_km} km")
+        TX_PACKETS.inc()
+        trace.info("TX → %s MHz | RSSI: %s dBm | Range: %s km", self.frequency, signal_dbm, distance_km)
         return packet
     
     def receive(self, packet):
@@ -64,11 +77,13 @@ class VirtualLoRa:
             return None
         
         rssi = packet.get('rssi_dbm', -100)
-        if rssi < -120:  # Below sensitivity
-            print(f"[LoRa] RX FAIL → Signal too weak: {rssi} dBm")
+        if rssi < SENSITIVITY_DBM:  # Below sensitivity
+            RX_WEAK.inc()
+            trace.info("RX FAIL → Signal too weak: %s dBm", rssi)
             return None
         
-        print(f"[LoRa] RX ← {packet['frequency_mhz']} MHz | RSSI: {rssi} dBm")
+        RX_PACKETS.inc()
+        trace.info("RX ← %s MHz | RSSI: %s dBm", packet['frequency_mhz'], rssi)
         return packet
 
 async def lora_beacon_loop():
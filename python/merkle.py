@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+# MirrorWitness PHASE2 2025-11-04
+
+import hashlib
+import struct
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Sequence, Union
+from gps_track import GpsTrack
+
+LEAF_PREFIX = b"\x00"  # RFC 6962 domain separation
+NODE_PREFIX = b"\x01"
+POINT = struct.Struct("<dddd")  # timestamp, lat, lon, alt
+CHUNK_BITS = 12  # MerkleRoot folds aligned runs of 4096 leaves level by level
+
+
+def point_bytes(point: Dict) -> bytes:
+    """Canonical leaf encoding of one GPS point"""
+    return POINT.pack(point.get('timestamp', 0.0), point.get('lat', 0.0),
+                      point.get('lon', 0.0), point.get('alt', 0))
+
+
+def leaf_hash(data: bytes) -> bytes:
+    return hashlib.sha256(LEAF_PREFIX + data).digest()
+
+
+def node_hash(left: bytes, right: bytes) -> bytes:
+    return hashlib.sha256(NODE_PREFIX + left + right).digest()
+
+
+def _split(size: int) -> int:
+    """Largest power of two strictly below `size` (RFC 6962 split point)"""
+    return 1 << ((size - 1).bit_length() - 1)
+
+
+def track_leaves(track: GpsTrack) -> Iterator[bytes]:
+    """Leaf hashes of a GpsTrack, generated lazily"""
+    pack = POINT.pack
+    sha256 = hashlib.sha256
+    for values in zip(track.timestamp, track.lat, track.lon, track.alt):
+        yield sha256(LEAF_PREFIX + pack(*values)).digest()
+
+
+def _subtree_root(digests: List[bytes]) -> bytes:
+    """Root of a power-of-two run of hashes, one level at a time"""
+    sha256 = hashlib.sha256
+    while len(digests) > 1:
+        digests = [sha256(NODE_PREFIX + left + right).digest()
+                   for left, right in zip(digests[0::2], digests[1::2])]
+    return digests[0]
+
+
+class MerkleRoot:
+    """
+    Streaming `GpsMerkleTree` root that keeps only the right edge
+
+    Holds one hash per complete subtree on the right edge of the tree
+    (the set bits of the size), so memory is O(log n) however many
+    points are added. Long runs of leaves are folded in aligned blocks
+    of 2**CHUNK_BITS. Use `GpsMerkleTree` when inclusion proofs are
+    needed; both give the same root.
+    """
+
+    def __init__(self, points: Union[Iterable[Dict], GpsTrack] = ()):
+        self.size = 0
+        self.peaks: List[List] = []  # [level, hash], largest subtree first
+        if isinstance(points, GpsTrack):
+            self.extend_leaves(track_leaves(points))
+        else:
+            self.extend(points)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def append(self, point: Dict):
+        self.append_leaf(leaf_hash(point_bytes(point)))
+
+    def extend(self, points: Iterable[Dict]):
+        self.extend_leaves(leaf_hash(point_bytes(point)) for point in points)
+
+    def append_leaf(self, digest: bytes):
+        self._push(digest, 0)
+
+    def _push(self, digest: bytes, level: int):
+        """Add a complete subtree of 2**level leaves; the size must be aligned to it"""
+        peaks = self.peaks
+        self.size += 1 << level
+        while peaks and peaks[-1][0] == level:
+            digest = node_hash(peaks.pop()[1], digest)
+            level += 1
+        peaks.append([level, digest])
+
+    def extend_leaves(self, digests: Iterable[bytes]):
+        digests = iter(digests)
+        block = 1 << CHUNK_BITS
+        # Leaf by leaf up to the next block boundary, then whole blocks
+        for digest in islice(digests, -self.size % block):
+            self.append_leaf(digest)
+        while True:
+            chunk = list(islice(digests, block))
+            if len(chunk) < block:
+                for digest in chunk:
+                    self.append_leaf(digest)
+                return
+            self._push(_subtree_root(chunk), CHUNK_BITS)
+
+    def root(self) -> bytes:
+        """Same head as `GpsMerkleTree.root`"""
+        if not self.peaks:
+            return hashlib.sha256(b"").digest()
+        acc = self.peaks[-1][1]
+        for _, digest in reversed(self.peaks[:-1]):
+            acc = node_hash(digest, acc)
+        return acc
+
+
+def merkle_root(points: Union[Iterable[Dict], GpsTrack]) -> bytes:
+    """Tree head of `points` without keeping the tree"""
+    return MerkleRoot(points).root()
+
+
+class GpsMerkleTree:
+    """
+    Append-only Merkle commitment over GPS points (RFC 6962 tree shape)
+
+    Every complete subtree is kept per level, so `append` is O(log n),
+    `root` folds at most log n peaks, and inclusion proofs for a single
+    point or a contiguous range need only O(log n) sibling hashes.
+    """
+
+    def __init__(self, points: Union[Iterable[Dict], GpsTrack] = ()):
+        self.levels: List[List[bytes]] = [[]]
+        if isinstance(points, GpsTrack):
+            self.extend_track(points)
+        else:
+            self.extend(points)
+
+    def __len__(self) -> int:
+        return len(self.levels[0])
+
+    def append(self, point: Dict):
+        self.append_leaf(leaf_hash(point_bytes(point)))
+
+    def extend(self, points: Iterable[Dict]):
+        self.extend_leaves([leaf_hash(point_bytes(point)) for point in points])
+
+    def extend_track(self, track: GpsTrack):
+        self.extend_leaves(list(track_leaves(track)))
+
+    def extend_leaves(self, digests: List[bytes]):
+        """Append many leaf hashes; builds whole levels at once on an empty tree"""
+        if len(self) or not digests:
+            for digest in digests:
+                self.append_leaf(digest)
+            return
+        sha256 = hashlib.sha256
+        self.levels = [list(digests)]
+        while len(self.levels[-1]) > 1:
+            below = self.levels[-1]
+            self.levels.append([
+                sha256(NODE_PREFIX + left + right).digest()
+                for left, right in zip(below[0::2], below[1::2])
+            ])
+
+    def append_leaf(self, digest: bytes):
+        levels = self.levels
+        levels[0].append(digest)
+        level = 0
+        while len(levels[level]) % 2 == 0:
+            parent = node_hash(levels[level][-2], levels[level][-1])
+            level += 1
+            if level == len(levels):
+                levels.append([])
+            levels[level].append(parent)
+
+    def root(self) -> bytes:
+        """Tree head; SHA-256 of the empty string for an empty tree"""
+        size = len(self)
+        if size == 0:
+            return hashlib.sha256(b"").digest()
+        acc = None
+        for level, nodes in enumerate(self.levels):
+            if (size >> level) & 1:
+                acc = nodes[-1] if acc is None else node_hash(nodes[-1], acc)
+        return acc
+
+    def _subtree(self, start: int, size: int) -> bytes:
+        if size & (size - 1) == 0:
+            level = size.bit_length() - 1
+            return self.levels[level][start >> level]
+        k = _split(size)
+        return node_hash(self._subtree(start, k), self._subtree(start + k, size - k))
+
+    def _collect(self, lo: int, hi: int, start: int, size: int, out: List[bytes]):
+        if hi <= start or lo >= start + size:
+            out.append(self._subtree(start, size))
+            return
+        if size == 1:
+            return  # leaf inside the range: the verifier has it
+        k = _split(size)
+        self._collect(lo, hi, start, k, out)
+        self._collect(lo, hi, start + k, size - k, out)
+
+    def prove_range(self, lo: int, hi: int) -> Dict:
+        """Inclusion proof for points [lo, hi) against the current root"""
+        size = len(self)
+        if not 0 <= lo < hi <= size:
+            raise IndexError(f"range [{lo}, {hi}) outside tree of {size}")
+        nodes: List[bytes] = []
+        self._collect(lo, hi, 0, size, nodes)
+        return {
+            "tree_size": size,
+            "start": lo,
+            "end": hi,
+            "nodes": [node.hex() for node in nodes],
+        }
+
+    def prove(self, index: int) -> Dict:
+        """Inclusion proof for a single point"""
+        return self.prove_range(index, index + 1)
+
+
+def verify_range(root: Union[bytes, str], proof: Dict, points: Sequence[Dict]) -> bool:
+    """Check that `points` are leaves [start, end) of the tree with head `root`"""
+    lo, hi, size = proof["start"], proof["end"], proof["tree_size"]
+    if len(points) != hi - lo or not 0 <= lo < hi <= size:
+        return False
+    leaves = iter([leaf_hash(point_bytes(p)) for p in points])
+    nodes = iter(bytes.fromhex(node) for node in proof["nodes"])
+
+    def rebuild(start: int, size: int) -> bytes:
+        if hi <= start or lo >= start + size:
+            return next(nodes)
+        if size == 1:
+            return next(leaves)
+        k = _split(size)
+        left = rebuild(start, k)
+        return node_hash(left, rebuild(start + k, size - k))
+
+    try:
+        computed = rebuild(0, size)
+        if next(nodes, None) is not None:
+            return False  # unused proof nodes
+    except StopIteration:
+        return False
+    expected = bytes.fromhex(root) if isinstance(root, str) else root
+    return computed == expected
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+# MirrorWitness PHASE2 2025-11-04
+
+import asyncio
+import os
+from bisect import bisect_left
+from typing import Callable, Dict, Optional, Tuple
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "info").lower()  # debug, info, warning, error, off
+LOG_SAMPLE = max(1, int(os.getenv("LOG_SAMPLE", "1")))  # print 1 in N per-message lines
+LEVELS = {"debug": 10, "info": 20, "warning": 30, "error": 40, "off": 100}
+# seconds; 50us .. 10s covers HMAC checks up to Sui transactions
+LATENCY_BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+                   0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Counter:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, n=1):
+        self.value += n
+
+
+class Gauge:
+    """Set directly, or computed by `fn` at scrape time"""
+
+    __slots__ = ("value", "fn")
+
+    def __init__(self, fn: Optional[Callable[[], float]] = None):
+        self.value = 0
+        self.fn = fn
+
+    def set(self, value):
+        self.value = value
+
+    def get(self):
+        return self.fn() if self.fn is not None else self.value
+
+
+class Histogram:
+    """Fixed-bucket histogram; `observe` is one bisect and two adds"""
+
+    __slots__ = ("bounds", "counts", "sum")
+
+    def __init__(self, bounds=LATENCY_BUCKETS):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)  # last slot: +Inf
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+    @property
+    def count(self):
+        return sum(self.counts)
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-quantile"""
+        target = q * self.count
+        seen = 0
+        for bound, n in zip(self.bounds + (float("inf"),), self.counts):
+            seen += n
+            if seen >= target and n:
+                return bound
+        return 0.0
+
+
+class Registry:
+    """
+    Process-wide metric set rendered in the Prometheus text format
+
+    Metrics are created once (usually at import time) and the hot path
+    keeps a reference, so recording an event never touches the registry.
+    Same name with different labels gives separate series of one family.
+    """
+
+    def __init__(self):
+        self.families: Dict[str, Tuple[str, str]] = {}  # name -> (type, help)
+        self.series: Dict[Tuple[str, Tuple], object] = {}
+
+    def _get(self, kind, name, help, labels, factory):
+        family = self.families.setdefault(name, (kind, help))
+        if family[0] != kind:
+            raise ValueError(f"metric {name} already registered as a {family[0]}")
+        key = (name, tuple(sorted(labels.items())))
+        metric = self.series.get(key)
+        if metric is None:
+            metric = self.series[key] = factory()
+        return metric
+
+    def counter(self, name: str, help: str = "", **labels) -> Counter:
+        return self._get("counter", name, help, labels, Counter)
+
+    def gauge(self, name: str, help: str = "", fn: Optional[Callable[[], float]] = None, **labels) -> Gauge:
+        gauge = self._get("gauge", name, help, labels, Gauge)
+        if fn is not None:
+            gauge.fn = fn
+        return gauge
+
+    def histogram(self, name: str, help: str = "", buckets=LATENCY_BUCKETS, **labels) -> Histogram:
+        return self._get("histogram", name, help, labels, lambda: Histogram(buckets))
+
+    def render(self) -> str:
+        lines = []
+        by_family: Dict[str, list] = {}
+        for (name, labels), metric in self.series.items():
+            by_family.setdefault(name, []).append((labels, metric))
+        for name, series in by_family.items():
+            kind, help = self.families[name]
+            if help:
+                lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, metric in series:
+                if kind == "histogram":
+                    cumulative = 0
+                    for bound, n in zip(metric.bounds, metric.counts):
+                        cumulative += n
+                        lines.append(f"{name}_bucket{_labels(labels, le=repr(bound))} {cumulative}")
+                    cumulative += metric.counts[-1]
+                    lines.append(f"{name}_bucket{_labels(labels, le='+Inf')} {cumulative}")
+                    lines.append(f"{name}_sum{_labels(labels)} {metric.sum!r}")
+                    lines.append(f"{name}_count{_labels(labels)} {cumulative}")
+                else:
+                    value = metric.get() if kind == "gauge" else metric.value
+                    lines.append(f"{name}{_labels(labels)} {value}")
+        return "\n".join(lines) + "\n"
+
+
+def _labels(labels: Tuple, **extra) -> str:
+    pairs = list(labels) + list(extra.items())
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in pairs) + "}"
+
+
+REGISTRY = Registry()
+counter = REGISTRY.counter
+gauge = REGISTRY.gauge
+histogram = REGISTRY.histogram
+
+
+class Logger:
+    """
+    Tagged, level-filtered replacement for print()
+
+    Messages take %-style args that are only formatted when the line is
+    actually printed. A `sampled()` logger prints the first of every
+    `LOG_SAMPLE` calls with the same message format, for lines that would
+    otherwise fire per message.
+    """
+
+    __slots__ = ("tag", "level", "every", "seen")
+
+    def __init__(self, tag: str, level: str = LOG_LEVEL, every: int = 1):
+        self.tag = tag
+        self.level = LEVELS.get(level, LEVELS["info"]) if isinstance(level, str) else level
+        self.every = every
+        self.seen: Dict[str, int] = {}  # message format -> calls
+
+    def sampled(self, every: int = LOG_SAMPLE) -> "Logger":
+        return Logger(self.tag, self.level, every)
+
+    def _emit(self, message, args):
+        if self.every > 1:
+            seen = self.seen.get(message, 0)
+            self.seen[message] = seen + 1
+            if seen % self.every:
+                return
+        print(f"{self.tag} {message % args if args else message}")
+
+    def debug(self, message, *args):
+        if self.level <= 10:
+            self._emit(message, args)
+
+    def info(self, message, *args):
+        if self.level <= 20:
+            self._emit(message, args)
+
+    def warning(self, message, *args):
+        if self.level <= 30:
+            self._emit(message, args)
+
+    def error(self, message, *args):
+        if self.level <= 40:
+            self._emit(message, args)
+
+
+log = Logger("[METRICS]")
+
+
+async def serve_metrics(port: int, host: str = "0.0.0.0", registry: Registry = REGISTRY):
+    """Serve `GET /metrics` in Prometheus text format; returns the asyncio server"""
+
+    async def handle(reader, writer):
+        try:
+            request = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), 5.0)
+            parts = request.split(b" ", 2)
+            if parts[0] == b"GET" and len(parts) > 1 and parts[1].split(b"?")[0] in (b"/metrics", b"/"):
+                status, body = "200 OK", registry.render().encode()
+            else:
+                status, body = "404 Not Found", b"not found\n"
+            writer.write(
+                f"HTTP/1.1 {status}\r\nContent-Type: text/plain; version=0.0.4; charset=utf-8\r\n"
+                f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body
+            )
+            await writer.drain()
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, host, port)
+    log.info("Prometheus endpoint on http://%s:%s/metrics", host, port)
+    return server
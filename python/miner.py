@@ -6,106 +6,135 @@ import json
 import time
 import hashlib
 import hmac
-import random
 import os
-import subprocess
 from datetime import datetime, timedelta
 import websockets
 import aiohttp
+from witness_pool import WitnessPool
+from quorum import PendingTask, QuorumCollector, REQUIRED_WITNESSES
+from timing_wheel import TimingWheel
+from task_batcher import TaskBatcher
+from sybil import WitnessRegistry
+from pipeline import Pipeline, Stage
+from gps_sources import GpsSource, SimulatorSource, make_source
+from sessions import DroneSession
+from walrus_client import WalrusBatcher, WalrusClient
+from sui_submitter import SuiSubmitter
+import metrics
+from metrics import Logger, serve_metrics
+from nacl.signing import SigningKey
+import wire
 
 # Configuration
 WS_PORT = 8765
 HMAC_SECRET = os.getenv("HMAC_SECRET", "proof-of-task-secret-2025")
 SEAL_DURATION = 300  # 5 minutes
 WALRUS_API = os.getenv("WALRUS_API", "http://localhost:9000")
+WALRUS_UPLOAD = os.getenv("WALRUS_UPLOAD", "false").lower() == "true"  # false: local hash only
+WALRUS_CONCURRENCY = int(os.getenv("WALRUS_CONCURRENCY", "8"))
+WALRUS_BATCH_SIZE = int(os.getenv("WALRUS_BATCH_SIZE", "1"))  # >1 packs payloads into one blob
+WALRUS_BATCH_DELAY_MS = float(os.getenv("WALRUS_BATCH_DELAY_MS", "50"))
 SUI_RPC = os.getenv("SUI_RPC", "http://localhost:9000")
+SUI_PACKAGE_ID = os.getenv("SUI_PACKAGE_ID", "")  # unset: log transactions instead of sending
+SUI_PRIVATE_KEY = os.getenv("SUI_PRIVATE_KEY", "")  # hex Ed25519 seed of the miner's Sui account
+SUI_TREASURY_ID = os.getenv("SUI_TREASURY_ID", "")
+SUI_GAS_COINS = [coin for coin in os.getenv("SUI_GAS_COINS", "").split(",") if coin]  # default: all owned
+SUI_BATCH_SIZE = int(os.getenv("SUI_BATCH_SIZE", "50"))  # Move calls per transaction
+SUI_BATCH_DELAY_MS = float(os.getenv("SUI_BATCH_DELAY_MS", "500"))
 LIVE_GPS = os.getenv("LIVE_GPS", "true").lower() == "true"
+GPS_SOURCE = os.getenv("GPS_SOURCE", "termux" if LIVE_GPS else "simulator").lower()  # termux, simulator, replay
+GPS_REPLAY_FILE = os.getenv("GPS_REPLAY_FILE", "")
+GPS_REPLAY_SPEED = float(os.getenv("GPS_REPLAY_SPEED", "1.0"))
+WITNESS_URLS = [
+    url.strip()
+    for url in os.getenv(
+        "WITNESS_URLS", "ws://localhost:8766,ws://localhost:8767,ws://localhost:8768"
+    ).split(",")
+    if url.strip()
+]
+WITNESS_SEND_TIMEOUT = float(os.getenv("WITNESS_SEND_TIMEOUT", "2.0"))  # seconds
+QUORUM_SIZE = int(os.getenv("QUORUM_SIZE", str(REQUIRED_WITNESSES)))
+REBROADCAST_INTERVAL = float(os.getenv("REBROADCAST_INTERVAL", "5.0"))  # seconds without quorum, 0 = off
+REBROADCAST_MAX = int(os.getenv("REBROADCAST_MAX", "3"))  # retries per task
+TIMER_TICK_MS = float(os.getenv("TIMER_TICK_MS", "100"))  # timing wheel resolution
+TASK_BATCH_SIZE = int(os.getenv("TASK_BATCH_SIZE", "1"))  # >1 enables new_task_batch
+TASK_BATCH_DELAY_MS = float(os.getenv("TASK_BATCH_DELAY_MS", "20"))
+WIRE_FORMAT = os.getenv("WIRE_FORMAT", "binary").lower()  # binary (negotiated) or json
+GPS_INTERVAL = float(os.getenv("GPS_INTERVAL", "1.0"))  # seconds between GPS samples
+UPLOAD_CONCURRENCY = int(os.getenv("UPLOAD_CONCURRENCY", "4"))
+COMMIT_CONCURRENCY = int(os.getenv("COMMIT_CONCURRENCY", "4"))
+BROADCAST_CONCURRENCY = int(os.getenv("BROADCAST_CONCURRENCY", "4"))
+PIPELINE_QUEUE_SIZE = int(os.getenv("PIPELINE_QUEUE_SIZE", "64"))  # per stage
+PIPELINE_REPORT_INTERVAL = float(os.getenv("PIPELINE_REPORT_INTERVAL", "10"))  # seconds, 0 = off
+DRONE_SESSIONS = int(os.getenv("DRONE_SESSIONS", "1"))  # extra sessions beyond the first are simulated
+SESSION_RATE = float(os.getenv("SESSION_RATE", "2.0"))  # tasks/s allowed per drone session
+SESSION_BURST = float(os.getenv("SESSION_BURST", "5"))
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))  # Prometheus /metrics endpoint, 0 = off
+WITNESS_REGISTRY = os.getenv("WITNESS_REGISTRY", "")  # JSON of witness positions for the Sybil check
+WIRE_FORMATS = (
+    [wire.FORMAT_BINARY, wire.FORMAT_JSON_MAC] if WIRE_FORMAT == "binary" else [wire.FORMAT_JSON_MAC]
+)
 
-class RealGPS:
-    """Real GPS from Android Termux API"""
-    def __init__(self):
-        self.check_termux_api()
-        
-    def check_termux_api(self):
-        """Check if Termux API is available"""
-        try:
-            subprocess.run(['termux-location', '-h'], capture_output=True, timeout=2)
-            print("[GPS] ✓ Termux API available")
-        except:
-            print("[GPS] ⚠ Termux API not available, will use mock GPS")
-            
-    def get_location(self):
-        """Get real GPS from Termux"""
-        try:
-            result = subprocess.run(
-                ['termux-location', '-p', 'gps', '-r', 'once'],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            
-            if result.returncode == 0:
-                data = json.loads(result.stdout)
-                return {
-                    "timestamp": time.time(),
-                    "lat": round(data.get('latitude', 0), 6),
-                    "lon": round(data.get('longitude', 0), 6),
-                    "alt": round(data.get('altitude', 100), 2),
-                    "accuracy": round(data.get('accuracy', 0), 2),
-                    "type": "gps_data",
-                    "source": "LIVE GPS 📍"
-                }
-            else:
-                raise Exception("termux-location failed")
-                
-        except Exception as e:
-            print(f"[GPS] Failed to get real GPS: {e}, using fallback")
-            return self.mock_gps()
-    
-    def mock_gps(self):
-        """Fallback mock GPS"""
-        return {
-            "timestamp": time.time(),
-            "lat": round(37.7749 + random.uniform(-0.001, 0.001), 6),
-            "lon": round(-122.4194 + random.uniform(-0.001, 0.001), 6),
-            "alt": round(100 + random.uniform(-2, 2), 2),
-            "accuracy": 10.0,
-            "type": "gps_data",
-            "source": "MOCK GPS 🎭"
-        }
-
-class DroneSimulator:
-    def __init__(self):
-        self.lat = 37.7749  # San Francisco
-        self.lon = -122.4194
-        self.alt = 100.0
-        self.speed = 0.0001  # degrees per second
-        
-    def update(self):
-        """Simulate drone movement"""
-        angle = random.uniform(0, 2 * 3.14159)
-        self.lat += self.speed * random.uniform(0.5, 1.5) * (1 if random.random() > 0.5 else -1)
-        self.lon += self.speed * random.uniform(0.5, 1.5) * (1 if random.random() > 0.5 else -1)
-        self.alt += random.uniform(-1, 1)
-        
-        return {
-            "timestamp": time.time(),
-            "lat": round(self.lat, 6),
-            "lon": round(self.lon, 6),
-            "alt": round(self.alt, 2),
-            "type": "gps_data",
-            "source": "SIMULATED 🎮"
-        }
+log = Logger("[MINER]")
+trace = log.sampled()  # per-task lines
+pipeline_log = Logger("[PIPELINE]")
+UPLOAD_SECONDS = metrics.histogram("pot_upload_seconds", "Payload encoding, hashing and Walrus upload")
+BROADCAST_SECONDS = metrics.histogram("pot_broadcast_seconds", "Fan-out of one task frame to the witness pool")
+FRAMES_DELIVERED = metrics.counter("pot_broadcast_frames_total", "Task frames sent to witnesses", result="delivered")
+FRAMES_FAILED = metrics.counter("pot_broadcast_frames_total", "Task frames sent to witnesses", result="failed")
 
 class TaskMiner:
     def __init__(self):
-        if LIVE_GPS:
-            self.gps = RealGPS()
-            print("[MINER] 📍 LIVE GPS MODE ACTIVE")
-        else:
-            self.drone = DroneSimulator()
-            print("[MINER] 🎮 SIMULATION MODE")
-        self.current_task_id = None
+        self.sessions = {}  # session id -> DroneSession
+        self.running = False
+        self.background = set()  # strong refs to fire-and-forget tasks
+        self.collector = QuorumCollector(
+            required=QUORUM_SIZE,
+            wheel=TimingWheel(tick=TIMER_TICK_MS / 1000),
+            on_retry=self.rebroadcast,
+            retry_interval=REBROADCAST_INTERVAL,
+            max_retries=REBROADCAST_MAX,
+        )
+        self.pool = WitnessPool(
+            WITNESS_URLS,
+            on_message=self.collector.on_message,
+            send_timeout=WITNESS_SEND_TIMEOUT,
+            formats=WIRE_FORMATS,
+            hello=wire.seal_text(
+                HMAC_SECRET.encode(), json.dumps({"type": "hello", "formats": WIRE_FORMATS})
+            ),
+        )
+        self.batcher = None
+        if TASK_BATCH_SIZE > 1:
+            self.batcher = TaskBatcher(
+                self.broadcast_batch_to_witnesses,
+                max_size=TASK_BATCH_SIZE,
+                max_delay=TASK_BATCH_DELAY_MS / 1000,
+            )
+        # Session tickers -> upload -> commit -> broadcast, bounded queues between stages
+        self.pipeline = Pipeline([
+            Stage("upload", self.upload_stage, UPLOAD_CONCURRENCY, PIPELINE_QUEUE_SIZE),
+            Stage("commit", self.commit_stage, COMMIT_CONCURRENCY, PIPELINE_QUEUE_SIZE),
+            Stage("broadcast", self.broadcast_stage, BROADCAST_CONCURRENCY, PIPELINE_QUEUE_SIZE),
+        ])
+        self.walrus = WalrusClient(WALRUS_API, concurrency=WALRUS_CONCURRENCY) if WALRUS_UPLOAD else None
+        self.walrus_batcher = None
+        if self.walrus and WALRUS_BATCH_SIZE > 1:
+            self.walrus_batcher = WalrusBatcher(
+                self.walrus, max_size=WALRUS_BATCH_SIZE, max_delay=WALRUS_BATCH_DELAY_MS / 1000
+            )
+        self.sui = SuiSubmitter(
+            SUI_RPC,
+            package_id=SUI_PACKAGE_ID,
+            signing_key=SigningKey(bytes.fromhex(SUI_PRIVATE_KEY)) if SUI_PRIVATE_KEY else None,
+            treasury=SUI_TREASURY_ID,
+            gas_coins=SUI_GAS_COINS,
+            batch_size=SUI_BATCH_SIZE,
+            batch_delay=SUI_BATCH_DELAY_MS / 1000,
+        )
+        self.registry = WitnessRegistry.from_json(WITNESS_REGISTRY) if WITNESS_REGISTRY else None
+        metrics.gauge("pot_tasks_in_flight", "Broadcast tasks waiting for quorum", fn=lambda: len(self.collector.pending))
+        metrics.gauge("pot_witnesses_connected", "Healthy witness connections", fn=self.pool.healthy_count)
         self.lora_enabled = os.getenv("ENABLE_LORA", "false").lower() == "true"
         
     def create_hmac(self, data):
@@ -113,80 +142,240 @@ class TaskMiner:
         message = json.dumps(data).encode()
         return hmac.new(HMAC_SECRET.encode(), message, hashlib.sha256).hexdigest()
     
+    def encode_payload(self, data):
+        """Sealed payload bytes: binary GPS record unless a legacy witness is connected"""
+        formats = self.pool.formats_in_use()
+        if WIRE_FORMAT == "binary" and formats and wire.FORMAT_JSON not in formats:
+            return wire.pack_gps(data)
+        return json.dumps(data).encode()
+    
     async def upload_to_walrus(self, data):
-        """Upload sealed data to Walrus (simulated)"""
-        # In production, this would interact with actual Walrus
-        # For MVP, we simulate with a hash-based CID
-        payload = json.dumps(data).encode()
+        """Upload sealed data to Walrus; returns (cid, payload, blob reference or None)"""
+        # The task cid stays the payload hash witnesses sign against
+        payload = self.encode_payload(data)
         cid = hashlib.sha256(payload).hexdigest()[:32]
-        return cid, payload
+        if self.walrus is None:
+            return cid, payload, None  # simulated: hash-based CID only
+        if self.walrus_batcher:
+            blob = await self.walrus_batcher.add(payload)
+        else:
+            blob = {"blob_id": await self.walrus.upload(payload)}
+        return cid, payload, blob
+    
+    @staticmethod
+    def blob_reference(cid, blob):
+        """What goes on-chain for a payload: its Walrus blob id (`blob_id#index` inside a batch blob)"""
+        if blob is None:
+            return cid  # Walrus off: the hash-only CID is all there is
+        if "index" in blob:
+            return f"{blob['blob_id']}#{blob['index']}"
+        return blob["blob_id"]
+
+    async def submit_sui_transaction(self, cid, payload, blob=None):
+        """Stake a Task object for the payload witnesses sign; resolves with its object id"""
+        staked = await self.sui.stake_task(payload, cid, self.blob_reference(cid, blob))
+        return staked["task_object"]
+    
+    async def submit_witness_tasks(self, result, task_object):
+        """Queue one witness_task call per signature on the task's object; returns the per-call results"""
+        signatures = result["signatures"]
+        if self.registry is not None:
+            # Signers closer than MIN_WITNESS_DISTANCE_M would be slashed on-chain
+            check = self.registry.check_signers(str(sig["witness_id"]) for sig in signatures)
+            flagged = set(check["unknown"])  # no registered position: cannot be checked
+            for witness_id in check["unknown"]:
+                log.warning("Sybil check: witness %s is not in the registry, skipping its signature", witness_id)
+            for pair in check["pairs"]:
+                log.warning("Sybil check: witnesses %s and %s are %sm apart", pair['a'], pair['b'], pair['distance_m'])
+                flagged.update((pair["a"], pair["b"]))
+            signatures = [sig for sig in signatures if str(sig["witness_id"]) not in flagged]
+        return await asyncio.gather(*(
+            self.sui.witness_task(task_object, result["cid"], sig["pubkey"], sig["signature"], sig["witness_id"])
+            for sig in signatures
+        ), return_exceptions=True)
     
-    async def submit_sui_transaction(self, cid):
-        """Submit commit_blob_cid transaction to Sui"""
-        # In production, this would use sui-sdk
-        # For MVP, we simulate the transaction
-        print(f"[MINER] Submitting Sui TX: commit_blob_cid(cid={cid[:16]}...)")
-        return True
+    async def await_quorum(self, session, cid, quorum, committed):
+        """Wait for N-of-M witness signatures, then hand them to the chain"""
+        result = await quorum
+        if result["complete"]:
+            session.completed += 1
+            trace.info("Quorum %d/%d for %s... in %sms", len(result['signatures']), QUORUM_SIZE, cid[:16], result['latency_ms'])
+            try:
+                task_object = await committed  # witness_task only once the Task object exists
+            except Exception as e:
+                log.warning("Skipping witness_task for %s...: stake failed (%s)", cid[:16], e)
+                return result
+            await self.submit_witness_tasks(result, task_object)
+        else:
+            session.expired += 1
+            log.info("Task %s... expired with %d/%d signatures", cid[:16], len(result['signatures']), QUORUM_SIZE)
+        return result
     
-    async def broadcast_to_witnesses(self, payload, cid):
+    def add_text_frames(self, frames, formats, message):
+        """Encode `message` for every JSON-based format in use"""
+        if wire.FORMAT_JSON_MAC in formats:
+            # MAC over the exact frame bytes, checked by witnesses before parsing
+            frames[wire.FORMAT_JSON_MAC] = wire.seal_text(HMAC_SECRET.encode(), json.dumps(message))
+        if wire.FORMAT_JSON in formats:
+            # Legacy witnesses: hmac field inside the object
+            legacy = dict(message)
+            legacy["hmac"] = self.create_hmac(legacy)
+            frames[wire.FORMAT_JSON] = json.dumps(legacy)
+        return frames
+    
+    async def broadcast_to_witnesses(self, payload, cid, exclude=None):
         """Broadcast task to witnesses via WebSocket"""
-        message = {
+        timestamp = time.time()
+        frames = {}
+        formats = self.pool.formats_in_use()
+        if wire.FORMAT_BINARY in formats:
+            frames[wire.FORMAT_BINARY] = wire.encode_task(HMAC_SECRET.encode(), payload, cid, timestamp)
+        self.add_text_frames(frames, formats, {
             "type": "new_task",
             "payload": payload.hex(),
             "cid": cid,
-            "timestamp": time.time()
-        }
-        message["hmac"] = self.create_hmac(message)
+            "timestamp": timestamp
+        })
         
-        # Broadcast to all connected witnesses
-        connections = []
-        for port in [8766, 8767, 8768]:  # 3 witness ports
-            try:
-                async with websockets.connect(f"ws://localhost:{port}") as ws:
-                    await ws.send(json.dumps(message))
-                    print(f"[MINER] Broadcasted to witness on port {port}")
-            except Exception as e:
-                print(f"[MINER] Failed to connect to witness {port}: {e}")
+        # Fan out to all pooled witnesses concurrently
+        started = time.perf_counter()
+        results = await self.pool.broadcast(frames, exclude)
+        self.record_broadcast(started, results)
+        trace.info("Broadcasted to %d/%d witnesses in %.1fms", sum(results.values()), len(results),
+                   (time.perf_counter() - started) * 1000)
+        return results
+    
+    @staticmethod
+    def record_broadcast(started, results):
+        BROADCAST_SECONDS.observe(time.perf_counter() - started)
+        delivered = sum(results.values())
+        FRAMES_DELIVERED.inc(delivered)
+        FRAMES_FAILED.inc(len(results) - delivered)
+    
+    def rebroadcast(self, task: PendingTask):
+        """Timing-wheel retry: resend a task short of quorum to the silent witnesses"""
+        trace.info("Retry %d/%d for %s... (%d/%d signatures)", task.retries, REBROADCAST_MAX,
+                   task.cid[:16], len(task.signatures), QUORUM_SIZE)
+        resend = asyncio.create_task(self.broadcast_to_witnesses(task.payload, task.cid, exclude=task.sources))
+        self.background.add(resend)
+        resend.add_done_callback(self.background.discard)
+    
+    async def broadcast_batch_to_witnesses(self, tasks):
+        """Broadcast many (payload, cid) tasks under a single HMAC"""
+        timestamp = time.time()
+        frames = {}
+        formats = self.pool.formats_in_use()
+        if wire.FORMAT_BINARY in formats:
+            frames[wire.FORMAT_BINARY] = wire.encode_task_batch(HMAC_SECRET.encode(), tasks, timestamp)
+        self.add_text_frames(frames, formats, {
+            "type": "new_task_batch",
+            "tasks": [{"payload": payload.hex(), "cid": cid} for payload, cid in tasks],
+            "timestamp": timestamp
+        })
+        
+        started = time.perf_counter()
+        results = await self.pool.broadcast(frames)
+        self.record_broadcast(started, results)
+        trace.info("Broadcasted batch of %d to %d/%d witnesses in %.1fms", len(tasks), sum(results.values()),
+                   len(results), (time.perf_counter() - started) * 1000)
+        return results
+    
+    def register_session(self, session_id, source: GpsSource, interval=GPS_INTERVAL,
+                         rate=SESSION_RATE, burst=SESSION_BURST):
+        """Add a drone; starts sampling right away if the miner is running"""
+        if session_id in self.sessions:
+            raise ValueError(f"session {session_id} already registered")
+        session = DroneSession(session_id, source, interval, rate, burst, SEAL_DURATION)
+        self.sessions[session_id] = session
+        if self.running:
+            self.start_session(session)
+        log.info("Session %s registered: %s, %s tasks/s", session_id, source.name, rate)
+        return session
+    
+    def start_session(self, session):
+        session.task = asyncio.create_task(session.run(self.submit_sealed))
+    
+    async def unregister_session(self, session_id):
+        """Stop a drone's sampling; tasks already in the pipeline still finish"""
+        session = self.sessions.pop(session_id)
+        if session.task is not None:
+            session.task.cancel()
+            await asyncio.gather(session.task, return_exceptions=True)
+        await session.source.close()
+        log.info("Session %s closed: %s", session_id, session.stats())
+    
+    async def submit_sealed(self, session, sealed_data):
+        await self.pipeline.put((session, sealed_data))
+    
+    async def upload_stage(self, task):
+        session, sealed_data = task
+        started = time.perf_counter()
+        cid, payload, blob = await self.upload_to_walrus(sealed_data)
+        UPLOAD_SECONDS.observe(time.perf_counter() - started)
+        session.current_task_id = cid
+        trace.info("Uploaded to Walrus: CID=%s...%s", cid[:16], f" blob={blob['blob_id'][:16]}..." if blob else "")
+        return session, sealed_data, cid, payload, blob
+    
+    async def commit_stage(self, task):
+        # Stake the task without waiting for its transaction to execute;
+        # the quorum waiter holds witness_task back until it has
+        _, _, cid, payload, blob = task
+        committed = asyncio.ensure_future(self.submit_sui_transaction(cid, payload, blob))
+        committed.add_done_callback(lambda f: f.cancelled() or f.exception())  # reported by await_quorum
+        return (*task, committed)
+    
+    async def broadcast_stage(self, task):
+        session, sealed_data, cid, payload, _, committed = task
+        # Collect signatures until quorum or seal expiry
+        quorum = self.collector.track(cid, payload, sealed_data["sealed_until"])
+        waiter = asyncio.create_task(self.await_quorum(session, cid, quorum, committed))
+        self.background.add(waiter)
+        waiter.add_done_callback(self.background.discard)
+        
+        # Broadcast to witnesses (optionally through the batching window)
+        if self.batcher:
+            await self.batcher.add((payload, cid))
+        else:
+            await self.broadcast_to_witnesses(payload, cid)
+    
+    async def report_pipeline(self):
+        """Periodic queue depth per stage: the fullest queue is the bottleneck"""
+        while True:
+            await asyncio.sleep(PIPELINE_REPORT_INTERVAL)
+            stats = [session.stats() for session in self.sessions.values()]
+            missed = sum(s["missed"] for s in stats)
+            throttled = sum(s["throttled"] for s in stats)
+            quorum = self.collector.stats()
+            pipeline_log.info("%s | sessions=%d gps missed=%d throttled=%d | in flight=%d expired=%d retried=%d",
+                              self.pipeline.report(), len(stats), missed, throttled,
+                              quorum['pending'], quorum['expired'], quorum['retried'])
     
     async def mine_loop(self):
-        """Main mining loop"""
-        mode = "📍 LIVE GPS" if LIVE_GPS else "🎮 SIMULATION"
+        """Main mining loop: every drone session feeds the shared stage pipeline"""
+        if not self.sessions:
+            self.register_session("drone-0", make_source(GPS_SOURCE, GPS_REPLAY_FILE, GPS_REPLAY_SPEED))
+            for n in range(1, DRONE_SESSIONS):
+                self.register_session(f"drone-{n}", SimulatorSource())
+        modes = sorted({session.source.name for session in self.sessions.values()})
         lora_status = "✓ LoRa beacon active — 4.8 km range simulated" if self.lora_enabled else ""
-        print(f"[MINER] Starting Proof-of-Task miner... {mode} {lora_status}")
+        log.info("Starting Proof-of-Task miner... %s x%d %s", ', '.join(modes), len(self.sessions), lora_status)
         
-        while True:
-            try:
-                # Generate GPS data
-                if LIVE_GPS:
-                    gps_data = self.gps.get_location()
-                else:
-                    gps_data = self.drone.update()
-                    
-                print(f"[MINER] {gps_data.get('source', 'GPS')}: lat={gps_data['lat']}, lon={gps_data['lon']}, alt={gps_data['alt']}m")
-                
-                # Seal data with 5-minute validity
-                sealed_data = {
-                    **gps_data,
-                    "sealed_until": time.time() + SEAL_DURATION,
-                    "nonce": random.randint(1000000, 9999999)
-                }
-                
-                # Upload to Walrus
-                cid, payload = await self.upload_to_walrus(sealed_data)
-                print(f"[MINER] Uploaded to Walrus: CID={cid[:16]}...")
-                
-                # Submit Sui transaction
-                await self.submit_sui_transaction(cid)
-                
-                # Broadcast to witnesses
-                await self.broadcast_to_witnesses(payload, cid)
-                
-                # Wait 1 second before next GPS update
-                await asyncio.sleep(1)
-                
-            except Exception as e:
-                print(f"[MINER] Error in mining loop: {e}")
-                await asyncio.sleep(1)
+        if METRICS_PORT:
+            await serve_metrics(METRICS_PORT)
+        await self.pool.start()
+        await self.pool.wait_ready()
+        await self.sui.start()
+        self.pipeline.start()
+        if PIPELINE_REPORT_INTERVAL > 0:
+            reporter = asyncio.create_task(self.report_pipeline())
+            self.background.add(reporter)
+            reporter.add_done_callback(self.background.discard)
+        
+        self.running = True
+        for session in self.sessions.values():
+            self.start_session(session)
+        # Sessions run until cancelled; more can be registered meanwhile
+        await asyncio.Event().wait()
 
 if __name__ == "__main__":
     miner = TaskMiner()
@@ -3,7 +3,21 @@
 
 import hashlib
 import json
-from typing import List, Dict
+from typing import List, Dict, Optional, Union
+from gps_track import GpsTrack, TrackHasher, np
+from merkle import GpsMerkleTree, MerkleRoot, merkle_root, verify_range
+
+def private_inputs_hash(gps_points: Union[List[Dict], GpsTrack]) -> str:
+    """Hash private GPS data (actual coordinates hidden in ZK)"""
+    # Both containers commit to the packed column bytes, so the same
+    # points give the same hash either way
+    if isinstance(gps_points, GpsTrack):
+        return gps_points.digest().hex()[:16]
+    hasher = TrackHasher()
+    for point in gps_points:
+        hasher.update(point)
+    return hasher.digest().hex()[:16]
+
 
 class NautilusProofAltitude:
     """
@@ -21,25 +35,41 @@ class NautilusProofAltitude:
     def __init__(self):
         self.proof_circuit = "altitude_check_v1"
         
-    def generate_proof(self, gps_points: List[Dict]) -> Dict:
+    def generate_proof(self, gps_points: Union[List[Dict], GpsTrack],
+                       root: Optional[str] = None) -> Dict:
         """
         Generate ZK proof that all GPS points are below max altitude
         
         Args:
             gps_points: List of {"lat": float, "lon": float, "alt": float, "timestamp": float}
+                        or a columnar GpsTrack
+            root: Merkle root (hex) already computed for these points, e.g.
+                  by `ConstraintEngine`; computed in O(log n) memory if omitted
             
         Returns:
             Proof dict with verification status
         """
-        if not gps_points:
+        if not len(gps_points):
             return {"valid": False, "error": "No GPS data"}
         
-        # Extract altitudes
-        altitudes = [p.get('alt', 0) for p in gps_points]
-        max_alt = max(altitudes)
-        min_alt = min(altitudes)
-        avg_alt = sum(altitudes) / len(altitudes)
+        # Altitude statistics
+        if isinstance(gps_points, GpsTrack):
+            max_alt, min_alt, avg_alt = self._track_altitude_stats(gps_points)
+        else:
+            altitudes = [p.get('alt', 0) for p in gps_points]
+            max_alt = max(altitudes)
+            min_alt = min(altitudes)
+            avg_alt = sum(altitudes) / len(altitudes)
         
+        return self._build_proof(
+            max_alt, min_alt, avg_alt, len(gps_points),
+            private_inputs_hash(gps_points),
+            root or merkle_root(gps_points).hex()
+        )
+    
+    def _build_proof(self, max_alt: float, min_alt: float, avg_alt: float,
+                     num_points: int, private_inputs_hash: str, merkle_root: str) -> Dict:
+        """Assemble the proof dict from altitude statistics and track commitments"""
         # Check constraint
         constraint_satisfied = max_alt <= self.MAX_ALTITUDE
         
@@ -48,9 +78,10 @@ class NautilusProofAltitude:
             "circuit": self.proof_circuit,
             "public_inputs": {
                 "max_altitude_limit": self.MAX_ALTITUDE,
-                "num_points": len(gps_points)
+                "num_points": num_points
             },
-            "private_inputs_hash": self._hash_private_inputs(gps_points),
+            "private_inputs_hash": private_inputs_hash,
+            "merkle_root": merkle_root,
             "constraint_satisfied": constraint_satisfied
         }
         
@@ -62,16 +93,19 @@ class NautilusProofAltitude:
             "max_altitude": round(max_alt, 2),
             "min_altitude": round(min_alt, 2),
             "avg_altitude": round(avg_alt, 2),
-            "num_points": len(gps_points),
+            "num_points": num_points,
             "constraint": f"altitude ≤ {self.MAX_ALTITUDE}m",
             "verification": "✓ VERIFIED" if constraint_satisfied else "✗ FAILED",
-            "circuit": self.proof_circuit
+            "circuit": self.proof_circuit,
+            "merkle_root": merkle_root
         }
     
-    def _hash_private_inputs(self, gps_points: List[Dict]) -> str:
-        """Hash private GPS data (actual coordinates hidden in ZK)"""
-        data = json.dumps(gps_points, sort_keys=True).encode()
-        return hashlib.sha256(data).hexdigest()[:16]
+    def _track_altitude_stats(self, track: GpsTrack):
+        """Max/min/mean altitude of a GpsTrack, vectorized when NumPy is available"""
+        if np is not None:
+            alt = np.frombuffer(track.alt, dtype=np.float64)
+            return float(alt.max()), float(alt.min()), float(alt.mean())
+        return max(track.alt), min(track.alt), sum(track.alt) / len(track.alt)
     
     def verify_proof(self, proof: Dict) -> bool:
         """Verify the ZK proof (on-chain verification)"""
@@ -85,6 +119,53 @@ class NautilusProofAltitude:
             "verified": proof['valid']
         })
 
+class StreamingAltitudeProof:
+    """
+    Incremental altitude proof for a track that grows point by point
+    
+    Keeps running max/min/sum/count, the `TrackHasher` state that
+    `private_inputs_hash` uses and the right edge of the Merkle tree
+    (`MerkleRoot`), so state stays O(log n) however long the track gets,
+    `proof()` is O(log n) and it matches `generate_proof` on the points
+    seen so far. Inclusion proofs for replayed segments need the points
+    themselves: build a `GpsMerkleTree` from them.
+    """
+    
+    def __init__(self, prover: NautilusProofAltitude = None):
+        self.prover = prover or NautilusProofAltitude()
+        self.count = 0
+        self.max_alt = None
+        self.min_alt = None
+        self.sum_alt = 0
+        self._hash = TrackHasher()
+        self.merkle = MerkleRoot()
+    
+    def append(self, point: Dict):
+        """Add one {"lat", "lon", "alt", "timestamp"} point"""
+        alt = point.get('alt', 0)
+        if self.count:
+            self.max_alt = max(self.max_alt, alt)
+            self.min_alt = min(self.min_alt, alt)
+        else:
+            self.max_alt = self.min_alt = alt
+        self.sum_alt += alt
+        self.count += 1
+        self._hash.update(point)
+        self.merkle.append(point)
+    
+    def extend(self, points: List[Dict]):
+        for point in points:
+            self.append(point)
+    
+    def proof(self) -> Dict:
+        """Proof snapshot over every point appended so far"""
+        if not self.count:
+            return {"valid": False, "error": "No GPS data"}
+        return self.prover._build_proof(
+            self.max_alt, self.min_alt, self.sum_alt / self.count,
+            self.count, self._hash.digest().hex()[:16], self.merkle.root().hex()
+        )
+
 def test_proof():
     """Test the Nautilus proof system"""
     print("=== Nautilus ZK-PROOF Test ===\n")
@@ -123,6 +204,22 @@ def test_proof():
     print(f"  Proof hash: {proof_invalid['proof_hash']}")
     print()
     
+    # Test case 3: Streaming proof matches the batch proof
+    stream = StreamingAltitudeProof(prover)
+    stream.extend(gps_data_invalid)
+    
+    print("Test 3: Streaming Proof")
+    print(f"  Matches batch proof: {'✓' if stream.proof() == proof_invalid else '✗'}")
+    print()
+    
+    # Test case 4: Replay a segment against the Merkle root only
+    segment_proof = GpsMerkleTree(gps_data_invalid).prove_range(1, 3)
+    segment_ok = verify_range(proof_invalid['merkle_root'], segment_proof, gps_data_invalid[1:3])
+    
+    print("Test 4: Segment Inclusion")
+    print(f"  Points 1-2 with {len(segment_proof['nodes'])} proof node(s): {'✓ INCLUDED' if segment_ok else '✗ REJECTED'}")
+    print()
+    
     # Chain format
     chain_proof = prover.format_proof_for_chain(proof)
     print("On-chain proof format:")
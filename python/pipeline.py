@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# MirrorWitness PHASE2 2025-11-04
+
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, List, Optional
+from metrics import Logger, gauge, histogram
+
+log = Logger("[PIPELINE]")
+
+
+class Stage:
+    """
+    One pipeline stage: a bounded input queue drained by N concurrent workers
+
+    Each worker awaits `handler(item)` and puts the result on the next stage's
+    queue. When that queue is full the worker blocks, which fills this
+    stage's queue in turn, so a slow stage pushes back all the way to the
+    producer instead of piling up work. A handler returning None drops the
+    item. Exceptions are logged and the item dropped.
+    """
+
+    def __init__(self, name: str, handler: Callable[[object], Awaitable[object]],
+                 concurrency: int = 1, queue_size: int = 64):
+        self.name = name
+        self.handler = handler
+        self.concurrency = max(1, concurrency)
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.next: Optional["Stage"] = None
+        self.workers: List[asyncio.Task] = []
+        self.busy = 0
+        self.done = 0
+        self.failed = 0
+        self.busy_seconds = 0.0
+        self.latency = histogram("pot_stage_seconds", "Time one item spends in a stage handler", stage=name)
+        gauge("pot_stage_queue_depth", "Items waiting for a stage worker", fn=self.queue.qsize, stage=name)
+
+    def start(self):
+        self.workers = [
+            asyncio.create_task(self._work(), name=f"{self.name}-{n}")
+            for n in range(self.concurrency)
+        ]
+
+    async def put(self, item):
+        await self.queue.put(item)
+
+    async def _work(self):
+        while True:
+            item = await self.queue.get()
+            self.busy += 1
+            started = time.perf_counter()
+            try:
+                result = await self.handler(item)
+            except Exception as e:
+                self.failed += 1
+                log.warning("%s failed: %s", self.name, e)
+                continue
+            finally:
+                self.busy -= 1
+                elapsed = time.perf_counter() - started
+                self.busy_seconds += elapsed
+                self.latency.observe(elapsed)
+                self.queue.task_done()
+            self.done += 1
+            if self.next is not None and result is not None:
+                await self.next.put(result)
+
+    def stats(self) -> Dict:
+        return {
+            "queued": self.queue.qsize(),
+            "capacity": self.queue.maxsize,
+            "busy": self.busy,
+            "concurrency": self.concurrency,
+            "done": self.done,
+            "failed": self.failed,
+        }
+
+    async def stop(self):
+        for worker in self.workers:
+            worker.cancel()
+        await asyncio.gather(*self.workers, return_exceptions=True)
+        self.workers = []
+
+
+class Pipeline:
+    """Stages chained in order; items enter at the first stage"""
+
+    def __init__(self, stages: List[Stage]):
+        self.stages = stages
+        for stage, following in zip(stages, stages[1:]):
+            stage.next = following
+
+    def start(self):
+        for stage in self.stages:
+            stage.start()
+
+    async def put(self, item):
+        await self.stages[0].put(item)
+
+    def stats(self) -> Dict[str, Dict]:
+        return {stage.name: stage.stats() for stage in self.stages}
+
+    def report(self) -> str:
+        """One line of queue depth and worker use per stage"""
+        return " | ".join(
+            f"{name} q={s['queued']}/{s['capacity']} busy={s['busy']}/{s['concurrency']} done={s['done']}"
+            + (f" failed={s['failed']}" if s["failed"] else "")
+            for name, s in self.stats().items()
+        )
+
+    async def drain(self):
+        """Wait until every queued item has passed through every stage"""
+        for stage in self.stages:
+            await stage.queue.join()
+
+    async def stop(self):
+        for stage in self.stages:
+            await stage.stop()
+
+
+class Ticker:
+    """
+    Fixed-schedule ticks: the n-th tick is due at start + n * interval
+
+    A late tick does not shift the schedule. Ticks that are already wholly
+    past when the caller comes back are skipped and counted in `missed`.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.missed = 0
+        self._next = None
+
+    async def wait(self):
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        if self._next is None:
+            self._next = now
+        elif now >= self._next + self.interval:
+            skipped = int((now - self._next) // self.interval)
+            self.missed += skipped
+            self._next += skipped * self.interval
+        if self._next > now:
+            await asyncio.sleep(self._next - now)
+        self._next += self.interval
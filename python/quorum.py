@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+# MirrorWitness PHASE2 2025-11-04
+
+import asyncio
+import hashlib
+import json
+import time
+from typing import Callable, Dict, Optional
+import metrics
+from metrics import Logger
+from sig_verify import BatchVerifier
+from timing_wheel import TimingWheel
+import wire
+
+REQUIRED_WITNESSES = 3  # matches REQUIRED_WITNESSES in proof_of_task.move
+
+log = Logger("[QUORUM]")
+trace = log.sampled()  # per-reply lines
+QUORUM_SECONDS = metrics.histogram("pot_quorum_seconds", "Tracking start to quorum (or seal expiry)")
+TASKS_COMPLETE = metrics.counter("pot_quorum_tasks_total", "Tasks finished by the quorum collector", result="complete")
+TASKS_EXPIRED = metrics.counter("pot_quorum_tasks_total", "Tasks finished by the quorum collector", result="expired")
+SIGNATURES_REJECTED = metrics.counter("pot_quorum_rejected_signatures_total", "Witness signatures that failed verification")
+RETRIES = metrics.counter("pot_quorum_retries_total", "Rebroadcasts of tasks short of quorum")
+MALFORMED = metrics.counter("pot_quorum_malformed_replies_total", "Witness replies that could not be parsed")
+
+
+class PendingTask:
+    """Outstanding task waiting for witness signatures"""
+
+    __slots__ = ("cid", "payload", "payload_hash", "sealed_until", "started",
+                 "signatures", "sources", "future", "timer", "retry", "retries")
+
+    def __init__(self, cid, payload, sealed_until, future):
+        self.cid = cid
+        self.payload = payload
+        self.payload_hash = hashlib.sha256(payload).hexdigest()
+        self.sealed_until = sealed_until
+        self.started = time.perf_counter()
+        self.signatures = {}  # pubkey hex -> reply
+        self.sources = set()  # witness urls that delivered an accepted signature
+        self.future = future
+        self.timer = None
+        self.retry = None
+        self.retries = 0
+
+
+class QuorumCollector:
+    """
+    Collects `witness_signature` replies per task cid
+
+    A task completes as soon as the first `required` valid signatures from
+    distinct witnesses arrive; later replies are ignored. Tasks still
+    short of quorum at `sealed_until` complete with `complete: False`.
+
+    Seal expiry and retries run on one shared `TimingWheel` rather than a
+    loop timer per task. With `on_retry` set, a task still short of quorum
+    is handed back every `retry_interval` seconds, at most `max_retries`
+    times, so the caller can rebroadcast it to the witnesses not yet in
+    `task.sources`.
+
+    Batched replies are verified on the verifier's thread pool, so a large
+    batch never stalls the event loop.
+    """
+
+    def __init__(self, required: int = REQUIRED_WITNESSES,
+                 verifier: Optional[BatchVerifier] = None,
+                 wheel: Optional[TimingWheel] = None,
+                 on_retry: Optional[Callable[[PendingTask], None]] = None,
+                 retry_interval: float = 0.0, max_retries: int = 0):
+        self.required = required
+        self.verifier = verifier or BatchVerifier()
+        self.wheel = wheel or TimingWheel()
+        self.on_retry = on_retry
+        self.retry_interval = retry_interval
+        self.max_retries = max_retries
+        self.pending: Dict[str, PendingTask] = {}
+        self.completed = 0
+        self.expired = 0   # reached sealed_until without quorum
+        self.rejected = 0
+        self.retried = 0
+        self.malformed = 0  # replies that are not a signature message at all
+        self.verifying = set()  # batch verifications in flight
+
+    def track(self, cid: str, payload: bytes, sealed_until: float) -> asyncio.Future:
+        """Start collecting for `cid`; the future resolves with the quorum result"""
+        existing = self.pending.get(cid)
+        if existing is not None:
+            return existing.future  # already collecting: keep its timers and signatures
+        self.wheel.start()
+        task = PendingTask(cid, payload, sealed_until, asyncio.get_running_loop().create_future())
+        task.timer = self.wheel.call_at(sealed_until, self._expire, cid)
+        self._schedule_retry(task)
+        self.pending[cid] = task
+        return task.future
+
+    def _schedule_retry(self, task: PendingTask):
+        if self.on_retry is None or self.retry_interval <= 0 or task.retries >= self.max_retries:
+            return
+        if time.time() + self.retry_interval < task.sealed_until:
+            task.retry = self.wheel.call_later(self.retry_interval, self._retry, task.cid)
+
+    def _retry(self, cid: str):
+        task = self.pending.get(cid)
+        if task is None:
+            return
+        task.retries += 1
+        self.retried += 1
+        RETRIES.inc()
+        self.on_retry(task)
+        self._schedule_retry(task)
+
+    def on_message(self, source, raw):
+        """WitnessPool callback: route witness replies to the collector"""
+        if isinstance(raw, bytes):
+            try:
+                self._verify_later(wire.decode_signatures(raw), source)
+            except wire.WireError as e:
+                self._malformed(source, e)
+            return
+        try:
+            message = json.loads(raw)
+        except (TypeError, ValueError) as e:
+            self._malformed(source, e)
+            return
+        if not isinstance(message, dict):
+            self._malformed(source, f"expected an object, got {type(message).__name__}")
+            return
+        kind = message.get('type')
+        if kind == 'witness_signature':
+            self.add_signature(message, source)
+        elif kind == 'witness_signature_batch':
+            self._verify_later(message, source)
+
+    def _verify_later(self, batch: Dict, source):
+        """Run `add_signature_batch` as a task; keeps a reference until it is done"""
+        task = asyncio.get_running_loop().create_task(self.add_signature_batch(batch, source))
+        self.verifying.add(task)
+        task.add_done_callback(self._verified)
+
+    def _verified(self, task: asyncio.Task):
+        self.verifying.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            log.error("Batch verification failed: %r", task.exception())
+
+    def _malformed(self, source, reason):
+        self.malformed += 1
+        MALFORMED.inc()
+        trace.warning("Dropped malformed reply from %s: %s", source, reason)
+
+    def add_signature(self, reply: Dict, source=None) -> bool:
+        """Record one witness reply; returns True if it was accepted"""
+        task = self.pending.get(reply.get('cid'))
+        if task is None:
+            return False  # unknown, finished or expired task
+
+        pubkey = reply.get('pubkey', '')
+        if pubkey in task.signatures:
+            return False  # duplicate witness
+
+        if not self._verify(task, reply):
+            self.rejected += 1
+            SIGNATURES_REJECTED.inc()
+            log.warning("Rejected signature from witness %s for %s...", reply.get('witness_id'), task.cid[:16])
+            return False
+
+        task.signatures[pubkey] = reply
+        task.sources.add(source)
+        if len(task.signatures) >= self.required:
+            self._finish(task, complete=True)
+        return True
+
+    async def add_signature_batch(self, batch: Dict, source=None) -> int:
+        """Record a `witness_signature_batch`; returns the number accepted"""
+        pubkey = batch.get('pubkey', '')
+        candidates = []
+        for entry in batch.get('signatures', []):
+            task = self.pending.get(entry.get('cid'))
+            if task is None or pubkey in task.signatures:
+                continue
+            if entry.get('payload_hash') != task.payload_hash or 'signature' not in entry:
+                self.rejected += 1
+                SIGNATURES_REJECTED.inc()
+                continue
+            candidates.append((task, entry))
+
+        triples = [(pubkey, task.payload, entry['signature']) for task, entry in candidates]
+        if len(triples) == 1:
+            verdicts = [self.verifier.verify_one(*triples[0])]  # not worth a thread hop
+        else:
+            verdicts = await self.verifier.verify_batch_async(triples)
+        accepted = 0
+        for (task, entry), ok in zip(candidates, verdicts):
+            if not ok:
+                self.rejected += 1
+                SIGNATURES_REJECTED.inc()
+                continue
+            if self.pending.get(task.cid) is not task or pubkey in task.signatures:
+                continue  # finished, or already signed, while this batch was verified
+            task.signatures[pubkey] = {
+                "witness_id": batch.get('witness_id'),
+                "pubkey": pubkey,
+                **entry
+            }
+            task.sources.add(source)
+            accepted += 1
+            if len(task.signatures) >= self.required:
+                self._finish(task, complete=True)
+        if len(candidates) > accepted:
+            log.warning("Rejected %d batched signatures from witness %s", len(candidates) - accepted, batch.get('witness_id'))
+        return accepted
+
+    def _verify(self, task: PendingTask, reply: Dict) -> bool:
+        if reply.get('payload_hash') != task.payload_hash:
+            return False
+        if 'pubkey' not in reply or 'signature' not in reply:
+            return False
+        return self.verifier.verify_one(reply['pubkey'], task.payload, reply['signature'])
+
+    def _expire(self, cid: str):
+        task = self.pending.get(cid)
+        if task is not None:
+            self._finish(task, complete=False)
+
+    def _finish(self, task: PendingTask, complete: bool):
+        del self.pending[task.cid]
+        if task.timer is not None:
+            task.timer.cancel()
+        if task.retry is not None:
+            task.retry.cancel()
+        elapsed = time.perf_counter() - task.started
+        QUORUM_SECONDS.observe(elapsed)
+        if complete:
+            self.completed += 1
+            TASKS_COMPLETE.inc()
+        else:
+            self.expired += 1
+            TASKS_EXPIRED.inc()
+
+        if not task.future.done():
+            task.future.set_result({
+                "cid": task.cid,
+                "complete": complete,
+                "signatures": [
+                    {
+                        "witness_id": reply.get('witness_id'),
+                        "pubkey": reply['pubkey'],
+                        "signature": reply['signature'],
+                    }
+                    for reply in task.signatures.values()
+                ],
+                "payload_hash": task.payload_hash,
+                "latency_ms": round(elapsed * 1000, 2),
+            })
+
+    def stats(self) -> Dict:
+        return {
+            "pending": len(self.pending),
+            "completed": self.completed,
+            "expired": self.expired,
+            "rejected": self.rejected,
+            "retried": self.retried,
+            "malformed": self.malformed,
+        }
+
+    def cancel_all(self):
+        """Resolve every outstanding task as incomplete (shutdown)"""
+        for verification in list(self.verifying):
+            verification.cancel()
+        for task in list(self.pending.values()):
+            self._finish(task, complete=False)
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# MirrorWitness PHASE2 2025-11-04
+
+import asyncio
+import random
+import time
+from typing import Awaitable, Callable, Dict, Optional
+from gps_sources import GpsSource
+from metrics import Logger, counter, histogram
+from pipeline import Ticker
+
+log = Logger("[MINER]")
+trace = log.sampled()
+GPS_READ_SECONDS = histogram("pot_gps_read_seconds", "GPS source read per sample")
+SEAL_SECONDS = histogram("pot_seal_seconds", "Sealing one GPS sample")
+GPS_SAMPLES = counter("pot_gps_samples_total", "GPS samples read by all sessions")
+GPS_THROTTLED = counter("pot_gps_throttled_total", "Samples dropped by session token buckets")
+
+
+class TokenBucket:
+    """`rate` tokens per second, holding at most `burst`"""
+
+    __slots__ = ("rate", "burst", "tokens", "updated")
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= tokens:
+            self.tokens -= tokens
+            return True
+        return False
+
+
+class DroneSession:
+    """
+    One drone served by a shared miner
+
+    Owns its GPS source, sampling schedule, nonce generator and task
+    counters. Samples beyond the session's token bucket are dropped and
+    counted as `throttled` before they reach the shared pipeline, so a
+    drone sampling too fast cannot crowd out the others.
+    """
+
+    def __init__(self, session_id: str, source: GpsSource, interval: float,
+                 rate: float, burst: float, seal_duration: float):
+        self.session_id = session_id
+        self.source = source
+        self.ticker = Ticker(interval)
+        self.bucket = TokenBucket(rate, burst)
+        self.seal_duration = seal_duration
+        self.nonces = random.Random()
+        self.current_task_id: Optional[str] = None
+        self.sampled = 0
+        self.throttled = 0
+        self.completed = 0
+        self.expired = 0
+        self.task: Optional[asyncio.Task] = None
+
+    def seal(self, gps_data: Dict) -> Dict:
+        """Seal data with `seal_duration` validity"""
+        return {
+            **gps_data,
+            "sealed_until": time.time() + self.seal_duration,
+            "nonce": self.nonces.randint(1000000, 9999999)
+        }
+
+    async def run(self, submit: Callable[["DroneSession", Dict], Awaitable]):
+        """Sample on schedule and hand sealed data to `submit` until cancelled"""
+        await self.source.start()
+        while True:
+            await self.ticker.wait()
+            try:
+                started = time.perf_counter()
+                gps_data = await self.source.read()
+                sealed_at = time.perf_counter()
+                GPS_READ_SECONDS.observe(sealed_at - started)
+                self.sampled += 1
+                GPS_SAMPLES.inc()
+                if not self.bucket.try_acquire():
+                    self.throttled += 1
+                    GPS_THROTTLED.inc()
+                    continue
+                trace.info("%s %s: lat=%s, lon=%s, alt=%sm", self.session_id, gps_data.get('source', 'GPS'),
+                           gps_data['lat'], gps_data['lon'], gps_data['alt'])
+                sealed = self.seal(gps_data)
+                SEAL_SECONDS.observe(time.perf_counter() - sealed_at)
+                # Blocks while the shared upload queue is full (backpressure)
+                await submit(self, sealed)
+            except Exception as e:
+                log.error("Error in session %s: %s", self.session_id, e)
+
+    def stats(self) -> Dict:
+        return {
+            "sampled": self.sampled,
+            "throttled": self.throttled,
+            "missed": self.ticker.missed,
+            "completed": self.completed,
+            "expired": self.expired,
+        }
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# MirrorWitness PHASE2 2025-11-04
+
+import asyncio
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+from nacl.signing import VerifyKey
+from nacl.exceptions import BadSignatureError
+
+KEY_CACHE_SIZE = 4096  # decoded VerifyKey objects kept per verifier
+CHUNK_SIZE = 256       # triples handed to a worker thread at a time
+
+Bytesish = Union[bytes, str]
+Triple = Tuple[Bytesish, bytes, Bytesish]  # (pubkey, payload, signature)
+
+
+def _as_bytes(value: Bytesish) -> bytes:
+    return bytes.fromhex(value) if isinstance(value, str) else value
+
+
+class BatchVerifier:
+    """
+    Bulk Ed25519 verification for witness signatures
+
+    Decoded `VerifyKey` objects are cached per pubkey, and batches are split
+    into chunks verified on a thread pool (PyNaCl releases the GIL while
+    in libsodium). Every entry point returns one bool per input item;
+    malformed items simply fail.
+    """
+
+    def __init__(self, workers: Optional[int] = None, cache_size: int = KEY_CACHE_SIZE,
+                 chunk_size: int = CHUNK_SIZE):
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.executor = ThreadPoolExecutor(max_workers=self.workers,
+                                           thread_name_prefix="sig-verify")
+        self._cached_key = lru_cache(maxsize=cache_size)(self._decode_key)
+
+    def verify_key(self, pubkey: Bytesish) -> Optional[VerifyKey]:
+        """Decoded key, cached by its raw bytes; None if malformed"""
+        if isinstance(pubkey, str):
+            try:
+                pubkey = bytes.fromhex(pubkey)
+            except ValueError:
+                return None
+        elif isinstance(pubkey, (bytearray, memoryview)):
+            pubkey = bytes(pubkey)
+        elif not isinstance(pubkey, bytes):
+            return None  # e.g. a list from a malformed JSON reply: unhashable
+        return self._cached_key(pubkey)
+
+    @staticmethod
+    def _decode_key(pubkey: bytes) -> Optional[VerifyKey]:
+        try:
+            return VerifyKey(pubkey)
+        except Exception:
+            return None
+
+    def verify_one(self, pubkey: Bytesish, payload: bytes, signature: Bytesish) -> bool:
+        """Verify a single (pubkey, payload, signature) triple"""
+        key = self.verify_key(pubkey)
+        if key is None:
+            return False
+        try:
+            key.verify(payload, _as_bytes(signature))
+            return True
+        except (BadSignatureError, ValueError, TypeError):
+            return False
+
+    def _verify_chunk(self, items: Sequence[Triple]) -> List[bool]:
+        verify_one = self.verify_one
+        return [verify_one(pubkey, payload, sig) for pubkey, payload, sig in items]
+
+    def _chunks(self, items: Sequence[Triple]):
+        size = self.chunk_size
+        return [items[i:i + size] for i in range(0, len(items), size)]
+
+    def verify_batch(self, items: Sequence[Triple]) -> List[bool]:
+        """Verify many triples across the thread pool; blocks the caller"""
+        items = list(items)
+        if len(items) <= self.chunk_size:
+            return self._verify_chunk(items)
+        results = []
+        for chunk_result in self.executor.map(self._verify_chunk, self._chunks(items)):
+            results.extend(chunk_result)
+        return results
+
+    async def verify_batch_async(self, items: Sequence[Triple]) -> List[bool]:
+        """Like `verify_batch`, without blocking the event loop"""
+        items = list(items)
+        if not items:
+            return []
+        loop = asyncio.get_running_loop()
+        chunk_results = await asyncio.gather(*(
+            loop.run_in_executor(self.executor, self._verify_chunk, chunk)
+            for chunk in self._chunks(items)
+        ))
+        return [ok for chunk_result in chunk_results for ok in chunk_result]
+
+    @staticmethod
+    def reply_triples(replies: Iterable[Dict], payloads: Dict[str, bytes]):
+        """
+        Turn `witness_signature` replies into verification triples
+
+        Replies whose cid is unknown or whose `payload_hash` does not match
+        SHA-256 of the stored payload map to None (already failed).
+        """
+        hashes = {}
+        triples = []
+        for reply in replies:
+            payload = payloads.get(reply.get('cid'))
+            if payload is None:
+                triples.append(None)
+                continue
+            cid = reply['cid']
+            if cid not in hashes:
+                hashes[cid] = hashlib.sha256(payload).hexdigest()
+            if reply.get('payload_hash') != hashes[cid] or 'pubkey' not in reply or 'signature' not in reply:
+                triples.append(None)
+                continue
+            triples.append((reply['pubkey'], payload, reply['signature']))
+        return triples
+
+    async def verify_replies(self, replies: Sequence[Dict], payloads: Dict[str, bytes]) -> List[bool]:
+        """Per-reply pass/fail for replies in `WitnessNode.process_task` format"""
+        triples = self.reply_triples(replies, payloads)
+        checked = await self.verify_batch_async([t for t in triples if t is not None])
+        results = iter(checked)
+        return [t is not None and next(results) for t in triples]
+
+    async def filter_replies(self, replies: Sequence[Dict], payloads: Dict[str, bytes]) -> List[Dict]:
+        """Drop replies with bad signatures before they reach `witness_task`"""
+        verdicts = await self.verify_replies(replies, payloads)
+        return [reply for reply, ok in zip(replies, verdicts) if ok]
+
+    def close(self):
+        self.executor.shutdown(wait=False)
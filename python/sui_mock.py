@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+# MirrorWitness PHASE2 2025-11-04
+
+import argparse
+import asyncio
+import base64
+import copy
+import hashlib
+import json
+import os
+import time
+from aiohttp import web
+from nacl.exceptions import BadSignatureError
+from nacl.signing import VerifyKey
+from sui_submitter import ED25519_FLAG, INTENT_TRANSACTION, MODULE, sui_address
+
+MOCK_PORT = 9000
+TASK_EXPIRY_MS = 300_000
+# proof_of_task abort codes
+E_EXPIRED = 1
+E_INVALID_SIGNATURE = 3
+E_DUPLICATE_WITNESS = 4
+E_NOT_AUTHORIZED = 5
+
+
+class MoveAbort(Exception):
+    def __init__(self, function: str, code: int):
+        super().__init__(f"MoveAbort({MODULE}::{function}, {code})")
+        self.code = code
+        self.command = 0
+
+
+class SuiMock:
+    """
+    In-memory JSON-RPC stand-in for the calls `SuiSubmitter` makes
+
+    `unsafe_batchTransaction` returns opaque tx bytes, and
+    `sui_executeTransactionBlock` checks the Ed25519 intent signature
+    against the tx sender. Like a real validator it rejects a transaction
+    whose gas coin is already locked by another in-flight one. The
+    `proof_of_task` calls run against in-memory `Task` objects with the
+    contract's checks: `witness_task` verifies the signature over the
+    staked payload and rejects expired tasks and repeated witnesses,
+    `commit_blob_cid` only accepts the staker. An abort reverts every
+    call in the transaction and is reported as a failure status. Single
+    and batched (array) JSON-RPC requests are both accepted.
+    """
+
+    def __init__(self, coins: int = 4, latency: float = 0.0):
+        self.coins = coins
+        self.latency = latency
+        self.pending = {}      # tx bytes -> (sender, gas coin, move calls)
+        self.locked = set()    # gas coins held by executing transactions
+        self.tasks = {}        # Task object id -> staker, payload, walrus cid, witnesses, expiry
+        self.executed = []
+        self.requests = 0
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_post("/", self.handle)
+        return app
+
+    async def handle(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        self.requests += 1
+        if isinstance(body, list):
+            replies = await asyncio.gather(*(self.dispatch(item) for item in body))
+            return web.json_response(replies)
+        return web.json_response(await self.dispatch(body))
+
+    async def dispatch(self, request):
+        method = getattr(self, "rpc_" + request.get("method", ""), None)
+        reply = {"jsonrpc": "2.0", "id": request.get("id")}
+        if method is None:
+            reply["error"] = {"code": -32601, "message": f"method not found: {request.get('method')}"}
+            return reply
+        try:
+            reply["result"] = await method(*request.get("params", []))
+        except ValueError as e:
+            reply["error"] = {"code": -32602, "message": str(e)}
+        return reply
+
+    async def rpc_suix_getCoins(self, owner, coin_type=None, cursor=None, limit=None):
+        coins = [
+            {"coinObjectId": "0x" + hashlib.sha256(f"{owner}:{n}".encode()).hexdigest(),
+             "coinType": "0x2::sui::SUI", "balance": "1000000000000"}
+            for n in range(self.coins)
+        ]
+        return {"data": coins, "nextCursor": None, "hasNextPage": False}
+
+    async def rpc_unsafe_batchTransaction(self, signer, calls, gas, gas_budget, mode=None):
+        if not calls:
+            raise ValueError("empty transaction")
+        for call in calls:
+            params = call["moveCallRequestParams"]
+            if params["function"] not in ("stake_task", "witness_task", "commit_blob_cid"):
+                raise ValueError(f"function not found: {MODULE}::{params['function']}")
+            if params["function"] != "stake_task" and params["arguments"][0] not in self.tasks:
+                raise ValueError(f"object {params['arguments'][0]} not found")
+        tx_bytes = json.dumps({"sender": signer, "gas": gas, "calls": calls, "salt": os.urandom(8).hex()}).encode()
+        encoded = base64.b64encode(tx_bytes).decode()
+        self.pending[encoded] = (signer, gas, calls)
+        return {"txBytes": encoded, "gas": [{"objectId": gas}], "inputObjects": []}
+
+    async def rpc_sui_executeTransactionBlock(self, tx_bytes, signatures, options=None, request_type=None):
+        built = self.pending.pop(tx_bytes, None)
+        if built is None:
+            raise ValueError("unknown transaction bytes")
+        sender, gas, calls = built
+        raw = base64.b64decode(signatures[0])
+        flag, signature, pubkey = raw[0], raw[1:65], raw[65:]
+        if flag != ED25519_FLAG or sui_address(pubkey) != sender:
+            raise ValueError("signature does not match sender")
+        digest = hashlib.blake2b(INTENT_TRANSACTION + base64.b64decode(tx_bytes), digest_size=32).digest()
+        try:
+            VerifyKey(pubkey).verify(digest, signature)
+        except BadSignatureError:
+            raise ValueError("invalid signature")
+        if gas in self.locked:
+            raise ValueError(f"object {gas} is locked by another transaction")
+        self.locked.add(gas)
+        try:
+            if self.latency:
+                await asyncio.sleep(self.latency)
+        finally:
+            self.locked.discard(gas)
+        tx_digest = base64.b64encode(digest).decode()
+        self.executed.append((tx_digest, len(calls)))
+        effects = {"status": {"status": "success"}, "gasObject": {"objectId": gas}}
+        try:
+            created = self.run_calls(sender, digest, calls)
+        except MoveAbort as e:
+            effects["status"] = {"status": "failure", "error": f"{e} in command {e.command}"}
+            created = []
+        reply = {"digest": tx_digest, "effects": effects}
+        if created:
+            effects["created"] = [{"owner": {"Shared": {"initial_shared_version": 1}},
+                                   "reference": {"objectId": object_id}} for object_id, _ in created]
+        if (options or {}).get("showObjectChanges"):
+            reply["objectChanges"] = [{"type": "created", "sender": sender, "objectId": object_id,
+                                       "objectType": f"{package}::{MODULE}::Task"} for object_id, package in created]
+        return reply
+
+    def run_calls(self, sender: str, digest: bytes, calls) -> list:
+        """Apply the Move calls in order; an abort leaves every Task untouched"""
+        touched, created = {}, []
+        for command, call in enumerate(calls):
+            params = call["moveCallRequestParams"]
+            function, args = params["function"], params["arguments"]
+            try:
+                if function == "stake_task":
+                    object_id = "0x" + hashlib.blake2b(digest + bytes([command]), digest_size=32).hexdigest()
+                    touched[object_id] = {
+                        "staker": sender, "payload": bytes(args[0]), "walrus_cid": bytes(args[1]),
+                        "witnesses": [], "expires": time.time() * 1000 + TASK_EXPIRY_MS,
+                    }
+                    created.append((object_id, params["packageObjectId"]))
+                    continue
+                task = touched.get(args[0]) or copy.deepcopy(self.tasks[args[0]])
+                touched[args[0]] = task
+                if function == "witness_task":
+                    self.witness(task, bytes(args[1]), bytes(args[2]))
+                else:
+                    if sender != task["staker"]:
+                        raise MoveAbort(function, E_NOT_AUTHORIZED)
+                    task["walrus_cid"] = bytes(args[1])
+            except MoveAbort as e:
+                e.command = command
+                raise
+        self.tasks.update(touched)
+        return created
+
+    @staticmethod
+    def witness(task: dict, pubkey: bytes, signature: bytes):
+        if time.time() * 1000 > task["expires"]:
+            raise MoveAbort("witness_task", E_EXPIRED)
+        try:
+            VerifyKey(pubkey).verify(task["payload"], signature)
+        except (BadSignatureError, ValueError):
+            raise MoveAbort("witness_task", E_INVALID_SIGNATURE)
+        if pubkey in task["witnesses"]:
+            raise MoveAbort("witness_task", E_DUPLICATE_WITNESS)
+        task["witnesses"].append(pubkey)
+
+    async def start(self, host: str = "127.0.0.1", port: int = MOCK_PORT) -> web.AppRunner:
+        runner = web.AppRunner(self.app())
+        await runner.setup()
+        await web.TCPSite(runner, host, port).start()
+        return runner
+
+
+async def serve(args):
+    mock = SuiMock(coins=args.coins, latency=args.latency_ms / 1000)
+    await mock.start(args.host, args.port)
+    print(f"[SUI-MOCK] JSON-RPC on http://{args.host}:{args.port} "
+          f"({args.coins} gas coins per owner, {args.latency_ms}ms execution)")
+    await asyncio.Event().wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local Sui JSON-RPC stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=MOCK_PORT)
+    parser.add_argument("--coins", type=int, default=4)
+    parser.add_argument("--latency-ms", type=float, default=200.0)
+    asyncio.run(serve(parser.parse_args()))
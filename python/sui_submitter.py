@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+# MirrorWitness PHASE2 2025-11-04
+
+import asyncio
+import base64
+import hashlib
+import itertools
+import random
+import time
+from functools import partial
+from typing import Dict, List, Optional
+import aiohttp
+from nacl.signing import SigningKey
+from metrics import Logger, counter, histogram
+from task_batcher import TaskBatcher
+
+SUI_CLOCK = "0x6"
+MODULE = "proof_of_task"
+INTENT_TRANSACTION = bytes([0, 0, 0])  # scope TransactionData, version 0, app Sui
+ED25519_FLAG = 0x00
+GAS_BUDGET = 50_000_000
+BATCH_MAX_SIZE = 50       # Move calls per programmable transaction
+BATCH_MAX_DELAY = 0.500   # seconds a call may wait for its transaction
+RPC_RETRIES = 3
+RPC_TIMEOUT = 30.0
+
+log = Logger("[SUI]")
+dry_run_log = Logger("[MINER]").sampled()
+SUBMIT_SECONDS = histogram("pot_sui_submit_seconds", "Build, sign and execute one batched transaction")
+TRANSACTIONS_OK = counter("pot_sui_transactions_total", "Executed programmable transactions", result="ok")
+TRANSACTIONS_FAILED = counter("pot_sui_transactions_total", "Executed programmable transactions", result="failed")
+MOVE_CALLS = counter("pot_sui_calls_total", "Move calls queued for submission")
+
+
+class SuiError(Exception):
+    pass
+
+
+def sui_address(pubkey: bytes) -> str:
+    """Sui address of an Ed25519 public key"""
+    return "0x" + hashlib.blake2b(bytes([ED25519_FLAG]) + pubkey, digest_size=32).hexdigest()
+
+
+def sign_transaction(key: SigningKey, tx_bytes: bytes) -> str:
+    """Serialized Sui signature (flag || sig || pubkey, base64) over the intent message"""
+    digest = hashlib.blake2b(INTENT_TRANSACTION + tx_bytes, digest_size=32).digest()
+    signature = key.sign(digest).signature
+    return base64.b64encode(bytes([ED25519_FLAG]) + signature + key.verify_key.encode()).decode()
+
+
+def _bytes_arg(value) -> List[int]:
+    """vector<u8> argument from bytes, hex or text"""
+    if isinstance(value, str):
+        try:
+            value = bytes.fromhex(value)
+        except ValueError:
+            value = value.encode()
+    return list(value)
+
+
+class SuiCall:
+    """One queued Move call awaiting its transaction"""
+
+    __slots__ = ("function", "arguments", "label", "future")
+
+    def __init__(self, function: str, arguments: List, label: str, future: asyncio.Future):
+        self.function = function
+        self.arguments = arguments
+        self.label = label
+        self.future = future
+
+
+class SuiSubmitter:
+    """
+    Submits `proof_of_task` Move calls as programmable transactions
+
+    Every task gets its own `Task` object from `stake_task`, and a
+    transaction only ever carries calls for one task object: a Move abort
+    reverts the whole transaction, so independent tasks never share one.
+    Calls on the same task object (its `witness_task` calls) queue behind
+    a size/time window and go out together. Each flush builds the
+    transaction with `unsafe_batchTransaction`, signs its intent message
+    with the miner's Ed25519 key and runs `sui_executeTransactionBlock`,
+    holding a gas coin from the pool, so up to one transaction per coin
+    is in flight without object-lock contention. Each call's future
+    resolves with its transaction's digest and status, or raises
+    `SuiError` if the transaction failed or aborted. Without a package id
+    the submitter only logs the calls.
+    """
+
+    def __init__(self, rpc: str, package_id: str = "", signing_key: Optional[SigningKey] = None,
+                 treasury: str = "", gas_coins: List[str] = (), batch_size: int = BATCH_MAX_SIZE,
+                 batch_delay: float = BATCH_MAX_DELAY, gas_budget: int = GAS_BUDGET):
+        self.rpc_url = rpc
+        self.package_id = package_id
+        self.key = signing_key or SigningKey.generate()
+        self.sender = sui_address(self.key.verify_key.encode())
+        self.treasury = treasury
+        self.gas_budget = gas_budget
+        self.gas_coins = list(gas_coins)
+        self.gas: asyncio.Queue = asyncio.Queue()
+        self.batch_size = batch_size
+        self.batch_delay = batch_delay
+        self.batchers: Dict[str, TaskBatcher] = {}  # task object -> its open batching window
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.ids = itertools.count(1)
+        self.transactions = 0
+        self.calls = 0
+        self.failed = 0
+
+    @property
+    def dry_run(self) -> bool:
+        return not self.package_id
+
+    async def start(self):
+        if self.dry_run or self.session is not None:
+            return
+        self.session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=RPC_TIMEOUT))
+        if not self.gas_coins:
+            coins = await self.rpc("suix_getCoins", [self.sender, "0x2::sui::SUI", None, None])
+            self.gas_coins = [coin["coinObjectId"] for coin in coins["data"]]
+        if not self.gas_coins:
+            raise SuiError(f"no gas coins owned by {self.sender}")
+        for coin in self.gas_coins:
+            self.gas.put_nowait(coin)
+        log.info("Submitter for %s... with %d gas coins", self.sender[:10], len(self.gas_coins))
+
+    async def close(self):
+        for batcher in list(self.batchers.values()):
+            await batcher.flush_now()
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def rpc(self, method: str, params: List):
+        """One JSON-RPC request, retried with jitter on connection errors"""
+        request = {"jsonrpc": "2.0", "id": next(self.ids), "method": method, "params": params}
+        for attempt in range(RPC_RETRIES + 1):
+            try:
+                async with self.session.post(self.rpc_url, json=request) as resp:
+                    reply = await resp.json(content_type=None)
+                break
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if attempt == RPC_RETRIES:
+                    raise SuiError(f"{method} failed: {e or type(e).__name__}")
+                await asyncio.sleep(0.1 * 2 ** attempt * random.uniform(0.5, 1.0))
+        if "error" in reply:
+            raise SuiError(f"{method}: {reply['error'].get('message', reply['error'])}")
+        return reply["result"]
+
+    async def stake_task(self, payload: bytes, cid: str, walrus_ref: str = "") -> Dict:
+        """Create the task's shared `Task` object; the result carries its id as `task_object`"""
+        result = await self._submit(
+            None, "stake_task", [_bytes_arg(payload), _bytes_arg(walrus_ref or cid), SUI_CLOCK],
+            f"stake_task(cid={cid[:16]}...)",
+        )
+        if self.dry_run:
+            return dict(result, task_object="")
+        created = result.get("created") or []
+        if not created:
+            raise SuiError(f"stake_task for {cid[:16]}... created no Task object")
+        return dict(result, task_object=created[0])
+
+    async def commit_blob_cid(self, task_object: str, cid: str) -> Dict:
+        """Point a task staked by this sender at a new Walrus blob"""
+        return await self._submit(task_object, "commit_blob_cid", [task_object, _bytes_arg(cid)],
+                                  f"commit_blob_cid(cid={cid[:16]}...)")
+
+    async def witness_task(self, task_object: str, cid: str, pubkey: str, signature: str, witness_id=None) -> Dict:
+        return await self._submit(
+            task_object, "witness_task",
+            [task_object, _bytes_arg(pubkey), _bytes_arg(signature), self.treasury, SUI_CLOCK],
+            f"witness_task(cid={cid[:16]}..., witness={witness_id if witness_id is not None else pubkey[:8]})",
+        )
+
+    async def _submit(self, task_object: Optional[str], function: str, arguments: List, label: str) -> Dict:
+        """Queue one call behind its task object's window; no task object: a transaction of its own"""
+        self.calls += 1
+        MOVE_CALLS.inc()
+        if self.dry_run:
+            dry_run_log.info("Submitting Sui TX: %s", label)
+            return {"status": "dry-run"}
+        call = SuiCall(function, arguments, label, asyncio.get_running_loop().create_future())
+        if task_object is None:
+            await self._flush([call])
+            return await call.future
+        batcher = self.batchers.get(task_object)
+        if batcher is None:
+            batcher = TaskBatcher(partial(self._flush_task, task_object),
+                                  max_size=self.batch_size, max_delay=self.batch_delay)
+            self.batchers[task_object] = batcher
+        await batcher.add(call)
+        return await call.future
+
+    async def _flush_task(self, task_object: str, calls: List[SuiCall]):
+        # Later calls for this object open a fresh window
+        self.batchers.pop(task_object, None)
+        await self._flush(calls)
+
+    async def _flush(self, calls: List[SuiCall]):
+        coin = await self.gas.get()
+        started = time.perf_counter()
+        try:
+            result = await self._execute(calls, coin)
+        except Exception as e:
+            self.failed += 1
+            TRANSACTIONS_FAILED.inc()
+            log.error("Transaction of %d calls failed: %s", len(calls), e)
+            for call in calls:
+                if not call.future.done():
+                    call.future.set_exception(e)
+            return
+        finally:
+            self.gas.put_nowait(coin)
+            SUBMIT_SECONDS.observe(time.perf_counter() - started)
+        effects = result.get("effects", {})
+        status = effects.get("status", {})
+        digest = result.get("digest") or "?"
+        if status.get("status") != "success":
+            # Executed but aborted: none of the batched calls took effect
+            self.failed += 1
+            TRANSACTIONS_FAILED.inc()
+            error = SuiError(f"transaction {digest[:16]}... {status.get('status')}: {status.get('error')}")
+            log.error("Transaction of %d calls failed: %s", len(calls), error)
+            for call in calls:
+                if not call.future.done():
+                    call.future.set_exception(error)
+            return
+        self.transactions += 1
+        TRANSACTIONS_OK.inc()
+        log.info("TX %s... %d calls: %s", digest[:16], len(calls), status.get('status'))
+        created = [
+            change["objectId"] for change in result.get("objectChanges") or []
+            if change.get("type") == "created" and change.get("objectType", "").endswith(f"::{MODULE}::Task")
+        ]
+        for index, call in enumerate(calls):
+            if not call.future.done():
+                call.future.set_result({
+                    "digest": result.get("digest"),
+                    "status": status.get("status"),
+                    "error": status.get("error"),
+                    "index": index,
+                    "created": created,
+                })
+
+    async def _execute(self, calls: List[SuiCall], coin: str) -> Dict:
+        moves = [{
+            "moveCallRequestParams": {
+                "packageObjectId": self.package_id,
+                "module": MODULE,
+                "function": call.function,
+                "typeArguments": [],
+                "arguments": call.arguments,
+            }
+        } for call in calls]
+        built = await self.rpc("unsafe_batchTransaction", [self.sender, moves, coin, str(self.gas_budget), None])
+        tx_bytes = built["txBytes"]
+        signature = sign_transaction(self.key, base64.b64decode(tx_bytes))
+        return await self.rpc("sui_executeTransactionBlock", [
+            tx_bytes, [signature], {"showEffects": True, "showObjectChanges": True}, "WaitForLocalExecution"
+        ])
+
+    def stats(self) -> Dict:
+        return {
+            "calls": self.calls,
+            "transactions": self.transactions,
+            "failed": self.failed,
+            "gas_free": self.gas.qsize(),
+        }
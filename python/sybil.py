@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+# MirrorWitness PHASE2 2025-11-04
+
+import json
+import math
+from array import array
+from pathlib import Path
+from typing import Dict, Hashable, Iterable, List, Union
+import numpy as np
+
+EARTH_RADIUS_M = 6371000.0
+MIN_WITNESS_DISTANCE_M = 500  # mirrors MIN_WITNESS_DISTANCE_M in proof_of_task.move
+
+_AXIS_BITS = 21
+_AXIS_BIAS = 1 << (_AXIS_BITS - 1)
+
+# Neighbour cells for a pair join: the cell itself plus 13 of the 26 around
+# it, so every adjacent pair of cells is visited exactly once
+_HALF_NEIGHBOURS = [
+    (dx, dy, dz)
+    for dx in (-1, 0, 1) for dy in (-1, 0, 1) for dz in (-1, 0, 1)
+    if (dx, dy, dz) > (0, 0, 0)
+]
+
+
+def haversine_m(lat1, lon1, lat2, lon2):
+    """Vectorized great-circle distance in metres (degrees in)"""
+    lat1, lon1, lat2, lon2 = (np.radians(v) for v in (lat1, lon1, lat2, lon2))
+    a = (np.sin((lat2 - lat1) / 2) ** 2 +
+         np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def _pack(ix: np.ndarray, iy: np.ndarray, iz: np.ndarray) -> np.ndarray:
+    return (((ix + _AXIS_BIAS) << (2 * _AXIS_BITS)) |
+            ((iy + _AXIS_BIAS) << _AXIS_BITS) |
+            (iz + _AXIS_BIAS))
+
+
+def _expand(starts: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """Concatenate the index ranges [start, start + count) without a Python loop"""
+    total = int(counts.sum())
+    if not total:
+        return np.empty(0, dtype=np.int64)
+    offsets = np.repeat(np.cumsum(counts) - counts, counts)
+    return np.repeat(starts, counts) + (np.arange(total) - offsets)
+
+
+class WitnessRegistry:
+    """
+    Known witness positions with a Sybil distance check
+
+    Positions live in typed arrays keyed by witness id. Pair scans map every
+    witness onto a 3D grid over the unit sphere whose cell edge is the chord
+    of `min_distance_m`, so any two witnesses closer than that sit in the
+    same or adjacent cells. Candidate pairs come from a sort + searchsorted
+    join over 14 neighbour offsets and are confirmed with vectorized
+    haversine, with no all-pairs loop and no special cases at the poles or
+    the antimeridian.
+    """
+
+    def __init__(self, min_distance_m: float = MIN_WITNESS_DISTANCE_M):
+        self.min_distance_m = min_distance_m
+        self.ids: List[Hashable] = []
+        self.slots: Dict[Hashable, int] = {}
+        self.lat = array("d")
+        self.lon = array("d")
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, witness_id) -> bool:
+        return witness_id in self.slots
+
+    def register(self, witness_id: Hashable, lat: float, lon: float):
+        """Add a witness or move an existing one"""
+        slot = self.slots.get(witness_id)
+        if slot is None:
+            self.slots[witness_id] = len(self.ids)
+            self.ids.append(witness_id)
+            self.lat.append(lat)
+            self.lon.append(lon)
+        else:
+            self.lat[slot] = lat
+            self.lon[slot] = lon
+
+    def remove(self, witness_id: Hashable):
+        """Drop a witness (swap-with-last, O(1))"""
+        slot = self.slots.pop(witness_id)
+        last = len(self.ids) - 1
+        if slot != last:
+            moved = self.ids[last]
+            self.ids[slot] = moved
+            self.lat[slot] = self.lat[last]
+            self.lon[slot] = self.lon[last]
+            self.slots[moved] = slot
+        self.ids.pop()
+        self.lat.pop()
+        self.lon.pop()
+
+    @classmethod
+    def from_json(cls, source: Union[str, Path, Dict, List],
+                  min_distance_m: float = MIN_WITNESS_DISTANCE_M) -> "WitnessRegistry":
+        """
+        Load `{id: {"lat", "lon"}}` or `[{"id", "lat", "lon"}]`
+
+        Ids are stored as strings in both forms (JSON object keys always
+        are), so look signers up with `str(witness_id)`.
+        """
+        if isinstance(source, (str, Path)):
+            source = json.loads(Path(source).read_text())
+        registry = cls(min_distance_m)
+        entries = source.items() if isinstance(source, dict) else ((e["id"], e) for e in source)
+        for witness_id, pos in entries:
+            registry.register(str(witness_id), pos["lat"], pos["lon"])
+        return registry
+
+    def position(self, witness_id: Hashable) -> Dict:
+        slot = self.slots[witness_id]
+        return {"lat": self.lat[slot], "lon": self.lon[slot]}
+
+    def _pairs(self, slots: np.ndarray) -> np.ndarray:
+        """(i, j) positions into `slots` with i < j closer than the minimum distance"""
+        lat = np.radians(np.frombuffer(self.lat, dtype=np.float64)[slots])
+        lon = np.radians(np.frombuffer(self.lon, dtype=np.float64)[slots])
+        cos_lat = np.cos(lat)
+        xyz = np.stack([cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)], axis=1)
+
+        chord = 2 * math.sin(self.min_distance_m / (2 * EARTH_RADIUS_M))
+        cell = np.floor(xyz / chord).astype(np.int64)
+        keys = _pack(cell[:, 0], cell[:, 1], cell[:, 2])
+        order = np.argsort(keys, kind="stable")
+        sorted_keys = keys[order]
+
+        found = []
+        for dx, dy, dz in [(0, 0, 0)] + _HALF_NEIGHBOURS:
+            shift = (dx << (2 * _AXIS_BITS)) + (dy << _AXIS_BITS) + dz
+            lo = np.searchsorted(sorted_keys, sorted_keys + shift, side="left")
+            hi = np.searchsorted(sorted_keys, sorted_keys + shift, side="right")
+            if shift == 0:
+                lo = np.arange(len(sorted_keys)) + 1  # same cell: only later entries
+            counts = np.maximum(hi - lo, 0)
+            a = np.repeat(order, counts)
+            b = order[_expand(lo, counts)]
+            if not len(a):
+                continue
+            # Chord test first (cheap), haversine on what survives
+            near = np.einsum("ij,ij->i", xyz[a] - xyz[b], xyz[a] - xyz[b]) < chord * chord
+            found.append(np.stack([a[near], b[near]], axis=1))
+
+        if not found:
+            return np.empty((0, 2), dtype=np.int64)
+        pairs = np.concatenate(found)
+        return np.sort(pairs, axis=1)
+
+    def _report(self, slots: np.ndarray, pairs: np.ndarray) -> List[Dict]:
+        lat = np.frombuffer(self.lat, dtype=np.float64)[slots]
+        lon = np.frombuffer(self.lon, dtype=np.float64)[slots]
+        i, j = pairs[:, 0], pairs[:, 1]
+        distance = haversine_m(lat[i], lon[i], lat[j], lon[j])
+        keep = distance < self.min_distance_m
+        i, j, distance = i[keep], j[keep], distance[keep]
+        ids = [self.ids[s] for s in slots]
+        return [
+            {"a": ids[a], "b": ids[b], "distance_m": round(float(d), 1)}
+            for a, b, d in sorted(zip(i.tolist(), j.tolist(), distance.tolist()), key=lambda t: t[2])
+        ]
+
+    def scan(self) -> List[Dict]:
+        """
+        Every registered pair closer than `min_distance_m`
+
+        Returns:
+            [{"a", "b", "distance_m"}] closest first
+        """
+        slots = np.arange(len(self.ids))
+        if len(slots) < 2:
+            return []
+        return self._report(slots, self._pairs(slots))
+
+    def slashing_candidates(self) -> List[Hashable]:
+        """Witness ids involved in at least one too-close pair"""
+        flagged = set()
+        for pair in self.scan():
+            flagged.update((pair["a"], pair["b"]))
+        return sorted(flagged, key=str)
+
+    def check_signers(self, witness_ids: Iterable[Hashable]) -> Dict:
+        """
+        Sybil check for one task's signer set
+
+        Returns:
+            {"ok", "pairs": [{"a", "b", "distance_m"}], "unknown": [ids not registered]}
+        """
+        known, unknown = [], []
+        for witness_id in dict.fromkeys(witness_ids):
+            (known if witness_id in self.slots else unknown).append(witness_id)
+        slots = np.array([self.slots[w] for w in known], dtype=np.int64)
+        if len(slots) < 2:
+            pairs = []
+        else:
+            # A handful of signers: all pairs vectorized is cheaper than a grid
+            i, j = np.triu_indices(len(slots), k=1)
+            pairs = self._report(slots, np.stack([i, j], axis=1))
+        return {"ok": not pairs, "pairs": pairs, "unknown": unknown}
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+# MirrorWitness PHASE2 2025-11-04
+
+import asyncio
+from typing import Awaitable, Callable, List
+
+BATCH_MAX_SIZE = 64        # tasks per new_task_batch frame
+BATCH_MAX_DELAY = 0.020    # seconds a task may wait for its batch to fill
+
+
+class TaskBatcher:
+    """
+    Size/time batching window in front of a flush coroutine
+
+    Items are buffered until `max_size` accumulate or the oldest item has
+    waited `max_delay` seconds, whichever comes first, then handed to
+    `flush(items)` as one list.
+    """
+
+    def __init__(self, flush: Callable[[List], Awaitable], max_size: int = BATCH_MAX_SIZE,
+                 max_delay: float = BATCH_MAX_DELAY):
+        self.flush = flush
+        self.max_size = max(1, max_size)
+        self.max_delay = max_delay
+        self.buffer = []
+        self.batches = 0
+        self._timer = None
+        self._inflight = set()
+
+    async def add(self, item):
+        self.buffer.append(item)
+        if len(self.buffer) >= self.max_size:
+            await self.flush_now()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.max_delay, self._on_timer)
+
+    def _on_timer(self):
+        self._timer = None
+        task = asyncio.create_task(self.flush_now())
+        self._inflight.add(task)
+        task.add_done_callback(self._inflight.discard)
+
+    async def flush_now(self):
+        """Flush whatever is buffered right away"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self.buffer:
+            return
+        items, self.buffer = self.buffer, []
+        self.batches += 1
+        await self.flush(items)
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+# MirrorWitness PHASE2 2025-11-04
+
+import asyncio
+import time
+from typing import Callable, Dict, List, Optional
+from metrics import Logger
+
+TICK = 0.1        # seconds per level-0 slot
+SLOT_BITS = 6     # 64 slots per level
+LEVELS = 4        # 64**4 ticks: about 19 days at 100ms
+
+log = Logger("[WHEEL]")
+
+
+class Timer:
+    """Handle for one scheduled callback; `cancel()` is O(1)"""
+
+    __slots__ = ("wheel", "deadline", "callback", "args", "bucket")
+
+    def __init__(self, wheel, deadline, callback, args):
+        self.wheel = wheel
+        self.deadline = deadline
+        self.callback = callback
+        self.args = args
+        self.bucket: Optional[Dict] = None
+
+    @property
+    def active(self) -> bool:
+        return self.bucket is not None
+
+    def cancel(self) -> bool:
+        if self.bucket is None:
+            return False
+        del self.bucket[self]
+        self.bucket = None
+        self.wheel.count -= 1
+        self.wheel.cancelled += 1
+        return True
+
+
+class TimingWheel:
+    """
+    Hierarchical timing wheel (Varghese & Lauck) for many coarse timers
+
+    Level l has 2**SLOT_BITS slots of `tick * 64**l` seconds each. A timer
+    goes into the lowest level whose span covers its distance from now,
+    at the slot of its absolute tick, so insert and cancel are a dict
+    insert/delete. Whenever a lower level wraps, the matching slot of the
+    level above is cascaded down; level-0 slots fire. Timers are accurate
+    to one tick and never fire early. Deadlines further out than the
+    top level are parked in its last slot and re-cascaded until due.
+
+    One asyncio task (`start`) advances the wheel every tick, replacing
+    one `loop.call_later` handle per timer. `advance(now)` can also be
+    driven by hand, e.g. from a simulation clock.
+    """
+
+    def __init__(self, tick: float = TICK, slot_bits: int = SLOT_BITS, levels: int = LEVELS,
+                 clock: Callable[[], float] = time.time):
+        self.tick = tick
+        self.slot_bits = slot_bits
+        self.mask = (1 << slot_bits) - 1
+        self.levels = levels
+        self.clock = clock
+        self.wheels: List[List[Dict[Timer, None]]] = [
+            [{} for _ in range(1 << slot_bits)] for _ in range(levels)
+        ]
+        self.current = int(clock() / tick)  # last processed tick
+        self.due: Dict[Timer, None] = {}    # deadline at or before `current`
+        self.count = 0
+        self.fired = 0
+        self.cancelled = 0
+        self._task = None
+
+    def __len__(self) -> int:
+        return self.count
+
+    def call_at(self, deadline: float, callback: Callable, *args) -> Timer:
+        """Run `callback(*args)` on the first tick at or after `deadline`"""
+        timer = Timer(self, deadline, callback, args)
+        self._place(timer)
+        self.count += 1
+        return timer
+
+    def call_later(self, delay: float, callback: Callable, *args) -> Timer:
+        return self.call_at(self.clock() + delay, callback, *args)
+
+    def _place(self, timer: Timer):
+        target = -int(-timer.deadline // self.tick)  # ceil: never fire early
+        delta = target - self.current
+        if delta <= 0:
+            bucket = self.due
+        else:
+            level = min((delta.bit_length() - 1) // self.slot_bits, self.levels - 1)
+            if delta >> (self.slot_bits * (level + 1)):
+                # beyond the top level: park in the slot just before the current one
+                target = self.current + (self.mask << (self.slot_bits * level))
+            bucket = self.wheels[level][(target >> (self.slot_bits * level)) & self.mask]
+        bucket[timer] = None
+        timer.bucket = bucket
+
+    def advance(self, now: Optional[float] = None) -> int:
+        """Fire every timer due by `now`; returns how many fired"""
+        now = self.clock() if now is None else now
+        target = int(now / self.tick)
+        fired = self._fire(self.due)
+        while self.current < target:
+            if self.count == 0:
+                self.current = target  # nothing scheduled: skip the idle ticks
+                break
+            self.current += 1
+            for level in range(self.levels - 1, 0, -1):
+                if self.current & ((1 << (self.slot_bits * level)) - 1) == 0:
+                    self._cascade(level)
+            fired += self._fire(self.wheels[0][self.current & self.mask])
+            fired += self._fire(self.due)
+        return fired
+
+    def _cascade(self, level: int):
+        index = (self.current >> (self.slot_bits * level)) & self.mask
+        bucket = self.wheels[level][index]
+        if not bucket:
+            return
+        self.wheels[level][index] = {}
+        for timer in bucket:
+            self._place(timer)
+
+    def _fire(self, bucket: Dict[Timer, None]) -> int:
+        if not bucket:
+            return 0
+        timers = list(bucket)
+        bucket.clear()
+        for timer in timers:
+            timer.bucket = None
+        self.count -= len(timers)
+        self.fired += len(timers)
+        for timer in timers:
+            try:
+                timer.callback(*timer.args)
+            except Exception as e:
+                log.error("Timer callback %s failed: %r", getattr(timer.callback, '__name__', timer.callback), e)
+        return len(timers)
+
+    def start(self):
+        """Advance on the running event loop every tick (idempotent)"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.tick)
+            self.advance()
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def stats(self):
+        return {"pending": self.count, "fired": self.fired, "cancelled": self.cancelled}
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+# MirrorWitness PHASE2 2025-11-04
+
+import asyncio
+import hashlib
+import random
+import struct
+from collections import OrderedDict
+from typing import Dict, List, Optional
+import aiohttp
+from task_batcher import TaskBatcher
+
+UPLOAD_CONCURRENCY = 8
+UPLOAD_RETRIES = 4
+RETRY_BASE = 0.2     # seconds, doubled per attempt plus jitter
+RETRY_MAX = 5.0
+REQUEST_TIMEOUT = 10.0
+CACHE_SIZE = 4096    # blob sha256 -> blob id entries kept
+STORE_EPOCHS = 1
+
+# Batch blob: magic, entry count, count + 1 little-endian u32 offsets, payloads
+BATCH_MAGIC = b"PTB1"
+BATCH_HEAD = struct.Struct("<4sI")
+RETRYABLE_STATUS = {408, 425, 429, 500, 502, 503, 504}
+
+
+class WalrusError(Exception):
+    pass
+
+
+def pack_batch(payloads: List[bytes]) -> bytes:
+    """Concatenate payloads behind an offset index"""
+    offsets = [0]
+    for payload in payloads:
+        offsets.append(offsets[-1] + len(payload))
+    index = struct.pack(f"<{len(offsets)}I", *offsets)
+    return BATCH_HEAD.pack(BATCH_MAGIC, len(payloads)) + index + b"".join(payloads)
+
+
+def unpack_batch(blob: bytes) -> List[bytes]:
+    magic, count = BATCH_HEAD.unpack_from(blob)
+    if magic != BATCH_MAGIC:
+        raise WalrusError("not a batch blob")
+    offsets = struct.unpack_from(f"<{count + 1}I", blob, BATCH_HEAD.size)
+    base = BATCH_HEAD.size + 4 * (count + 1)
+    return [blob[base + start:base + end] for start, end in zip(offsets, offsets[1:])]
+
+
+def batch_entry(blob: bytes, index: int) -> bytes:
+    """One payload out of a batch blob without splitting the rest"""
+    magic, count = BATCH_HEAD.unpack_from(blob)
+    if magic != BATCH_MAGIC or not 0 <= index < count:
+        raise WalrusError(f"no entry {index} in batch blob")
+    start, end = struct.unpack_from("<2I", blob, BATCH_HEAD.size + 4 * index)
+    base = BATCH_HEAD.size + 4 * (count + 1)
+    return blob[base + start:base + end]
+
+
+class WalrusClient:
+    """
+    Async Walrus publisher/aggregator client
+
+    One keep-alive `aiohttp` session is shared by all uploads, at most
+    `concurrency` requests run at once, and transient failures (connection
+    errors, timeouts, 429/5xx) are retried with jittered exponential
+    backoff. Blobs are content-addressed by SHA-256: an identical blob,
+    whether already uploaded or still in flight, is never sent twice.
+    """
+
+    def __init__(self, api: str, concurrency: int = UPLOAD_CONCURRENCY, retries: int = UPLOAD_RETRIES,
+                 timeout: float = REQUEST_TIMEOUT, epochs: int = STORE_EPOCHS, cache_size: int = CACHE_SIZE):
+        self.api = api.rstrip("/")
+        self.concurrency = concurrency
+        self.retries = retries
+        self.timeout = timeout
+        self.epochs = epochs
+        self.cache_size = cache_size
+        self.cache: "OrderedDict[bytes, str]" = OrderedDict()
+        self.inflight: Dict[bytes, asyncio.Future] = {}
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.uploads = 0
+        self.cache_hits = 0
+        self.retried = 0
+        self.failed = 0
+
+    async def start(self):
+        if self.session is None:
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.concurrency, keepalive_timeout=60),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def upload(self, blob: bytes) -> str:
+        """Store `blob`; returns its Walrus blob id"""
+        digest = hashlib.sha256(blob).digest()
+        blob_id = self.cache.get(digest)
+        if blob_id is not None:
+            self.cache.move_to_end(digest)
+            self.cache_hits += 1
+            return blob_id
+        pending = self.inflight.get(digest)
+        if pending is not None:
+            self.cache_hits += 1
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self.inflight[digest] = future
+        try:
+            blob_id = await self._put(blob)
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # retrieved here; waiters re-raise it
+            raise
+        else:
+            future.set_result(blob_id)
+            self.cache[digest] = blob_id
+            if len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+            return blob_id
+        finally:
+            del self.inflight[digest]
+            if not future.done():
+                # Uploader cancelled: fail the waiters sharing this upload
+                # rather than leaving them on a future nobody resolves
+                future.set_exception(WalrusError("upload cancelled"))
+                future.exception()
+
+    async def _put(self, blob: bytes) -> str:
+        await self.start()
+        url = f"{self.api}/v1/blobs"
+        for attempt in range(self.retries + 1):
+            try:
+                async with self.semaphore:
+                    async with self.session.put(url, data=blob, params={"epochs": str(self.epochs)}) as resp:
+                        if resp.status == 200:
+                            self.uploads += 1
+                            return self._blob_id(await resp.json(content_type=None))
+                        error = WalrusError(f"PUT {url} -> {resp.status}")
+                        if resp.status not in RETRYABLE_STATUS:
+                            self.failed += 1
+                            raise error
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                error = WalrusError(f"PUT {url} failed: {e or type(e).__name__}")
+            if attempt == self.retries:
+                break
+            self.retried += 1
+            delay = min(RETRY_MAX, RETRY_BASE * 2 ** attempt)
+            await asyncio.sleep(delay / 2 + random.uniform(0, delay / 2))
+        self.failed += 1
+        raise error
+
+    @staticmethod
+    def _blob_id(response: Dict) -> str:
+        """Publisher reply: {"newlyCreated": {"blobObject": {"blobId"}}} or {"alreadyCertified": {"blobId"}}"""
+        if "newlyCreated" in response:
+            return response["newlyCreated"]["blobObject"]["blobId"]
+        if "alreadyCertified" in response:
+            return response["alreadyCertified"]["blobId"]
+        raise WalrusError(f"unexpected publisher reply: {response}")
+
+    async def upload_batch(self, payloads: List[bytes]) -> List[Dict]:
+        """
+        Store several payloads as one blob
+
+        Returns:
+            [{"blob_id", "index", "offset", "length"}] per payload, offsets
+            relative to the payload area after the index
+        """
+        blob_id = await self.upload(pack_batch(payloads))
+        refs, offset = [], 0
+        for index, payload in enumerate(payloads):
+            refs.append({"blob_id": blob_id, "index": index, "offset": offset, "length": len(payload)})
+            offset += len(payload)
+        return refs
+
+    async def read(self, blob_id: str) -> bytes:
+        await self.start()
+        url = f"{self.api}/v1/blobs/{blob_id}"
+        async with self.semaphore:
+            async with self.session.get(url) as resp:
+                if resp.status != 200:
+                    raise WalrusError(f"GET {url} -> {resp.status}")
+                return await resp.read()
+
+    def stats(self) -> Dict:
+        return {
+            "uploads": self.uploads,
+            "cache_hits": self.cache_hits,
+            "retried": self.retried,
+            "failed": self.failed,
+            "cached": len(self.cache),
+        }
+
+
+class WalrusBatcher:
+    """
+    Collects single payloads into batch blobs
+
+    `add` resolves with the payload's batch reference once its blob is
+    stored; blobs go out at `max_size` payloads or after `max_delay`.
+    """
+
+    def __init__(self, client: WalrusClient, max_size: int = 32, max_delay: float = 0.050):
+        self.client = client
+        self.batcher = TaskBatcher(self._flush, max_size=max_size, max_delay=max_delay)
+
+    async def add(self, payload: bytes) -> Dict:
+        future = asyncio.get_running_loop().create_future()
+        await self.batcher.add((payload, future))
+        return await future
+
+    async def _flush(self, items):
+        try:
+            refs = await self.client.upload_batch([payload for payload, _ in items])
+        except Exception as e:
+            for _, future in items:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), ref in zip(items, refs):
+            if not future.done():
+                future.set_result(ref)
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# MirrorWitness PHASE2 2025-11-04
+
+import argparse
+import asyncio
+import base64
+import hashlib
+import random
+from aiohttp import web
+
+MOCK_PORT = 31415
+
+
+class WalrusMock:
+    """
+    In-memory stand-in for a Walrus publisher + aggregator
+
+    `PUT /v1/blobs` stores the body under a content-derived blob id and
+    answers like the real publisher (`newlyCreated` first, then
+    `alreadyCertified`); `GET /v1/blobs/{blob_id}` returns it. `fail_rate`
+    and `latency` inject 503s and delay to exercise client retries.
+    """
+
+    def __init__(self, fail_rate: float = 0.0, latency: float = 0.0):
+        self.fail_rate = fail_rate
+        self.latency = latency
+        self.blobs = {}
+        self.puts = 0
+        self.failures = 0
+
+    @staticmethod
+    def blob_id(data: bytes) -> str:
+        return base64.urlsafe_b64encode(hashlib.sha256(data).digest()).decode().rstrip("=")
+
+    def app(self) -> web.Application:
+        app = web.Application(client_max_size=64 * 1024 * 1024)
+        app.router.add_put("/v1/blobs", self.put_blob)
+        app.router.add_get("/v1/blobs/{blob_id}", self.get_blob)
+        return app
+
+    async def put_blob(self, request: web.Request) -> web.Response:
+        self.puts += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if random.random() < self.fail_rate:
+            self.failures += 1
+            return web.Response(status=503, text="injected failure")
+        data = await request.read()
+        blob_id = self.blob_id(data)
+        if blob_id in self.blobs:
+            return web.json_response({"alreadyCertified": {"blobId": blob_id, "endEpoch": 1}})
+        self.blobs[blob_id] = data
+        return web.json_response({
+            "newlyCreated": {
+                "blobObject": {"blobId": blob_id, "size": len(data)},
+                "cost": len(data),
+            }
+        })
+
+    async def get_blob(self, request: web.Request) -> web.Response:
+        data = self.blobs.get(request.match_info["blob_id"])
+        if data is None:
+            return web.Response(status=404, text="blob not found")
+        return web.Response(body=data, content_type="application/octet-stream")
+
+    async def start(self, host: str = "127.0.0.1", port: int = MOCK_PORT) -> web.AppRunner:
+        runner = web.AppRunner(self.app())
+        await runner.setup()
+        await web.TCPSite(runner, host, port).start()
+        return runner
+
+
+async def serve(args):
+    mock = WalrusMock(fail_rate=args.fail_rate, latency=args.latency_ms / 1000)
+    await mock.start(args.host, args.port)
+    print(f"[WALRUS-MOCK] Listening on http://{args.host}:{args.port} "
+          f"(fail rate {args.fail_rate:.0%}, latency {args.latency_ms}ms)")
+    await asyncio.Event().wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local Walrus publisher/aggregator stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=MOCK_PORT)
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    asyncio.run(serve(parser.parse_args()))
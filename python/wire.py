@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+# MirrorWitness PHASE2 2025-11-04
+
+"""
+Compact binary wire format for miner <-> witness traffic
+
+Frame layout (little endian):
+
+    magic "PT" | version u8 | msg type u8 | body ... | HMAC-SHA256 (32 bytes, miner frames only)
+
+Bodies:
+
+    NEW_TASK          timestamp f64 | cid 16B | len u16 | payload
+    NEW_TASK_BATCH    timestamp f64 | count u16 | count x (cid 16B | len u16 | payload)
+    SIGNATURE(_BATCH) witness_id u32 | pubkey 32B | count u16 | count x (cid 16B | sig 64B | sha256 32B)
+
+JSON text frames carry the same MAC as a hex header over the exact UTF-8
+body bytes ("<64 hex><json>", format "jsonmac1"), so receivers authenticate
+before parsing. The legacy "json" format (hmac field inside the object)
+is only ever sent, never accepted, by current witnesses.
+
+Sealed GPS payloads can themselves be packed as a fixed 45-byte record
+(format byte 0x01, then timestamp, lat, lon, alt, accuracy, sealed_until,
+nonce) instead of JSON. Witnesses accept either payload encoding.
+"""
+
+import hashlib
+import hmac
+import json
+import math
+import struct
+from typing import Dict, List, Tuple
+
+MAGIC = b"PT"
+VERSION = 1
+FORMAT_BINARY = "bin1"
+FORMAT_JSON_MAC = "jsonmac1"
+FORMAT_JSON = "json"  # legacy: hmac field inside the JSON object
+
+MSG_NEW_TASK = 1
+MSG_NEW_TASK_BATCH = 2
+MSG_SIGNATURE = 3
+MSG_SIGNATURE_BATCH = 4
+
+MAC_SIZE = 32
+MAC_HEX_SIZE = 2 * MAC_SIZE
+CID_SIZE = 16
+
+HEADER = struct.Struct("<2sBB")
+TASK_HEAD = struct.Struct("<d16sH")
+BATCH_HEAD = struct.Struct("<dH")
+ENTRY_HEAD = struct.Struct("<16sH")
+SIG_HEAD = struct.Struct("<I32sH")
+SIG_ENTRY = struct.Struct("<16s64s32s")
+
+GPS_RECORD_TAG = 0x01
+GPS_RECORD = struct.Struct("<BdddffdI")
+
+
+class WireError(ValueError):
+    """Malformed or unauthenticated frame"""
+
+
+def _mac(secret: bytes, data: bytes) -> bytes:
+    return hmac.new(secret, data, hashlib.sha256).digest()
+
+
+def _seal(secret: bytes, frame: bytes) -> bytes:
+    return frame + _mac(secret, frame)
+
+
+def open_frame(secret: bytes, frame: bytes) -> Tuple[int, memoryview]:
+    """Authenticate a miner frame; returns (msg type, body) without the MAC"""
+    if len(frame) < HEADER.size + MAC_SIZE:
+        raise WireError("frame too short")
+    view = memoryview(frame)
+    if not hmac.compare_digest(_mac(secret, view[:-MAC_SIZE]), frame[-MAC_SIZE:]):
+        raise WireError("bad frame MAC")
+    magic, version, msg_type = HEADER.unpack_from(view)
+    if magic != MAGIC or version != VERSION:
+        raise WireError(f"unsupported frame {magic!r} v{version}")
+    return msg_type, view[HEADER.size:-MAC_SIZE]
+
+
+def seal_text(secret: bytes, text: str) -> str:
+    """Prefix a JSON text frame with the hex MAC of its UTF-8 bytes"""
+    return hmac.new(secret, text.encode(), hashlib.sha256).hexdigest() + text
+
+
+def open_text(secret: bytes, frame: str) -> bytes:
+    """Authenticate a MAC-prefixed text frame; returns the body bytes unparsed"""
+    body = frame[MAC_HEX_SIZE:].encode()
+    expected = hmac.new(secret, body, hashlib.sha256).hexdigest()
+    received = frame[:MAC_HEX_SIZE]
+    if not received.isascii() or not hmac.compare_digest(expected, received):
+        raise WireError("bad frame MAC")
+    return body
+
+
+# --- GPS record payloads ----------------------------------------------------
+
+def pack_gps(data: Dict) -> bytes:
+    """Pack a sealed GPS dict into the fixed binary record"""
+    return GPS_RECORD.pack(
+        GPS_RECORD_TAG,
+        data["timestamp"],
+        data["lat"],
+        data["lon"],
+        data["alt"],
+        data.get("accuracy", math.nan),
+        data["sealed_until"],
+        data["nonce"],
+    )
+
+
+def unpack_gps(payload: bytes) -> Dict:
+    _, timestamp, lat, lon, alt, accuracy, sealed_until, nonce = GPS_RECORD.unpack(payload)
+    data = {
+        "timestamp": timestamp,
+        "lat": lat,
+        "lon": lon,
+        "alt": round(alt, 2),
+        "type": "gps_data",
+        "sealed_until": sealed_until,
+        "nonce": nonce,
+    }
+    if not math.isnan(accuracy):
+        data["accuracy"] = round(accuracy, 2)
+    return data
+
+
+def decode_payload(payload: bytes) -> Dict:
+    """Decode a sealed payload in either JSON or binary-record form"""
+    if payload[:1] == bytes([GPS_RECORD_TAG]) and len(payload) == GPS_RECORD.size:
+        return unpack_gps(payload)
+    return json.loads(payload)
+
+
+# --- miner -> witness -------------------------------------------------------
+
+def encode_task(secret: bytes, payload: bytes, cid: str, timestamp: float) -> bytes:
+    frame = HEADER.pack(MAGIC, VERSION, MSG_NEW_TASK) + \
+        TASK_HEAD.pack(timestamp, bytes.fromhex(cid), len(payload)) + payload
+    return _seal(secret, frame)
+
+
+def encode_task_batch(secret: bytes, tasks: List[Tuple[bytes, str]], timestamp: float) -> bytes:
+    parts = [HEADER.pack(MAGIC, VERSION, MSG_NEW_TASK_BATCH), BATCH_HEAD.pack(timestamp, len(tasks))]
+    for payload, cid in tasks:
+        parts.append(ENTRY_HEAD.pack(bytes.fromhex(cid), len(payload)))
+        parts.append(payload)
+    return _seal(secret, b"".join(parts))
+
+
+def decode_tasks(msg_type: int, body: memoryview) -> List[Tuple[bytes, str]]:
+    """Split an authenticated task body into [(payload, cid hex)]"""
+    try:
+        if msg_type == MSG_NEW_TASK:
+            _, cid, length = TASK_HEAD.unpack_from(body)
+            start = TASK_HEAD.size
+            return [(bytes(body[start:start + length]), cid.hex())]
+        if msg_type == MSG_NEW_TASK_BATCH:
+            _, count = BATCH_HEAD.unpack_from(body)
+            offset = BATCH_HEAD.size
+            tasks = []
+            for _ in range(count):
+                cid, length = ENTRY_HEAD.unpack_from(body, offset)
+                offset += ENTRY_HEAD.size
+                tasks.append((bytes(body[offset:offset + length]), cid.hex()))
+                offset += length
+            return tasks
+    except struct.error as e:
+        raise WireError(f"truncated task frame: {e}")
+    raise WireError(f"unexpected message type {msg_type}")
+
+
+# --- witness -> miner -------------------------------------------------------
+
+def encode_signatures(witness_id: int, pubkey: bytes, entries: List[Tuple[str, bytes, bytes]],
+                      batch: bool = True) -> bytes:
+    """entries: [(cid hex, signature 64B, payload sha256 32B)]"""
+    msg_type = MSG_SIGNATURE_BATCH if batch else MSG_SIGNATURE
+    parts = [HEADER.pack(MAGIC, VERSION, msg_type), SIG_HEAD.pack(witness_id, pubkey, len(entries))]
+    for cid, signature, digest in entries:
+        parts.append(SIG_ENTRY.pack(bytes.fromhex(cid), signature, digest))
+    return b"".join(parts)
+
+
+def decode_signatures(frame: bytes) -> Dict:
+    """Decode a witness reply into `witness_signature_batch` dict form"""
+    try:
+        magic, version, msg_type = HEADER.unpack_from(frame)
+        if magic != MAGIC or version != VERSION or msg_type not in (MSG_SIGNATURE, MSG_SIGNATURE_BATCH):
+            raise WireError("not a signature frame")
+        witness_id, pubkey, count = SIG_HEAD.unpack_from(frame, HEADER.size)
+        offset = HEADER.size + SIG_HEAD.size
+        signatures = []
+        for _ in range(count):
+            cid, signature, digest = SIG_ENTRY.unpack_from(frame, offset)
+            offset += SIG_ENTRY.size
+            signatures.append({
+                "cid": cid.hex(),
+                "signature": signature.hex(),
+                "payload_hash": digest.hex(),
+            })
+    except struct.error as e:
+        raise WireError(f"truncated signature frame: {e}")
+    return {
+        "type": "witness_signature_batch",
+        "witness_id": witness_id,
+        "pubkey": pubkey.hex(),
+        "signatures": signatures,
+    }
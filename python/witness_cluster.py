@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# MirrorWitness PHASE2 2025-11-04
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import signal
+import socket
+import time
+from multiprocessing.connection import wait
+from nacl.signing import SigningKey
+import websockets
+from metrics import Logger, serve_metrics
+from witness_node import METRICS_PORT, WitnessNode
+
+RESTART_MIN = 0.5   # seconds before restarting a crashed worker, doubled per quick crash
+RESTART_MAX = 30.0
+STABLE_AFTER = 10.0  # a worker alive this long resets its restart backoff
+LISTEN_BACKLOG = 1024
+
+log = Logger("[CLUSTER]")
+
+
+def reuseport_socket(port: int, host: str = "0.0.0.0") -> socket.socket:
+    """Listening socket that other processes can bind to the same port"""
+    if not hasattr(socket, "SO_REUSEPORT"):
+        raise RuntimeError("SO_REUSEPORT is not available on this platform")
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    sock.bind((host, port))
+    sock.listen(LISTEN_BACKLOG)
+    sock.setblocking(False)
+    return sock
+
+
+def run_worker(witness_id: int, port: int, seed: bytes, index: int, verbose: bool):
+    """Worker process: one WitnessNode on its own SO_REUSEPORT listener"""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # the supervisor handles Ctrl-C
+    node = WitnessNode(witness_id, port, verbose=verbose, signing_key=SigningKey(seed),
+                       tag=f"[WITNESS-{witness_id}/{index}]")
+
+    async def serve():
+        if METRICS_PORT:
+            await serve_metrics(METRICS_PORT + index)  # one endpoint per worker
+        async with websockets.serve(node.handle_connection, sock=reuseport_socket(port)):
+            node.logger.info("Worker %d serving on port %d", os.getpid(), port)
+            await asyncio.Future()
+
+    asyncio.run(serve())
+
+
+class WitnessCluster:
+    """
+    One witness identity served by N processes sharing its port
+
+    The supervisor loads (or creates) the key file once and hands the seed
+    to each worker over the spawn pipe, so workers never race to generate
+    different keys and the key never travels through argv or the
+    environment. Every worker binds its own SO_REUSEPORT socket and the
+    kernel spreads incoming connections across them, so each miner
+    connection is served by one core. Crashed workers are restarted with
+    backoff; SIGINT/SIGTERM stops them all.
+    """
+
+    def __init__(self, witness_id: int, port: int, workers: int = None, verbose: bool = False):
+        self.witness_id = witness_id
+        self.port = port
+        self.workers = workers or os.cpu_count() or 1
+        self.verbose = verbose
+        node = WitnessNode(witness_id, port)
+        self.seed = node.signing_key.encode()
+        self.ctx = multiprocessing.get_context("spawn")
+        self.procs = {}     # slot -> Process
+        self.started = {}   # slot -> start time
+        self.backoff = {}   # slot -> next restart delay
+        self.restarts = 0
+        self.stopping = False
+
+    def spawn(self, slot: int):
+        proc = self.ctx.Process(
+            target=run_worker,
+            args=(self.witness_id, self.port, self.seed, slot, self.verbose),
+            name=f"witness-{self.witness_id}-{slot}",
+            daemon=True,
+        )
+        proc.start()
+        self.procs[slot] = proc
+        self.started[slot] = time.monotonic()
+
+    def stop(self, *_):
+        self.stopping = True
+
+    def run(self):
+        """Start the workers and supervise them until signalled"""
+        reuseport_socket(self.port).close()  # fail fast if the port is unusable
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+        log.info("Witness %s: %d workers on port %d", self.witness_id, self.workers, self.port)
+        for slot in range(self.workers):
+            self.backoff[slot] = RESTART_MIN
+            self.spawn(slot)
+
+        pending = {}  # slot -> restart due time
+        while not self.stopping:
+            wait([p.sentinel for p in self.procs.values() if p.is_alive()], timeout=0.5)
+            now = time.monotonic()
+            for slot, proc in list(self.procs.items()):
+                if proc.is_alive() or slot in pending:
+                    continue
+                if now - self.started[slot] > STABLE_AFTER:
+                    self.backoff[slot] = RESTART_MIN
+                delay = self.backoff[slot]
+                log.warning("Worker %d (pid %s) exited with %s, restarting in %.1fs",
+                            slot, proc.pid, proc.exitcode, delay)
+                pending[slot] = now + delay
+                self.backoff[slot] = min(delay * 2, RESTART_MAX)
+            for slot, due in list(pending.items()):
+                if now >= due and not self.stopping:
+                    del pending[slot]
+                    self.restarts += 1
+                    self.spawn(slot)
+
+        log.info("Stopping workers")
+        for proc in self.procs.values():
+            if proc.is_alive():
+                proc.terminate()
+        for proc in self.procs.values():
+            proc.join(timeout=5)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Multi-process witness on one SO_REUSEPORT port")
+    parser.add_argument("--id", type=int, default=int(os.getenv("WITNESS_ID", "1")))
+    parser.add_argument("--port", type=int, default=int(os.getenv("WS_PORT", "8766")))
+    parser.add_argument("--workers", type=int, default=int(os.getenv("WITNESS_WORKERS", "0")) or None,
+                        help="worker processes (default: one per core)")
+    parser.add_argument("--verbose", action="store_true", help="per-task log lines from every worker")
+    args = parser.parse_args()
+    WitnessCluster(args.id, args.port, args.workers, args.verbose).run()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# MirrorWitness PHASE2 2025-11-04
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from typing import Dict, List
+import websockets
+from metrics import Logger, serve_metrics
+from witness_node import METRICS_PORT, WitnessNode
+
+HOST_PORT = int(os.getenv("WS_PORT", "8770"))
+
+log = Logger("[HOST]")
+trace = log.sampled()
+
+
+def parse_ids(spec: str) -> List[int]:
+    """"1-3,7,10-12" -> [1, 2, 3, 7, 10, 11, 12]"""
+    ids = []
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            lo, hi = part.split("-", 1)
+            ids.extend(range(int(lo), int(hi) + 1))
+        else:
+            ids.append(int(part))
+    return list(dict.fromkeys(ids))
+
+
+class WitnessHost:
+    """
+    Many witness identities behind one port and one event loop
+
+    Each identity is a plain `WitnessNode` (own key in ~/.pot/witness_N.key,
+    own GPS offset and signatures). A frame is authenticated and decoded
+    once, then signed by every identity it is routed to, and each of those
+    identities answers with its own reply in the connection's format, so
+    the miner's quorum counts them exactly like separate witnesses.
+
+    Routing: a `witness_ids` list in a JSON task message wins; otherwise
+    the ids from the connection's `hello`; otherwise every hosted identity.
+    """
+
+    def __init__(self, witness_ids: List[int], port: int = HOST_PORT):
+        self.port = port
+        self.nodes: Dict[int, WitnessNode] = {
+            witness_id: WitnessNode(witness_id, verbose=False) for witness_id in witness_ids
+        }
+        self.gate = next(iter(self.nodes.values()))  # any identity: the MAC secret is shared
+        self.frames = 0
+        self.replies = 0
+
+    def route(self, ids) -> List[WitnessNode]:
+        if not ids:
+            return list(self.nodes.values())
+        return [self.nodes[i] for i in ids if i in self.nodes]
+
+    async def send_all(self, websocket, replies):
+        replies = [reply for reply in replies if reply]
+        for reply in replies:
+            await websocket.send(reply)
+        self.replies += len(replies)
+        return len(replies)
+
+    async def handle_connection(self, websocket):
+        log.info("New connection from %s", websocket.remote_address)
+        connection_ids = None  # set by hello
+
+        async for message in websocket:
+            try:
+                self.frames += 1
+                started = time.perf_counter()
+                if isinstance(message, bytes):
+                    opened = self.gate.open_binary_frame(message)
+                    if opened is None:
+                        trace.warning("Rejected binary frame")
+                        continue
+                    msg_type, tasks = opened
+                    sent = await self.send_all(websocket, (
+                        node.sign_tasks(msg_type, tasks) for node in self.route(connection_ids)
+                    ))
+                else:
+                    # Authenticate the raw frame before any JSON decoding
+                    data = self.gate.open_text_frame(message)
+                    if data is None:
+                        trace.warning("HMAC verification failed!")
+                        continue
+                    kind = data.get('type')
+                    if kind == 'hello':
+                        connection_ids = data.get('witness_ids') or None
+                        await websocket.send(WitnessNode.hello_ack(data))
+                        continue
+                    nodes = self.route(data.get('witness_ids') or connection_ids)
+                    if kind == 'new_task':
+                        replies = [await node.process_task(data) for node in nodes]
+                    elif kind == 'new_task_batch':
+                        replies = [await node.process_task_batch(data) for node in nodes]
+                    else:
+                        continue
+                    sent = await self.send_all(websocket, (json.dumps(r) for r in replies if r))
+                    tasks = data.get('tasks', [data])
+                trace.info("%d task(s) signed by %d identities in %.1fms", len(tasks), sent,
+                           (time.perf_counter() - started) * 1000)
+            except Exception as e:
+                log.error("Error processing message: %s", e)
+
+    async def start_server(self):
+        log.info("Serving %d witness identities on port %d", len(self.nodes), self.port)
+        if METRICS_PORT:
+            await serve_metrics(METRICS_PORT)
+        async with websockets.serve(self.handle_connection, "0.0.0.0", self.port):
+            await asyncio.Future()  # Run forever
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve many witness identities on one port")
+    parser.add_argument("--ids", default=os.getenv("WITNESS_IDS", "1-3"), help='e.g. "1-1000" or "1,2,5-9"')
+    parser.add_argument("--port", type=int, default=HOST_PORT)
+    args = parser.parse_args()
+    host = WitnessHost(parse_ids(args.ids), args.port)
+    asyncio.run(host.start_server())
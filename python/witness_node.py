@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+# MirrorWitness 2025-11-04
+
+import asyncio
+import json
+import hashlib
+import heapq
+import hmac
+import os
+import time
+from collections import deque
+from pathlib import Path
+from nacl.signing import SigningKey
+from nacl.encoding import HexEncoder
+import websockets
+import metrics
+from metrics import LOG_LEVEL, Logger, serve_metrics
+import wire
+
+HMAC_SECRET = os.getenv("HMAC_SECRET", "proof-of-task-secret-2025")
+KEY_DIR = Path.home() / ".pot"
+GPS_OFFSET = 0.001  # km offset for simulation
+REPLAY_CACHE_SIZE = int(os.getenv("REPLAY_CACHE_SIZE", "100000"))  # signed tasks remembered per identity
+REPLAY_BUCKET_SECONDS = float(os.getenv("REPLAY_BUCKET_SECONDS", "10"))
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))  # Prometheus /metrics endpoint, 0 = off
+
+HMAC_SECONDS = metrics.histogram("pot_witness_hmac_seconds", "Frame MAC check")
+SIGN_SECONDS = metrics.histogram("pot_witness_sign_seconds", "Ed25519 signature over one payload")
+TASKS_SIGNED = metrics.counter("pot_witness_tasks_total", "Tasks answered by this process", result="signed")
+TASKS_REPLAYED = metrics.counter("pot_witness_tasks_total", "Tasks answered by this process", result="replayed")
+TASKS_EXPIRED = metrics.counter("pot_witness_tasks_total", "Tasks answered by this process", result="expired")
+FRAMES_REJECTED = metrics.counter("pot_witness_rejected_frames_total", "Frames failing the MAC check or decoding")
+CONNECTIONS = metrics.counter("pot_witness_connections_total", "Miner connections accepted")
+
+
+def key_path(witness_id):
+    return KEY_DIR / f"witness_{witness_id}.key"
+
+
+class ReplayCache:
+    """
+    Signed tasks by (cid, payload hash), forgotten once their seal expires
+
+    Entries are filed in buckets of `bucket_seconds` by `sealed_until`; a
+    heap holds one index per non-empty bucket, so expiry drops whole
+    buckets instead of keeping a timer per entry. At `max_entries` the
+    entries closest to expiry are evicted first. `get` and `put` are O(1)
+    apart from the occasional bucket heap push.
+    """
+
+    def __init__(self, max_entries=REPLAY_CACHE_SIZE, bucket_seconds=REPLAY_BUCKET_SECONDS):
+        self.max_entries = max_entries
+        self.bucket_seconds = bucket_seconds
+        self.entries = {}   # key -> (sealed_until, value)
+        self.buckets = {}   # bucket index -> deque of keys
+        self.heap = []      # bucket indices, oldest first
+        self.hits = 0
+        self.evicted = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key, now=None):
+        """Cached value for `key`, or None once its seal has expired"""
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= (time.time() if now is None else now):
+            del self.entries[key]  # its bucket is dropped later by expire()
+            return None
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key, sealed_until, value, now=None):
+        if self.max_entries <= 0 or key in self.entries:
+            return
+        self.expire(time.time() if now is None else now)
+        while len(self.entries) >= self.max_entries:
+            self._pop_oldest()
+            self.evicted += 1
+        index = int(sealed_until // self.bucket_seconds)
+        bucket = self.buckets.get(index)
+        if bucket is None:
+            bucket = self.buckets[index] = deque()
+            heapq.heappush(self.heap, index)
+        bucket.append(key)
+        self.entries[key] = (sealed_until, value)
+
+    def expire(self, now):
+        """Drop every bucket that lies entirely before `now`"""
+        horizon = int(now // self.bucket_seconds)
+        while self.heap and self.heap[0] < horizon:
+            for key in self.buckets.pop(heapq.heappop(self.heap)):
+                self.entries.pop(key, None)
+
+    def _pop_oldest(self):
+        index = self.heap[0]
+        bucket = self.buckets[index]
+        self.entries.pop(bucket.popleft(), None)
+        if not bucket:
+            heapq.heappop(self.heap)
+            del self.buckets[index]
+
+
+class WitnessNode:
+    def __init__(self, witness_id, port=None, verbose=True, signing_key=None, tag=None):
+        self.witness_id = witness_id
+        self.port = port
+        self.verbose = verbose
+        self.tag = tag or f"[WITNESS-{witness_id}]"
+        self.logger = Logger(self.tag, LOG_LEVEL if verbose else "warning")
+        self.trace = self.logger.sampled()  # per-task lines
+        self.key_path = key_path(witness_id)
+        self.signing_key = signing_key or self.load_or_create_key()
+        self.verify_key = self.signing_key.verify_key
+        self.pubkey = self.verify_key.encode()
+        self.pubkey_hex = self.verify_key.encode(encoder=HexEncoder).decode()
+        self.replay = ReplayCache()
+        self.expired = 0
+        self.logger.info("Pubkey: %s...", self.pubkey_hex[:32])
+
+    def log(self, message):
+        self.logger.info(message)
+
+    def load_or_create_key(self):
+        """Load existing Ed25519 key or create new one"""
+        self.key_path.parent.mkdir(parents=True, exist_ok=True)
+
+        if self.key_path.exists():
+            with open(self.key_path, 'rb') as f:
+                return SigningKey(f.read())
+        else:
+            key = SigningKey.generate()
+            with open(self.key_path, 'wb') as f:
+                f.write(key.encode())
+            self.log(f"Generated new keypair: {self.key_path}")
+            return key
+
+    def verify_hmac(self, body, received_hmac):
+        """Verify HMAC over the exact received frame bytes"""
+        expected = hmac.new(
+            HMAC_SECRET.encode(),
+            body,
+            hashlib.sha256
+        ).hexdigest()
+        return received_hmac.isascii() and hmac.compare_digest(expected, received_hmac)
+
+    def open_text_frame(self, frame):
+        """Authenticate a MAC-prefixed text frame, then parse it"""
+        body = frame[wire.MAC_HEX_SIZE:].encode()
+        started = time.perf_counter()
+        ok = self.verify_hmac(body, frame[:wire.MAC_HEX_SIZE])
+        HMAC_SECONDS.observe(time.perf_counter() - started)
+        if not ok:
+            FRAMES_REJECTED.inc()
+            return None
+        return json.loads(body)
+
+    def add_gps_noise(self, data):
+        """Add fake GPS offset to simulate different witness location"""
+        if 'lat' in data:
+            data['lat'] += GPS_OFFSET * self.witness_id
+        if 'lon' in data:
+            data['lon'] += GPS_OFFSET * self.witness_id
+        return data
+
+    def sign_payload(self, payload, cid):
+        """Decode, re-hash and sign one raw task payload"""
+        # Retried or resent task: answer with the signature already given,
+        # unless the seal has expired since (then rejected below). Keyed on
+        # the payload hash too, so a reused cid never returns a signature
+        # over some other payload.
+        now = time.time()
+        payload_hash = hashlib.sha256(payload).digest()
+        cached = self.replay.get((cid, payload_hash), now)
+        if cached is not None:
+            TASKS_REPLAYED.inc()
+            self.trace.info("Replayed task %s..., returning cached signature", str(cid)[:16])
+            return cached
+
+        try:
+            data = wire.decode_payload(payload)
+        except Exception as e:
+            self.logger.warning("Failed to decode payload: %s", e)
+            return None
+
+        sealed_until = data.get('sealed_until')
+        if sealed_until is not None and sealed_until <= now:
+            self.expired += 1
+            TASKS_EXPIRED.inc()
+            self.trace.info("Rejected task %s...: seal expired %.0fs ago", str(cid)[:16], now - sealed_until)
+            return None
+
+        # Add GPS noise (simulate different witness location)
+        data = self.add_gps_noise(data)
+
+        # Sign payload
+        started = time.perf_counter()
+        signature = self.signing_key.sign(payload).signature
+        SIGN_SECONDS.observe(time.perf_counter() - started)
+        TASKS_SIGNED.inc()
+        signed = (cid, signature, payload_hash)
+        if sealed_until is not None:
+            self.replay.put((cid, payload_hash), sealed_until, signed, now)
+        return signed
+
+    def sign_task(self, payload_hex, cid):
+        """Sign a hex-encoded payload from a JSON message"""
+        try:
+            payload = bytes.fromhex(payload_hex)
+        except Exception as e:
+            self.logger.warning("Failed to decode payload: %s", e)
+            return None
+        signed = self.sign_payload(payload, cid)
+        if signed is None:
+            return None
+        _, signature, payload_hash = signed
+        return {
+            "cid": cid,
+            "signature": signature.hex(),
+            "payload_hash": payload_hash.hex()
+        }
+
+    async def process_task(self, message):
+        """Sign the payload of an authenticated task message"""
+        signed = self.sign_task(message['payload'], message['cid'])
+        if signed is None:
+            return None
+        self.trace.info("Payload hash: %s...", signed['payload_hash'][:16])
+
+        # Prepare response
+        response = {
+            "type": "witness_signature",
+            "witness_id": self.witness_id,
+            "pubkey": self.pubkey_hex,
+            **signed
+        }
+
+        self.trace.info("Signed task %s...", message['cid'][:16])
+        return response
+
+    async def process_task_batch(self, message):
+        """Sign every payload of an authenticated batch message"""
+        signatures = []
+        for task in message.get('tasks', []):
+            signed = self.sign_task(task.get('payload', ''), task.get('cid'))
+            if signed is not None:
+                signatures.append(signed)
+
+        self.trace.info("Signed batch of %d/%d tasks", len(signatures), len(message.get('tasks', [])))
+        return {
+            "type": "witness_signature_batch",
+            "witness_id": self.witness_id,
+            "pubkey": self.pubkey_hex,
+            "signatures": signatures
+        }
+
+    def sign_tasks(self, msg_type, tasks):
+        """Sign decoded binary tasks; returns the binary reply frame"""
+        entries = []
+        for payload, cid in tasks:
+            signed = self.sign_payload(payload, cid)
+            if signed is not None:
+                entries.append(signed)
+
+        self.trace.info("Signed %d/%d binary tasks", len(entries), len(tasks))
+        return wire.encode_signatures(
+            self.witness_id,
+            self.pubkey,
+            entries,
+            batch=msg_type == wire.MSG_NEW_TASK_BATCH
+        )
+
+    def open_binary_frame(self, frame):
+        """Authenticate and decode a binary task frame; None if rejected"""
+        started = time.perf_counter()
+        try:
+            msg_type, body = wire.open_frame(HMAC_SECRET.encode(), frame)
+            HMAC_SECONDS.observe(time.perf_counter() - started)
+            return msg_type, wire.decode_tasks(msg_type, body)
+        except wire.WireError as e:
+            FRAMES_REJECTED.inc()
+            self.trace.warning("Rejected binary frame: %s", e)
+            return None
+
+    async def process_frame(self, frame):
+        """Verify and sign a binary task frame; replies in binary"""
+        opened = self.open_binary_frame(frame)
+        if opened is None:
+            return None
+        return self.sign_tasks(*opened)
+
+    @staticmethod
+    def hello_ack(data):
+        offered = data.get('formats', [])
+        chosen = wire.FORMAT_BINARY if wire.FORMAT_BINARY in offered else wire.FORMAT_JSON_MAC
+        return json.dumps({"type": "hello_ack", "format": chosen})
+
+    async def handle_connection(self, websocket):
+        """Handle WebSocket connection from miner"""
+        CONNECTIONS.inc()
+        self.logger.info("New connection from %s", websocket.remote_address)
+
+        async for message in websocket:
+            try:
+                if isinstance(message, bytes):
+                    response = await self.process_frame(message)
+                    if response:
+                        await websocket.send(response)
+                    continue
+
+                # Authenticate the raw frame before any JSON decoding
+                data = self.open_text_frame(message)
+                if data is None:
+                    self.trace.warning("HMAC verification failed!")
+                    continue
+
+                if data.get('type') == 'hello':
+                    await websocket.send(self.hello_ack(data))
+
+                elif data.get('type') == 'new_task':
+                    response = await self.process_task(data)
+                    if response:
+                        await websocket.send(json.dumps(response))
+                        self.trace.info("Sent signature response")
+
+                elif data.get('type') == 'new_task_batch':
+                    response = await self.process_task_batch(data)
+                    if response:
+                        await websocket.send(json.dumps(response))
+
+            except Exception as e:
+                self.logger.error("Error processing message: %s", e)
+
+    async def start_server(self):
+        """Start WebSocket server"""
+        self.logger.info("Starting server on port %s", self.port)
+        if METRICS_PORT:
+            await serve_metrics(METRICS_PORT)
+        async with websockets.serve(self.handle_connection, "0.0.0.0", self.port):
+            await asyncio.Future()  # Run forever
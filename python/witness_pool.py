@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# MirrorWitness PHASE2 2025-11-04
+
+import asyncio
+import json
+import random
+import time
+from typing import Callable, Dict, List, Optional, Set
+import websockets
+from metrics import Logger
+
+CONNECT_TIMEOUT = 5.0   # seconds per connection attempt
+SEND_TIMEOUT = 2.0      # seconds per witness per message
+BACKOFF_MIN = 0.5       # first reconnect delay
+BACKOFF_MAX = 30.0      # reconnect delay ceiling
+HELLO_TIMEOUT = 1.0     # seconds to wait for a witness to accept a wire format
+DEFAULT_FORMAT = "json"
+
+log = Logger("[POOL]")
+
+
+class WitnessConnection:
+    """
+    Long-lived WebSocket connection to a single witness
+
+    A background task keeps the socket open, reconnecting with jittered
+    exponential backoff, and hands every inbound frame to `on_message`.
+    On connect a pre-built `hello` frame offers the preferred wire
+    `formats`; witnesses that do not answer with a `hello_ack` get plain
+    JSON.
+    """
+
+    def __init__(self, url: str, on_message: Optional[Callable] = None,
+                 send_timeout: float = SEND_TIMEOUT, formats: Optional[List[str]] = None,
+                 hello=None):
+        self.url = url
+        self.on_message = on_message
+        self.send_timeout = send_timeout
+        self.formats = formats or [DEFAULT_FORMAT]
+        self.hello = hello
+        self.format = DEFAULT_FORMAT
+        self.ws = None
+        self.sent = 0
+        self.failed = 0
+        self._task = None
+        self._closing = False
+
+    @property
+    def healthy(self) -> bool:
+        return self.ws is not None and self.ws.open
+
+    def start(self):
+        """Spawn the connect/receive loop on the running event loop"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self):
+        self._closing = True
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        delay = BACKOFF_MIN
+        while not self._closing:
+            try:
+                async with websockets.connect(self.url, open_timeout=CONNECT_TIMEOUT) as ws:
+                    await self._negotiate(ws)
+                    self.ws = ws
+                    delay = BACKOFF_MIN
+                    log.info("Connected to witness %s (%s)", self.url, self.format)
+                    async for message in ws:
+                        self._deliver(message)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                log.warning("Witness %s unavailable: %s", self.url, e)
+            finally:
+                self.ws = None
+
+            if self._closing:
+                break
+            await asyncio.sleep(delay + random.uniform(0, delay / 2))
+            delay = min(delay * 2, BACKOFF_MAX)
+
+    async def _negotiate(self, ws):
+        """Offer wire formats; anything but a matching hello_ack means JSON"""
+        self.format = DEFAULT_FORMAT
+        if self.hello is None:
+            return
+        await ws.send(self.hello)
+        try:
+            first = await asyncio.wait_for(ws.recv(), HELLO_TIMEOUT)
+        except asyncio.TimeoutError:
+            return  # legacy witness: ignores hello
+        try:
+            ack = json.loads(first) if isinstance(first, str) else None
+        except ValueError:
+            ack = None
+        if ack and ack.get('type') == 'hello_ack':
+            if ack.get('format') in self.formats:
+                self.format = ack['format']
+        else:
+            self._deliver(first)
+
+    def _deliver(self, message):
+        """Hand one frame to `on_message`; a handler error must not drop the socket"""
+        if self.on_message is None:
+            return
+        try:
+            self.on_message(self.url, message)
+        except Exception as e:
+            log.error("Handler failed on reply from %s: %r", self.url, e)
+
+    async def send(self, data) -> bool:
+        """Send one frame, giving up after `send_timeout` seconds"""
+        ws = self.ws
+        if ws is None or not ws.open:
+            self.failed += 1
+            return False
+        try:
+            await asyncio.wait_for(ws.send(data), self.send_timeout)
+            self.sent += 1
+            return True
+        except Exception as e:
+            self.failed += 1
+            log.warning("Send to %s failed: %r", self.url, e)
+            return False
+
+
+class WitnessPool:
+    """
+    Persistent pool of witness connections with concurrent fan-out
+
+    Broadcast latency is bounded by the slowest healthy witness (or the
+    send timeout) rather than the sum over all witnesses, and a dead
+    witness is skipped without a connection attempt on the hot path.
+    """
+
+    def __init__(self, urls: List[str], on_message: Optional[Callable] = None,
+                 send_timeout: float = SEND_TIMEOUT, formats: Optional[List[str]] = None,
+                 hello=None):
+        self.connections = [
+            WitnessConnection(url, on_message=on_message, send_timeout=send_timeout,
+                              formats=formats, hello=hello)
+            for url in urls
+        ]
+
+    async def start(self):
+        """Start background connections (idempotent)"""
+        for conn in self.connections:
+            conn.start()
+
+    async def wait_ready(self, min_healthy: int = 1, timeout: float = CONNECT_TIMEOUT) -> int:
+        """Wait until at least `min_healthy` witnesses are connected"""
+        deadline = time.monotonic() + timeout
+        while self.healthy_count() < min_healthy and time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+        return self.healthy_count()
+
+    async def close(self):
+        await asyncio.gather(*(conn.close() for conn in self.connections))
+
+    def healthy_count(self) -> int:
+        return sum(1 for conn in self.connections if conn.healthy)
+
+    def formats_in_use(self) -> Set[str]:
+        """Wire formats negotiated by the currently healthy witnesses"""
+        return {conn.format for conn in self.connections if conn.healthy}
+
+    async def broadcast(self, data, exclude: Optional[Set[str]] = None) -> Dict[str, bool]:
+        """
+        Send to every witness at once; returns {url: delivered}
+
+        `data` is either one frame for everybody or a {format: frame} dict,
+        in which case each witness gets the frame for its negotiated format.
+        Witnesses whose url is in `exclude` are left out of the result.
+        """
+        connections = self.connections
+        if exclude:
+            connections = [conn for conn in connections if conn.url not in exclude]
+        if isinstance(data, dict):
+            sends = [conn.send(data[conn.format]) if conn.format in data else self._skip(conn)
+                     for conn in connections]
+        else:
+            sends = [conn.send(data) for conn in connections]
+        results = await asyncio.gather(*sends)
+        return {conn.url: ok for conn, ok in zip(connections, results)}
+
+    @staticmethod
+    async def _skip(conn: WitnessConnection) -> bool:
+        conn.failed += 1
+        return False